@@ -0,0 +1,64 @@
+"""
+Times RiskAssessmentEngine.batch_score against scoring the same rows one profile() at a time.
+
+Run from the service directory:
+
+    python -m benchmarks.benchmark_batch_score [--rows 200000] [--scalar-rows 5000] [--repeats 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.macro_indicators import MacroIndicatorStore
+from src.risk_assessment_engine import RiskAssessmentEngine, RiskFactors
+
+REGIONS = {"US": {"gdp": 2.5e13, "inflation": 3.2}, "DE": {"gdp": 4.1e12, "inflation": 2.4},
+           "IN": {"gdp": 3.4e12, "inflation": 5.6}}
+
+def applicants(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "income": rng.integers(0, 250000, rows), "expenses": rng.integers(0, 150000, rows),
+        "assets": rng.integers(0, 2000000, rows), "liabilities": rng.integers(0, 2000000, rows),
+        "credit_score": rng.integers(300, 851, rows), "investment_experience": rng.integers(0, 30, rows),
+        "risk_tolerance": rng.integers(0, 11, rows), "market_volatility": rng.uniform(0, 60, rows),
+        "industry_risk": rng.integers(0, 100, rows), "economic_outlook": rng.integers(0, 100, rows),
+        "age": rng.integers(18, 95, rows), "dependents": rng.integers(0, 6, rows),
+        "is_immigrant": rng.random(rows) < 0.3, "is_retired": rng.random(rows) < 0.2,
+        "employment_status": rng.choice(["employed", "self-employed", "student", "retired"], rows),
+        "education_level": rng.choice(["high_school", "bachelor", "master", "phd"], rows),
+        "marital_status": rng.choice(["single", "married", "divorced", "widowed"], rows),
+        "region": rng.choice(list(REGIONS), rows),
+    })
+
+def best_time(function, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--scalar-rows", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    store = MacroIndicatorStore(fetcher=REGIONS.__getitem__)
+    store.refresh(REGIONS)
+    engine = RiskAssessmentEngine(macro_indicators=store)
+    df = applicants(args.rows)
+    records = df.head(args.scalar_rows).to_dict("records")
+
+    batch = best_time(lambda: engine.batch_score(df), args.repeats)
+    scalar = best_time(lambda: [engine.profile(RiskFactors(**row)) for row in records], 1)
+    print(f"{'path':<12}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    print(f"{'batch':<12}{args.rows:>10}{batch:>10.4f}{args.rows / batch:>12.0f}")
+    print(f"{'profile':<12}{len(records):>10}{scalar:>10.4f}{len(records) / scalar:>12.0f}")
+
+if __name__ == "__main__":
+    main()
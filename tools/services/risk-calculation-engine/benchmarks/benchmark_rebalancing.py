@@ -0,0 +1,57 @@
+"""
+Times rebalancing policies for a multi-asset portfolio against fixed weights.
+
+Run from the service directory:
+
+    python -m benchmarks.benchmark_rebalancing [--paths 10000] [--years 30] [--assets 5] [--repeats 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.portfolio_simulator import PortfolioSimulator
+
+# Policies compared, as run_multi_asset_simulation keyword arguments.
+POLICIES = {
+    "fixed weights": dict(),
+    "annual, 0.1% cost": dict(rebalance_months=12, transaction_cost=0.1),
+    "5% band, 0.1% cost": dict(rebalance_months=None, rebalance_threshold=0.05, transaction_cost=0.1),
+    "buy and hold": dict(rebalance_months=None),
+}
+
+def portfolio(num_assets: int) -> dict:
+    tickers = [f"ASSET{index}" for index in range(num_assets)]
+    correlation = np.full((num_assets, num_assets), 0.3)
+    np.fill_diagonal(correlation, 1.0)
+    return dict(
+        asset_weights={ticker: 1 / num_assets for ticker in tickers},
+        asset_annual_returns=dict(zip(tickers, np.linspace(2, 10, num_assets))),
+        asset_annual_volatilities=dict(zip(tickers, np.linspace(4, 22, num_assets))),
+        correlation_matrix=correlation,
+    )
+
+def best_time(simulator: PortfolioSimulator, policy: dict, assets: dict, paths: int, years: int, repeats: int) -> float:
+    timings = []
+    for repeat in range(repeats):
+        start = time.perf_counter()
+        simulator.run_multi_asset_simulation(10000, 500, paths, years, seed=repeat, **assets, **policy)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--assets", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    simulator = PortfolioSimulator()
+    assets = portfolio(args.assets)
+    print(f"{'policy':<22}{'seconds':>10}")
+    for name, policy in POLICIES.items():
+        print(f"{name:<22}{best_time(simulator, policy, assets, args.paths, args.years, args.repeats):>10.4f}")
+
+if __name__ == "__main__":
+    main()
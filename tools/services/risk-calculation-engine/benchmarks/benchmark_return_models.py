@@ -0,0 +1,42 @@
+"""
+Times each single-asset return model against the normal model.
+
+Run from the service directory:
+
+    python -m benchmarks.benchmark_return_models [--paths 10000] [--years 30] [--repeats 5]
+"""
+import argparse
+import time
+
+from src.portfolio_simulator import PortfolioSimulator
+from src.return_models import RETURN_MODELS
+
+# Fat-tailed and clustering models should stay within this multiple of the normal model.
+MAX_SLOWDOWN = 3.0
+
+def best_time(simulator: PortfolioSimulator, return_model: str, paths: int, years: int, repeats: int) -> float:
+    timings = []
+    for repeat in range(repeats):
+        start = time.perf_counter()
+        simulator.run_monte_carlo_simulation(10000, 500, paths, years, 7, 15, seed=repeat, return_model=return_model)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    simulator = PortfolioSimulator()
+    baseline = best_time(simulator, "normal", args.paths, args.years, args.repeats)
+    print(f"{'model':<18}{'seconds':>10}{'vs normal':>12}")
+    for return_model in RETURN_MODELS:
+        seconds = baseline if return_model == "normal" else best_time(simulator, return_model, args.paths, args.years, args.repeats)
+        ratio = seconds / baseline
+        flag = "" if ratio <= MAX_SLOWDOWN else f"  (over {MAX_SLOWDOWN:.0f}x)"
+        print(f"{return_model:<18}{seconds:>10.4f}{ratio:>11.2f}x{flag}")
+
+if __name__ == "__main__":
+    main()
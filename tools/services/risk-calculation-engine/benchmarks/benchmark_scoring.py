@@ -0,0 +1,54 @@
+"""
+Times single-row scoring: the compiled model against building the normalised feature dict
+and weighting it key by key, as RiskAssessmentEngine.score used to.
+
+Run from the service directory:
+
+    python -m benchmarks.benchmark_scoring [--rows 20000] [--repeats 5]
+"""
+import argparse
+import time
+
+from src.macro_indicators import MacroIndicatorStore
+from src.risk_assessment_engine import RiskAssessmentEngine, RiskFactors
+
+from .benchmark_batch_score import REGIONS, applicants
+
+def dict_score(engine: RiskAssessmentEngine, data: RiskFactors) -> float:
+    normalized = engine._normalize_data(data)
+    weighted_factors = {k: normalized[k] * engine.weights.get(k, 0) for k in engine.weights}
+    return sum(weighted_factors.values())
+
+def best_time(function, rows: list, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for data in rows:
+            function(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    store = MacroIndicatorStore(fetcher=REGIONS.__getitem__)
+    store.refresh(REGIONS)
+    engine = RiskAssessmentEngine(macro_indicators=store)
+    rows = [RiskFactors(**row) for row in applicants(args.rows).to_dict("records")]
+    model = engine.compiled()
+
+    paths = {
+        "dict": lambda data: dict_score(engine, data),
+        "engine": engine.score,
+        "compiled": model.score,
+    }
+    print(f"{'path':<12}{'seconds':>10}{'us/row':>10}")
+    for name, function in paths.items():
+        seconds = best_time(function, rows, args.repeats)
+        print(f"{name:<12}{seconds:>10.4f}{seconds / len(rows) * 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
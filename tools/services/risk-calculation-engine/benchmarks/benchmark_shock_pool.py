@@ -0,0 +1,48 @@
+"""
+Times unseeded simulations drawing their own normals against drawing from a shared shock pool.
+
+Run from the service directory:
+
+    python -m benchmarks.benchmark_shock_pool [--paths 5000] [--years 30] [--repeats 5]
+"""
+import argparse
+import time
+import uuid
+
+from src.portfolio_simulator import PortfolioSimulator
+from src.shock_pool import attach_shock_pool
+
+# Pause between requests so the refill thread can top the pool up, as it would between real requests.
+REQUEST_GAP_SECONDS = 0.3
+
+def best_time(simulator: PortfolioSimulator, paths: int, years: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        time.sleep(REQUEST_GAP_SECONDS)
+        start = time.perf_counter()
+        simulator.run_monte_carlo_simulation(10000, 500, paths, years, 7, 15)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = attach_shock_pool(f"benchmark-shocks-{uuid.uuid4().hex[:8]}", 128, 2 ** 17)
+    pool.start_refill()
+    simulators = {"own draws": PortfolioSimulator(), "shock pool": PortfolioSimulator(shock_pool=pool)}
+    try:
+        print(f"{'source':<14}{'seconds':>10}")
+        for name, simulator in simulators.items():
+            print(f"{name:<14}{best_time(simulator, args.paths, args.years, args.repeats):>10.4f}")
+        print(f"pooled share: {pool.stats()['pooled_share']:.2%}")
+    finally:
+        for simulator in simulators.values():
+            simulator.close()
+        pool.close()
+
+if __name__ == "__main__":
+    main()
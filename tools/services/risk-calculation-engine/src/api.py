@@ -1,16 +1,179 @@
-from fastapi import FastAPI, HTTPException
+import base64
+import io
+import json
+import logging
+import os
+from contextlib import AsyncExitStack
+from datetime import date, datetime, time
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Literal, Optional, Type, Union
+
+import anyio
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from .config import settings
 from .portfolio_simulator import PortfolioSimulator # Import the simulator we just created
+from .simulation_cache import canonical_cache_key, create_simulation_cache
+from .simulation_jobs import JobQueueFullError, SimulationJobQueue
+from .shock_pool import attach_shock_pool
+from .simulation_surface import SimulationSurface
+from .historical_returns import PERIODS_PER_MONTH, HistoricalReturnStore
+from .macro_indicators import MacroIndicatorStore
+from .bulk_assessment import BulkRiskAssessor, iter_text_lines, parse_csv_header
 from .risk_assessment_engine import RiskAssessmentEngine, RiskFactors
 
+# The market data loaders live in the market-data-ingestion service; bootstrap
+# simulations are only available when its src directory is importable.
+try:
+    from db_loader import DatabaseConfig, get_db_loader
+    HAS_DB_LOADER = True
+except ImportError:
+    HAS_DB_LOADER = False
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Portfolio Simulation Engine",
     description="API for running Monte Carlo simulations on investment portfolios.",
     version="0.1.0"
 )
 
+# Pre-generated normal shocks shared by every worker process on the host; unseeded
+# simulations take their draws from it instead of generating them per request.
+shock_pool = attach_shock_pool(
+    settings.SIMULATION_SHOCK_POOL_NAME,
+    settings.SIMULATION_SHOCK_POOL_BLOCKS,
+    settings.SIMULATION_SHOCK_POOL_BLOCK_VALUES
+) if settings.SIMULATION_SHOCK_POOL_ENABLED else None
+
 # Initialize the portfolio simulator
-simulator = PortfolioSimulator()
+simulator = PortfolioSimulator(
+    memory_budget_mb=settings.SIMULATION_MEMORY_BUDGET_MB,
+    max_workers=settings.SIMULATION_MAX_WORKERS,
+    confidence_levels=settings.SIMULATION_CONFIDENCE_LEVELS,
+    shock_pool=shock_pool
+)
+
+# Identical requests (e.g. the default slider positions on the simulation page)
+# are answered from this cache instead of re-running the Monte Carlo.
+simulation_cache = create_simulation_cache(settings)
+
+# Large simulations run here in the background and are fetched by job ID, so they never
+# hold up the event loop (or other endpoints such as /assess-risk) while they run.
+simulation_jobs = SimulationJobQueue(
+    max_workers=settings.SIMULATION_JOB_WORKERS,
+    max_queued=settings.SIMULATION_JOB_MAX_QUEUED,
+    result_ttl_seconds=settings.SIMULATION_JOB_RESULT_TTL_SECONDS
+)
+
+# Precomputed slider surface, loaded at startup (or on first use once the build job has run)
+# and reloaded whenever a rebuild replaces its sidecar, identified by its stat signature.
+simulation_surface: Optional[SimulationSurface] = None
+_simulation_surface_signature: Optional[tuple] = None
+
+# Historical portfolio returns for bootstrap simulations, loaded once per holdings/date range.
+historical_returns = HistoricalReturnStore()
+_market_data_connections = AsyncExitStack()
+
+@app.on_event("startup")
+async def connect_market_data():
+    if not settings.MARKET_DATA_DB_TYPE:
+        return
+    if not HAS_DB_LOADER:
+        logger.warning("MARKET_DATA_DB_TYPE is set but db_loader is not importable; bootstrap simulations are disabled.")
+        return
+    config = DatabaseConfig(
+        db_type=settings.MARKET_DATA_DB_TYPE,
+        host=settings.MARKET_DATA_DB_HOST,
+        port=settings.MARKET_DATA_DB_PORT,
+        database=settings.MARKET_DATA_DB_NAME,
+        username=settings.MARKET_DATA_DB_USER,
+        password=settings.MARKET_DATA_DB_PASSWORD,
+        sqlite_path=settings.MARKET_DATA_SQLITE_PATH,
+    )
+    historical_returns.loader = await _market_data_connections.enter_async_context(get_db_loader(config))
+
+@app.on_event("shutdown")
+async def disconnect_market_data():
+    historical_returns.loader = None
+    await _market_data_connections.aclose()
+
+@app.on_event("shutdown")
+def stop_simulation_jobs():
+    simulation_jobs.shutdown(wait=False)
+    simulator.close()
+
+@app.on_event("startup")
+def start_shock_pool_refill():
+    if shock_pool is not None:
+        shock_pool.start_refill()
+
+def _get_simulation_surface() -> Optional[SimulationSurface]:
+    global simulation_surface, _simulation_surface_signature
+    # build_surface replaces the sidecar last, so a new sidecar means a complete new surface.
+    # Until then (or if the files are removed) the open memory map keeps serving the old one.
+    try:
+        stat = os.stat(SimulationSurface.metadata_path(settings.SIMULATION_SURFACE_PATH))
+    except FileNotFoundError:
+        return simulation_surface
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if signature != _simulation_surface_signature:
+        simulation_surface = SimulationSurface.load(settings.SIMULATION_SURFACE_PATH)
+        _simulation_surface_signature = signature
+        logger.info(f"Loaded simulation surface {settings.SIMULATION_SURFACE_PATH} {simulation_surface.values.shape}")
+    return simulation_surface
+
+@app.on_event("startup")
+def load_simulation_surface():
+    if _get_simulation_surface() is None:
+        logger.info(f"No simulation surface at {settings.SIMULATION_SURFACE_PATH}; /simulate-portfolio/surface is unavailable until it is built.")
+
+@app.on_event("shutdown")
+def close_shock_pool():
+    if shock_pool is not None:
+        shock_pool.close()
+
+def _simulation_cache_key(namespace: str, input_data: BaseModel) -> str:
+    # The worker count only changes where paths run, never the result, so it is not part of the key.
+    payload = input_data.model_dump(exclude={"workers"})
+    return canonical_cache_key(namespace, payload, settings.SIMULATION_CACHE_FLOAT_PRECISION)
+
+def _encode_final_values(result: dict) -> dict:
+    """Replaces raw final values (distribution='raw') with a base64 .npy payload, so results stay JSON-ready."""
+    values = result.pop("final_portfolio_values", None)
+    if values is not None:
+        buffer = io.BytesIO()
+        np.save(buffer, values, allow_pickle=False)
+        result["final_portfolio_values_npy"] = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return result
+
+def _job_accepted(job) -> JSONResponse:
+    return JSONResponse(status_code=202, content={
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/simulate-portfolio/jobs/{job.job_id}",
+        "events_url": f"/simulate-portfolio/jobs/{job.job_id}/events",
+    })
+
+async def _run_or_queue(kind: str, path_months: int, simulate: Callable[[], Dict[str, Any]],
+                        output_model: Type[BaseModel]) -> Union[BaseModel, JSONResponse]:
+    """
+    Runs a simulation off the event loop and wraps its result in the endpoint's output model.
+
+    Requests above SIMULATION_JOB_THRESHOLD_PATH_MONTHS are queued as background jobs and
+    answered at once with a 202 and the job ID; the job's result is then the same body the
+    endpoint would have returned. Smaller ones run in the threadpool and are returned directly.
+    """
+    if path_months > settings.SIMULATION_JOB_THRESHOLD_PATH_MONTHS:
+        return _job_accepted(simulation_jobs.submit(kind, lambda: output_model(**simulate()).model_dump(mode="json")))
+    return output_model(**await run_in_threadpool(simulate))
+
+# Returned instead of the result when a request is queued as a background job.
+_JOB_ACCEPTED_RESPONSE = {202: {"description": "Large request queued as a background job; poll status_url for the result."}}
 
 class SimulationInput(BaseModel):
     """
@@ -22,20 +185,36 @@ class SimulationInput(BaseModel):
     simulation_years: int = Field(..., description="Duration of simulation in years.", ge=1)
     portfolio_annual_return: float = Field(..., description="Expected annual return of the portfolio (%).", ge=-100) # Can be negative, but bounded
     portfolio_annual_volatility: float = Field(..., description="Annual volatility (standard deviation) of the portfolio (%).", ge=0)
+    include_fan_chart: bool = Field(False, description="Also return 10th/50th/90th percentile bands for every month.")
+    workers: int = Field(1, description="Number of worker processes to spread the simulation over (capped at SIMULATION_MAX_WORKERS).", ge=1)
+    sampling: Literal["standard", "antithetic", "sobol"] = Field("standard", description="Random sampling scheme: plain, antithetic pairs, or scrambled Sobol quasi-Monte Carlo.")
+    tolerance: Optional[float] = Field(None, description="Adaptive mode: stop once each percentile's standard error is below this fraction of its value; num_simulations becomes the maximum.", gt=0, lt=1)
+    seed: Optional[int] = Field(None, description="Random seed. The same inputs and seed always give the same result.", ge=0)
+    mode: Literal["monte_carlo", "analytic"] = Field("monte_carlo", description="'analytic' answers instantly from closed-form moments with approximate percentiles; Monte Carlo options are then ignored.")
+    return_model: Literal["normal", "student_t", "regime_switching", "garch"] = Field("normal", description="Distribution of monthly returns: normal, fat-tailed Student-t, calm/stressed regime switching, or GARCH(1,1) volatility clustering.")
+    model_options: Optional[dict[str, float]] = Field(None, description="Optional return model parameters, e.g. degrees_of_freedom, stressed_annual_return, stressed_annual_volatility, to_stressed_probability, to_calm_probability, alpha, beta.")
+    include_tail_metrics: bool = Field(False, description="Also return value at risk, CVaR and the distribution of maximum drawdowns.")
+    distribution: Literal["histogram", "raw", "none"] = Field("histogram", description="Distribution of final values to return: a compact log-scale histogram, that plus every path's value as a base64 .npy array, or none.")
 
 class SimulationOutput(BaseModel):
     """
     Output model for the portfolio simulation endpoint.
     """
-    # final_portfolio_values: list[float] = Field(..., description="List of final portfolio values from all simulations.")
     mean_final_value: float = Field(..., description="Average of all final portfolio values.")
     median_final_value: float = Field(..., description="Median of all final portfolio values (50th percentile).")
     std_dev_final_value: float = Field(..., description="Standard deviation of final portfolio values.")
     percentiles: dict[str, float] = Field(..., description="Dictionary with 10th, 50th, and 90th percentile values.")
-    # For a web application, returning all final_portfolio_values might be too much data for large simulations.
-    # We might only need the summarized percentiles for charting.
+    fan_chart: Optional[dict[str, list[float]]] = Field(None, description="Per-month 10th, 50th and 90th percentile bands, if requested.")
+    paths_used: Optional[int] = Field(None, description="Adaptive mode: number of paths actually simulated.")
+    converged: Optional[bool] = Field(None, description="Adaptive mode: whether the tolerance was met before reaching num_simulations.")
+    standard_errors: Optional[dict[str, float]] = Field(None, description="Adaptive mode: standard error of each reported percentile.")
+    method: str = Field("monte_carlo", description="How the result was produced: 'monte_carlo', 'analytic' or 'surface'.")
+    error_bound: Optional[float] = Field(None, description="Analytic or surface results: relative error bound of the mean and percentiles versus Monte Carlo.")
+    tail_risk: Optional[dict] = Field(None, description="If requested: value at risk and CVaR per confidence level (losses versus total invested) and maximum drawdown statistics.")
+    distribution: Optional[dict] = Field(None, description="Log-scale histogram of the final values (offset, counts and bin layout); histograms of the same layout merge by adding counts.")
+    final_portfolio_values_npy: Optional[str] = Field(None, description="distribution='raw' only: every path's final value as a base64-encoded .npy float64 array.")
 
-@app.post("/simulate-portfolio", response_model=SimulationOutput, summary="Run Portfolio Monte Carlo Simulation")
+@app.post("/simulate-portfolio", response_model=SimulationOutput, responses=_JOB_ACCEPTED_RESPONSE, summary="Run Portfolio Monte Carlo Simulation")
 async def simulate_portfolio(input_data: SimulationInput):
     """
     Runs a Monte Carlo simulation to project potential portfolio growth over time.
@@ -46,31 +225,541 @@ async def simulate_portfolio(input_data: SimulationInput):
     - **simulation_years**: The total length of the simulation in years.
     - **portfolio_annual_return**: The expected average yearly return (e.g., 7 for 7%).
     - **portfolio_annual_volatility**: The expected yearly fluctuation/risk (e.g., 10 for 10%).
+    - **include_fan_chart**: Whether to add per-month percentile bands for a fan chart.
+    - **workers**: How many CPU cores to spread the simulation paths over.
+    - **sampling**: "standard", "antithetic" or "sobol" (lower-variance estimates for the same paths).
+    - **tolerance**: Optional relative standard error at which to stop drawing paths early.
+    - **seed**: Optional random seed for reproducible results.
+    - **mode**: "analytic" for an instant approximate preview instead of a full simulation.
+    - **return_model**: "normal", "student_t", "regime_switching" or "garch" monthly returns.
 
     Returns key statistics about the simulated final portfolio values, including mean, median,
     and specific percentiles (10th, 50th, 90th) to show potential range of outcomes.
+    Results are cached by their (rounded) inputs, so repeated requests return immediately.
+    Requests with more than SIMULATION_JOB_THRESHOLD_PATH_MONTHS path-months get a 202 with
+    a job ID instead; fetch the result from /simulate-portfolio/jobs/{job_id}.
+    """
+    try:
+        if input_data.mode == "analytic":
+            # Closed form in well under a millisecond; not worth a cache entry.
+            return SimulationOutput(**simulator.run_analytic_approximation(
+                initial_investment=input_data.initial_investment,
+                monthly_contribution=input_data.monthly_contribution,
+                simulation_years=input_data.simulation_years,
+                portfolio_annual_return=input_data.portfolio_annual_return,
+                portfolio_annual_volatility=input_data.portfolio_annual_volatility
+            ))
+
+        cache_key = _simulation_cache_key("simulate-portfolio", input_data)
+        if simulation_cache is not None:
+            cached = simulation_cache.get(cache_key)
+            if cached is not None:
+                return SimulationOutput(**cached)
+
+        def simulate() -> dict:
+            # Call the simulation engine with the Pydantic model data
+            result = simulator.run_monte_carlo_simulation(
+                initial_investment=input_data.initial_investment,
+                monthly_contribution=input_data.monthly_contribution,
+                num_simulations=input_data.num_simulations,
+                simulation_years=input_data.simulation_years,
+                portfolio_annual_return=input_data.portfolio_annual_return,
+                portfolio_annual_volatility=input_data.portfolio_annual_volatility,
+                fan_chart=input_data.include_fan_chart,
+                workers=input_data.workers,
+                sampling=input_data.sampling,
+                tolerance=input_data.tolerance,
+                seed=input_data.seed,
+                return_model=input_data.return_model,
+                model_options=input_data.model_options,
+                tail_metrics=input_data.include_tail_metrics,
+                distribution=input_data.distribution
+            )
+
+            _encode_final_values(result)
+
+            if simulation_cache is not None:
+                simulation_cache.set(cache_key, result)
+            return result
+
+        return await _run_or_queue("simulate-portfolio", input_data.num_simulations * input_data.simulation_years * 12,
+                                   simulate, SimulationOutput)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+@app.post("/simulate-portfolio/stream", summary="Run Portfolio Monte Carlo Simulation with progressive results")
+async def simulate_portfolio_stream(input_data: SimulationInput):
+    """
+    Runs the same simulation as /simulate-portfolio and streams newline-delimited JSON.
+
+    After every chunk of paths a progress line is sent with `"status": "running"`,
+    `paths_completed` and the running mean, standard deviation and (approximate)
+    percentiles. The last line is exactly the /simulate-portfolio response body.
+    Disconnecting stops the simulation after the chunk in progress.
+    """
+    try:
+        if input_data.mode == "analytic":
+            results = iter([simulator.run_analytic_approximation(
+                initial_investment=input_data.initial_investment,
+                monthly_contribution=input_data.monthly_contribution,
+                simulation_years=input_data.simulation_years,
+                portfolio_annual_return=input_data.portfolio_annual_return,
+                portfolio_annual_volatility=input_data.portfolio_annual_volatility
+            )])
+            cache_key = None
+        else:
+            cache_key = _simulation_cache_key("simulate-portfolio", input_data)
+            cached = simulation_cache.get(cache_key) if simulation_cache is not None else None
+            if cached is not None:
+                results = iter([cached])
+                cache_key = None
+            else:
+                # Validates the inputs now, so bad requests still get a 400 before streaming starts.
+                results = simulator.iter_monte_carlo_simulation(
+                    initial_investment=input_data.initial_investment,
+                    monthly_contribution=input_data.monthly_contribution,
+                    num_simulations=input_data.num_simulations,
+                    simulation_years=input_data.simulation_years,
+                    portfolio_annual_return=input_data.portfolio_annual_return,
+                    portfolio_annual_volatility=input_data.portfolio_annual_volatility,
+                    fan_chart=input_data.include_fan_chart,
+                    workers=input_data.workers,
+                    sampling=input_data.sampling,
+                    tolerance=input_data.tolerance,
+                    seed=input_data.seed,
+                    return_model=input_data.return_model,
+                    model_options=input_data.model_options,
+                    tail_metrics=input_data.include_tail_metrics,
+                    distribution=input_data.distribution
+                )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson_lines() -> Iterator[str]:
+        # A plain generator: Starlette iterates it in a worker thread, so chunks never
+        # block the event loop, and stops pulling chunks once the client goes away.
+        try:
+            for result in results:
+                if result.get("status") == "running":
+                    yield json.dumps(result) + "\n"
+                    continue
+                _encode_final_values(result)
+                if cache_key is not None and simulation_cache is not None:
+                    simulation_cache.set(cache_key, result)
+                yield SimulationOutput(**result).model_dump_json() + "\n"
+        except Exception as e:
+            yield json.dumps({"status": "error", "detail": f"Internal server error: {e}"}) + "\n"
+        finally:
+            if hasattr(results, "close"):
+                results.close()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+class SurfaceQueryInput(BaseModel):
+    """
+    Input model for the precomputed slider surface endpoint.
+    """
+    initial_investment: float = Field(..., description="Starting portfolio value (USD).", ge=0)
+    monthly_contribution: float = Field(..., description="Amount added monthly (USD).", ge=0)
+    simulation_years: int = Field(..., description="Duration of simulation in years.", ge=1)
+    portfolio_annual_return: float = Field(..., description="Expected annual return of the portfolio (%).")
+    portfolio_annual_volatility: float = Field(..., description="Annual volatility (standard deviation) of the portfolio (%).", ge=0)
+
+@app.post("/simulate-portfolio/surface", response_model=SimulationOutput, summary="Interpolate a simulation from the precomputed slider surface")
+async def simulate_portfolio_surface(input_data: SurfaceQueryInput):
+    """
+    Answers a slider position in microseconds from the precomputed simulation surface.
+
+    The surface holds Monte Carlo statistics per unit invested over a grid of annual return,
+    volatility, horizon and contribution share, built by `python -m src.simulation_surface`.
+    Results are interpolated and scaled by the total invested; `error_bound` is the largest
+    relative error measured against re-simulating off-grid points. Positions outside the
+    grid get a 400, so the client can fall back to /simulate-portfolio.
+    """
+    surface = _get_simulation_surface()
+    if surface is None:
+        raise HTTPException(status_code=503, detail="The simulation surface has not been built yet.")
+    try:
+        return SimulationOutput(**surface.query(**input_data.model_dump()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class GoalSeekInput(BaseModel):
+    """
+    Input model for the goal-seek endpoint. Leave the field named by solve_for unset.
+    """
+    target_value: float = Field(..., description="Portfolio value to reach (USD).", gt=0)
+    probability: float = Field(0.8, description="Required probability of reaching the target.", gt=0, lt=1)
+    solve_for: Literal["monthly_contribution", "simulation_years", "portfolio_annual_return"] = Field(..., description="Which input to solve for.")
+    initial_investment: float = Field(..., description="Starting portfolio value (USD).", ge=0)
+    monthly_contribution: Optional[float] = Field(None, description="Amount added monthly (USD).", ge=0)
+    simulation_years: Optional[int] = Field(None, description="Duration of simulation in years.", ge=1)
+    portfolio_annual_return: Optional[float] = Field(None, description="Expected annual return of the portfolio (%).", ge=-100)
+    portfolio_annual_volatility: float = Field(..., description="Annual volatility (standard deviation) of the portfolio (%).", ge=0)
+    num_simulations: int = Field(10000, description="Number of Monte Carlo simulation paths.", ge=100, le=50000)
+    sampling: Literal["standard", "antithetic", "sobol"] = Field("standard", description="Random sampling scheme: plain, antithetic pairs, or scrambled Sobol quasi-Monte Carlo.")
+    seed: Optional[int] = Field(None, description="Random seed. Seeded solves reuse the same simulated paths and return in milliseconds.", ge=0)
+
+class GoalSeekOutput(BaseModel):
+    """
+    Output model for the goal-seek endpoint.
+    """
+    solve_for: str = Field(..., description="The input that was solved for.")
+    value: Optional[float] = Field(None, description="Smallest value reaching the target with the requested probability; null if unreachable.")
+    achievable: bool = Field(..., description="Whether the target can be reached within the searched range.")
+    success_probability: float = Field(..., description="Share of simulated paths reaching the target at the solved value.")
+
+@app.post("/simulate-portfolio/goal-seek", response_model=GoalSeekOutput, summary="Solve for the contribution, horizon or return that reaches a goal")
+async def goal_seek(input_data: GoalSeekInput):
+    """
+    Answers questions such as "what monthly contribution reaches $500,000 with 80% probability?".
+
+    Solves for **monthly_contribution**, **simulation_years** or **portfolio_annual_return**
+    against a single set of simulated market paths instead of re-running the simulation
+    for every candidate value.
     """
     try:
-        # Call the simulation engine with the Pydantic model data
-        result = simulator.run_monte_carlo_simulation(
-            initial_investment=input_data.initial_investment,
-            monthly_contribution=input_data.monthly_contribution,
-            num_simulations=input_data.num_simulations,
-            simulation_years=input_data.simulation_years,
-            portfolio_annual_return=input_data.portfolio_annual_return,
-            portfolio_annual_volatility=input_data.portfolio_annual_volatility
+        return GoalSeekOutput(**await run_in_threadpool(simulator.solve_goal, **input_data.model_dump()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+class ScenarioInput(BaseModel):
+    """
+    One scenario of a batch simulation.
+    """
+    label: Optional[str] = Field(None, description="Optional name echoed back with the scenario's result.")
+    initial_investment: float = Field(..., description="Starting portfolio value (USD).", ge=0)
+    monthly_contribution: float = Field(..., description="Amount added monthly (USD).", ge=0)
+    simulation_years: int = Field(..., description="Duration of simulation in years.", ge=1)
+    portfolio_annual_return: float = Field(..., description="Expected annual return of the portfolio (%).", ge=-100)
+    portfolio_annual_volatility: float = Field(..., description="Annual volatility (standard deviation) of the portfolio (%).", ge=0)
+
+class BatchSimulationInput(BaseModel):
+    """
+    Input model for the batch scenario simulation endpoint.
+    """
+    scenarios: list[ScenarioInput] = Field(..., description="Scenarios to compare side by side.", min_length=1, max_length=50)
+    num_simulations: int = Field(..., description="Number of Monte Carlo simulation paths, shared by every scenario.", ge=1)
+    include_fan_chart: bool = Field(False, description="Also return 10th/50th/90th percentile bands for every month.")
+    workers: int = Field(1, description="Number of worker processes to spread the simulation over (capped at SIMULATION_MAX_WORKERS).", ge=1)
+    sampling: Literal["standard", "antithetic", "sobol"] = Field("standard", description="Random sampling scheme: plain, antithetic pairs, or scrambled Sobol quasi-Monte Carlo.")
+    seed: Optional[int] = Field(None, description="Random seed. The same inputs and seed always give the same result.", ge=0)
+    distribution: Literal["histogram", "raw", "none"] = Field("histogram", description="Distribution of final values to return: a compact log-scale histogram, that plus every path's value as a base64 .npy array, or none.")
+
+class ScenarioOutput(SimulationOutput):
+    """
+    Result of one scenario of a batch simulation.
+    """
+    label: Optional[str] = Field(None, description="The scenario's label, if one was given.")
+
+class BatchSimulationOutput(BaseModel):
+    """
+    Output model for the batch scenario simulation endpoint.
+    """
+    results: list[ScenarioOutput] = Field(..., description="One result per scenario, in request order.")
+
+@app.post("/simulate-portfolio/batch", response_model=BatchSimulationOutput, responses=_JOB_ACCEPTED_RESPONSE, summary="Run several portfolio scenarios with common random numbers")
+async def simulate_portfolio_batch(input_data: BatchSimulationInput):
+    """
+    Simulates up to 50 scenarios (e.g. different contributions or return assumptions) in one call.
+
+    Every scenario is driven by the same random market paths, so differences between the
+    results reflect the scenarios themselves rather than sampling noise, and the batch costs
+    far less than one request per scenario.
+    """
+    try:
+        cache_key = _simulation_cache_key("simulate-portfolio/batch", input_data)
+        if simulation_cache is not None:
+            cached = simulation_cache.get(cache_key)
+            if cached is not None:
+                return BatchSimulationOutput(**cached)
+
+        def simulate() -> dict:
+            results = simulator.run_batch_simulation(
+                scenarios=[scenario.model_dump(exclude={"label"}) for scenario in input_data.scenarios],
+                num_simulations=input_data.num_simulations,
+                fan_chart=input_data.include_fan_chart,
+                workers=input_data.workers,
+                sampling=input_data.sampling,
+                seed=input_data.seed,
+                distribution=input_data.distribution
+            )
+            for scenario, result in zip(input_data.scenarios, results):
+                _encode_final_values(result)
+                result["label"] = scenario.label
+
+            response = {"results": results}
+            if simulation_cache is not None:
+                simulation_cache.set(cache_key, response)
+            return response
+
+        path_months = input_data.num_simulations * sum(scenario.simulation_years * 12 for scenario in input_data.scenarios)
+        return await _run_or_queue("simulate-portfolio/batch", path_months, simulate, BatchSimulationOutput)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+class AssetInput(BaseModel):
+    """
+    One holding in a multi-asset simulation.
+    """
+    ticker: str = Field(..., description="Asset ticker, as used in the correlation matrix.", min_length=1)
+    weight: float = Field(..., description="Portfolio weight (0-1). Weights must sum to 1.", ge=0, le=1)
+    annual_return: float = Field(..., description="Expected annual return of the asset (%).", ge=-100)
+    annual_volatility: float = Field(..., description="Annual volatility of the asset (%).", ge=0)
+
+class MultiAssetSimulationInput(BaseModel):
+    """
+    Input model for the multi-asset portfolio simulation endpoint.
+    """
+    initial_investment: float = Field(..., description="Starting portfolio value (USD).", ge=0)
+    monthly_contribution: float = Field(..., description="Amount added monthly (USD).", ge=0)
+    num_simulations: int = Field(..., description="Number of Monte Carlo simulation paths.", ge=1)
+    simulation_years: int = Field(..., description="Duration of simulation in years.", ge=1)
+    assets: list[AssetInput] = Field(..., description="Holdings with their weights and return assumptions.", min_length=1)
+    correlation_matrix: dict[str, dict[str, float]] = Field(..., description="Pairwise correlations, as returned by CorrelationCalculator.get_correlations.")
+    correlation_window: Optional[str] = Field(None, description="Lookback window the correlations were estimated over (e.g. '1y'); used to cache the decomposition.")
+    include_fan_chart: bool = Field(False, description="Also return 10th/50th/90th percentile bands for every month.")
+    include_tail_metrics: bool = Field(False, description="Also return value at risk, CVaR and the distribution of maximum drawdowns.")
+    distribution: Literal["histogram", "raw", "none"] = Field("histogram", description="Distribution of final values to return: a compact log-scale histogram, that plus every path's value as a base64 .npy array, or none.")
+    rebalance_months: Optional[int] = Field(1, description="Months between scheduled rebalances to the target weights (1 monthly, 12 annual); null for none.", ge=1)
+    rebalance_threshold: Optional[float] = Field(None, description="Also rebalance whenever any weight drifts more than this from its target (e.g. 0.05).", gt=0, lt=1)
+    transaction_cost: float = Field(0.0, description="Cost of rebalancing trades, as a percentage of the value traded (e.g. 0.1 for 0.1%).", ge=0, lt=100)
+    seed: Optional[int] = Field(None, description="Random seed. The same inputs and seed always give the same result.", ge=0)
+
+@app.post("/simulate-portfolio/multi-asset", response_model=SimulationOutput, responses=_JOB_ACCEPTED_RESPONSE, summary="Run Multi-Asset Portfolio Monte Carlo Simulation")
+async def simulate_multi_asset_portfolio(input_data: MultiAssetSimulationInput):
+    """
+    Runs a Monte Carlo simulation for a portfolio of correlated assets.
+
+    Correlated monthly returns are generated from the supplied correlation matrix; the
+    matrix decomposition is cached per asset universe and correlation window. Between
+    rebalances (monthly by default) holdings drift with their own returns; set
+    **rebalance_months**, **rebalance_threshold** and **transaction_cost** to compare
+    rebalancing policies, e.g. for a recommended allocation.
+    """
+    try:
+        tickers = [asset.ticker for asset in input_data.assets]
+        if len(set(tickers)) != len(tickers):
+            raise ValueError("Each asset may only be listed once.")
+
+        cache_key = _simulation_cache_key("simulate-portfolio/multi-asset", input_data)
+        if simulation_cache is not None:
+            cached = simulation_cache.get(cache_key)
+            if cached is not None:
+                return SimulationOutput(**cached)
+
+        def simulate() -> dict:
+            result = simulator.run_multi_asset_simulation(
+                initial_investment=input_data.initial_investment,
+                monthly_contribution=input_data.monthly_contribution,
+                num_simulations=input_data.num_simulations,
+                simulation_years=input_data.simulation_years,
+                asset_weights={asset.ticker: asset.weight for asset in input_data.assets},
+                asset_annual_returns={asset.ticker: asset.annual_return for asset in input_data.assets},
+                asset_annual_volatilities={asset.ticker: asset.annual_volatility for asset in input_data.assets},
+                correlation_matrix=input_data.correlation_matrix,
+                correlation_window=input_data.correlation_window,
+                fan_chart=input_data.include_fan_chart,
+                tail_metrics=input_data.include_tail_metrics,
+                rebalance_months=input_data.rebalance_months,
+                rebalance_threshold=input_data.rebalance_threshold,
+                transaction_cost=input_data.transaction_cost,
+                seed=input_data.seed,
+                distribution=input_data.distribution
+            )
+            _encode_final_values(result)
+            if simulation_cache is not None:
+                simulation_cache.set(cache_key, result)
+            return result
+
+        # Every asset adds a return per path and month.
+        path_months = input_data.num_simulations * input_data.simulation_years * 12 * len(input_data.assets)
+        return await _run_or_queue("simulate-portfolio/multi-asset", path_months, simulate, SimulationOutput)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+class HoldingInput(BaseModel):
+    """
+    One holding in a bootstrap simulation.
+    """
+    ticker: str = Field(..., description="Ticker as stored in the market_data table.", min_length=1)
+    weight: float = Field(..., description="Portfolio weight (0-1). Weights must sum to 1.", ge=0, le=1)
+
+class BootstrapSimulationInput(BaseModel):
+    """
+    Input model for the historical block-bootstrap simulation endpoint.
+    """
+    initial_investment: float = Field(..., description="Starting portfolio value (USD).", ge=0)
+    monthly_contribution: float = Field(..., description="Amount added monthly (USD).", ge=0)
+    num_simulations: int = Field(..., description="Number of Monte Carlo simulation paths.", ge=1)
+    simulation_years: int = Field(..., description="Duration of simulation in years.", ge=1)
+    holdings: list[HoldingInput] = Field(..., description="Tickers and weights; a single ticker with weight 1 bootstraps that ticker.", min_length=1)
+    start_date: date = Field(..., description="First date of the historical sample.")
+    end_date: date = Field(..., description="Last date of the historical sample.")
+    frequency: Literal["monthly", "daily"] = Field("monthly", description="Resample month-end returns, or daily returns compounded into months.")
+    mean_block_months: float = Field(6.0, description="Average length of the resampled blocks of history, in months.", gt=0)
+    include_fan_chart: bool = Field(False, description="Also return 10th/50th/90th percentile bands for every month.")
+    include_tail_metrics: bool = Field(False, description="Also return value at risk, CVaR and the distribution of maximum drawdowns.")
+    distribution: Literal["histogram", "raw", "none"] = Field("histogram", description="Distribution of final values to return: a compact log-scale histogram, that plus every path's value as a base64 .npy array, or none.")
+    workers: int = Field(1, description="Number of worker processes to spread the simulation over (capped at SIMULATION_MAX_WORKERS).", ge=1)
+    tolerance: Optional[float] = Field(None, description="Adaptive mode: stop once each percentile's standard error is below this fraction of its value.", gt=0, lt=1)
+    seed: Optional[int] = Field(None, description="Random seed. The same inputs and seed always give the same result.", ge=0)
+
+@app.post("/simulate-portfolio/bootstrap", response_model=SimulationOutput, responses=_JOB_ACCEPTED_RESPONSE, summary="Run Historical Block-Bootstrap Portfolio Simulation")
+async def simulate_bootstrap_portfolio(input_data: BootstrapSimulationInput):
+    """
+    Runs a simulation whose monthly returns are resampled in blocks from stored market data
+    instead of assuming normal returns, so historical crashes and volatility clusters appear
+    in the projected range of outcomes.
+    """
+    if historical_returns.loader is None:
+        raise HTTPException(status_code=503, detail="Historical market data is not configured.")
+    try:
+        tickers = [holding.ticker for holding in input_data.holdings]
+        if len(set(tickers)) != len(tickers):
+            raise ValueError("Each holding may only be listed once.")
+
+        cache_key = _simulation_cache_key("simulate-portfolio/bootstrap", input_data)
+        if simulation_cache is not None:
+            cached = simulation_cache.get(cache_key)
+            if cached is not None:
+                return SimulationOutput(**cached)
+
+        returns = await historical_returns.get_returns(
+            weights={holding.ticker: holding.weight for holding in input_data.holdings},
+            start_date=datetime.combine(input_data.start_date, time.min),
+            end_date=datetime.combine(input_data.end_date, time.max),
+            frequency=input_data.frequency
         )
-        
-        # Remove 'final_portfolio_values' from result if it's too large for direct API response
-        # It's better to just send the summarized statistics for typical API use.
-        result.pop('final_portfolio_values', None) # Remove it if it exists
+        def simulate() -> dict:
+            result = simulator.run_bootstrap_simulation(
+                initial_investment=input_data.initial_investment,
+                monthly_contribution=input_data.monthly_contribution,
+                num_simulations=input_data.num_simulations,
+                simulation_years=input_data.simulation_years,
+                historical_returns=returns,
+                periods_per_month=PERIODS_PER_MONTH[input_data.frequency],
+                mean_block_months=input_data.mean_block_months,
+                fan_chart=input_data.include_fan_chart,
+                tail_metrics=input_data.include_tail_metrics,
+                workers=input_data.workers,
+                tolerance=input_data.tolerance,
+                seed=input_data.seed,
+                distribution=input_data.distribution
+            )
+            _encode_final_values(result)
+            if simulation_cache is not None:
+                simulation_cache.set(cache_key, result)
+            return result
 
-        return SimulationOutput(**result)
+        # Daily history compounds several resampled periods into each simulated month.
+        path_months = (input_data.num_simulations * input_data.simulation_years * 12
+                       * PERIODS_PER_MONTH[input_data.frequency])
+        return await _run_or_queue("simulate-portfolio/bootstrap", path_months, simulate, SimulationOutput)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
+@app.get("/simulate-portfolio/cache-stats", summary="Simulation result cache statistics")
+async def simulation_cache_stats():
+    """
+    Returns the simulation cache backend with its hit/miss counters and current size.
+    """
+    if simulation_cache is None:
+        return {"backend": "none", "hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+    return simulation_cache.stats()
+
+@app.get("/simulate-portfolio/shock-pool-stats", summary="Shared shock pool statistics")
+async def shock_pool_stats():
+    """
+    Returns how many pre-generated shock blocks are ready and how many of this worker's
+    draws came from the pool rather than its own generator.
+    """
+    if shock_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **shock_pool.stats()}
+
+class SimulationJobOutput(BaseModel):
+    """
+    Status of a background simulation job.
+    """
+    job_id: str = Field(..., description="ID returned when the request was queued.")
+    kind: str = Field(..., description="Endpoint the job was submitted to.")
+    status: Literal["queued", "running", "completed", "failed"] = Field(..., description="'queued', 'running', 'completed' or 'failed'.")
+    submitted_at: float = Field(..., description="Unix time the job was queued.")
+    started_at: Optional[float] = Field(None, description="Unix time a worker picked the job up.")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished.")
+    result: Optional[dict] = Field(None, description="Once completed: the body the submitting endpoint would have returned.")
+    error: Optional[str] = Field(None, description="Once failed: why.")
+
+@app.get("/simulate-portfolio/jobs/metrics", summary="Simulation job queue metrics")
+async def simulation_job_metrics():
+    """
+    Returns the job queue depth, running jobs, completed/failed counters and how long jobs
+    have waited for a worker (mean, maximum, and the oldest job still queued).
+    """
+    return simulation_jobs.stats()
+
+@app.get("/simulate-portfolio/jobs/{job_id}", response_model=SimulationJobOutput, summary="Poll a background simulation job")
+async def get_simulation_job(job_id: str, wait: float = 0.0):
+    """
+    Returns a job's status, and its result once completed. Finished jobs are kept for
+    SIMULATION_JOB_RESULT_TTL_SECONDS. Pass **wait** (seconds, up to 30) to long-poll:
+    the response is held until the job finishes or the wait runs out.
+    """
+    if wait > 0:
+        job = await run_in_threadpool(simulation_jobs.wait, job_id, min(wait, 30.0))
+    else:
+        job = simulation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired simulation job.")
+    return SimulationJobOutput(**job.to_dict())
+
+@app.get("/simulate-portfolio/jobs/{job_id}/events", summary="Subscribe to a background simulation job")
+async def simulation_job_events(job_id: str):
+    """
+    Streams newline-delimited JSON job status lines: one now, one when a worker picks the
+    job up, a heartbeat every few seconds while it runs, and a final line with the result
+    or error, after which the stream ends.
+    """
+    if simulation_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired simulation job.")
+
+    def ndjson_lines() -> Iterator[str]:
+        # Iterated in a worker thread by Starlette, so waiting here never blocks the event loop.
+        job, last_status = simulation_jobs.get(job_id), None
+        while True:
+            if job is None:
+                yield json.dumps({"job_id": job_id, "status": "error", "detail": "Job expired."}) + "\n"
+                return
+            # Running jobs repeat their status line as a heartbeat.
+            if job.status != last_status or job.status == "running":
+                yield SimulationJobOutput(**job.to_dict()).model_dump_json() + "\n"
+                last_status = job.status
+            if job.finished:
+                return
+            # Queued jobs are checked often so the switch to running is reported promptly.
+            job = simulation_jobs.wait(job_id, timeout=0.5 if job.status == "queued" else 5.0)
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 # Additional endpoints could be added, e.g., for backtesting or more complex scenario analysis.
 
 class RiskAssessmentInput(BaseModel):
@@ -99,13 +788,24 @@ class RiskAssessmentOutput(BaseModel):
     risk_label: str
     recommended_allocation: dict
 
-risk_engine = RiskAssessmentEngine()
+# Region GDP/inflation for /assess-risk, served from memory and refreshed in the background,
+# so scoring never waits on the World Bank API.
+macro_indicators = MacroIndicatorStore(settings.MACRO_INDICATOR_SNAPSHOT_PATH, settings.MACRO_INDICATOR_TTL_SECONDS)
+risk_engine = RiskAssessmentEngine(macro_indicators=macro_indicators)
+
+@app.on_event("startup")
+def start_macro_indicator_refresh():
+    macro_indicators.start_refresh(settings.MACRO_INDICATOR_REFRESH_SECONDS)
+
+@app.on_event("shutdown")
+def stop_macro_indicator_refresh():
+    macro_indicators.close()
 
 @app.post("/assess-risk", response_model=RiskAssessmentOutput, summary="Assess risk profile and recommend allocation")
 async def assess_risk(input_data: RiskAssessmentInput):
     try:
-        factors = RiskFactors(**input_data.dict())
-        result = risk_engine.assess_risk(factors)
+        # Scoring reads region data from memory and takes microseconds, so it runs inline.
+        result = risk_engine.assess_risk(RiskFactors(**input_data.model_dump()))
         return RiskAssessmentOutput(
             risk_score=result['risk_score'],
             risk_label=result['risk_label'],
@@ -114,3 +814,89 @@ async def assess_risk(input_data: RiskAssessmentInput):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while they respond.
+
+    Before ASGI spec 2.4 the stock class watches for disconnects by calling receive() from
+    the start, which would swallow the body the endpoint is still reading. Here that watch
+    only starts once body_read is set; until then the body reader sees a disconnect itself,
+    as ClientDisconnect. Everything else, background tasks included, is the stock behaviour.
+    """
+
+    def __init__(self, content: AsyncIterator[str], body_read: anyio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def __call__(self, scope, receive, send) -> None:
+        async def receive_after_body():
+            await self.body_read.wait()
+            return await receive()
+
+        await super().__call__(scope, receive_after_body, send)
+
+@app.post("/assess-risk/bulk", summary="Score a streamed CSV or NDJSON file of applicants")
+async def assess_risk_bulk(request: Request,
+                           format: Optional[Literal["ndjson", "csv"]] = Query(None, description="Body format; by default 'csv' for a text/csv Content-Type, otherwise 'ndjson'."),
+                           chunk_size: Optional[int] = Query(None, ge=1, le=100000, description="Rows scored together; defaults to RISK_BULK_CHUNK_ROWS.")):
+    """
+    Scores an upload of applicant rows, one record per line: NDJSON objects, or CSV with a
+    header row of RiskFactors field names. Missing fields take the /assess-risk defaults.
+
+    The body is read and scored a chunk at a time and the results stream back as
+    newline-delimited JSON, so memory use doesn't grow with the file. Each row gets a line
+    with its 1-based `row` number and either `score` and `classification` or an `error`.
+    Each chunk ends with a `"status": "chunk"` line (rows, errors, parse and score seconds),
+    and the stream with a `"status": "completed"` summary.
+    """
+    if format is None:
+        format = "csv" if request.headers.get("content-type", "").startswith("text/csv") else "ndjson"
+    chunk_size = chunk_size or settings.RISK_BULK_CHUNK_ROWS
+    lines = iter_text_lines(request.stream())
+    columns = None
+    if format == "csv":
+        # The header is checked before streaming starts, so a bad one gets a 400.
+        header = ""
+        async for header in lines:
+            if header.strip():
+                break
+        try:
+            columns = parse_csv_header(header)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    assessor = BulkRiskAssessor(risk_engine, format, columns)
+    body_read = anyio.Event()
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        start, rows, errors, chunk, number = perf_counter(), 0, 0, [], 0
+        try:
+            try:
+                async for line in lines:
+                    if not line.strip():
+                        continue
+                    number += 1
+                    chunk.append((number, line))
+                    if len(chunk) < chunk_size:
+                        continue
+                    text, metrics = await run_in_threadpool(assessor.assess_chunk, chunk)
+                    rows, errors, chunk = rows + metrics["rows"], errors + metrics["errors"], []
+                    yield text
+            finally:
+                body_read.set()
+            if chunk:
+                text, metrics = await run_in_threadpool(assessor.assess_chunk, chunk)
+                rows, errors = rows + metrics["rows"], errors + metrics["errors"]
+                yield text
+        except ClientDisconnect:
+            logger.info(f"Client disconnected from a bulk risk assessment after {rows} rows")
+            return
+        except Exception as e:
+            logger.exception("Bulk risk assessment failed")
+            yield json.dumps({"status": "error", "detail": f"Internal server error: {e}"}) + "\n"
+            return
+        seconds = perf_counter() - start
+        logger.info(f"Bulk risk assessment scored {rows} rows ({errors} unreadable) in {assessor.chunks} chunks, {seconds:.3f}s")
+        yield json.dumps({"status": "completed", "rows": rows, "errors": errors, "chunks": assessor.chunks,
+                          "seconds": round(seconds, 6)}) + "\n"
+
+    return UploadStreamingResponse(ndjson_lines(), body_read, media_type="application/x-ndjson")
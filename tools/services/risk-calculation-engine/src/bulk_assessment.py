@@ -0,0 +1,148 @@
+import codecs
+import csv
+import json
+import math
+import time
+from dataclasses import fields
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .risk_assessment_engine import FALSE_VALUES, TRUE_VALUES, RiskAssessmentEngine, RiskFactors
+
+BULK_FORMATS = ("ndjson", "csv")
+
+# RiskFactors field -> declared type, in field order; every scored row is filled out to all of them.
+FIELD_TYPES = {f.name: f.type for f in fields(RiskFactors)}
+FIELD_DEFAULTS = {name: getattr(RiskFactors(), name) for name in FIELD_TYPES}
+
+async def iter_text_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Splits a streamed UTF-8 body into lines without holding more than one line in memory."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+def parse_csv_header(line: str) -> List[str]:
+    """Column names from a CSV header line; raises ValueError for columns RiskFactors doesn't have."""
+    columns = [column.strip() for column in next(csv.reader([line]))]
+    unknown = [column for column in columns if column not in FIELD_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown risk factor columns: {', '.join(unknown)}.")
+    if len(set(columns)) != len(columns):
+        raise ValueError("Duplicate columns in the CSV header.")
+    return columns
+
+def _coerce(name: str, value: Any) -> Any:
+    kind = FIELD_TYPES[name]
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES or text in FALSE_VALUES:
+            return text in TRUE_VALUES
+        raise ValueError(f"{name} must be true or false, got {value!r}.")
+    if kind in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{name} must be a number, got {value!r}.")
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number, got {value!r}.") from None
+        if not math.isfinite(number):
+            raise ValueError(f"{name} must be finite, got {value!r}.")
+        return number
+    return str(value)
+
+class BulkRiskAssessor:
+    """
+    Parses and scores chunks of a bulk upload, one CSV or NDJSON record per line.
+
+    Each chunk becomes one DataFrame for RiskAssessmentEngine.batch_score, and comes back as
+    NDJSON: a line per row (its score and classification, or why it could not be read)
+    followed by a chunk line with row counts and parse/score timings. Empty fields and
+    nulls take the RiskFactors defaults.
+    """
+
+    def __init__(self, engine: RiskAssessmentEngine, fmt: str, columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            engine (RiskAssessmentEngine): Scores the parsed rows.
+            fmt (str): 'ndjson' or 'csv'.
+            columns (Optional[Sequence[str]]): CSV column names, from parse_csv_header.
+        """
+        if fmt not in BULK_FORMATS:
+            raise ValueError(f"Unknown bulk format '{fmt}'. Available: {', '.join(BULK_FORMATS)}.")
+        if fmt == "csv" and columns is None:
+            raise ValueError("CSV uploads need the header's columns.")
+        self.engine = engine
+        self.fmt = fmt
+        self.columns = list(columns) if columns is not None else None
+        self.chunks = 0
+
+    def _parse(self, line: str) -> Dict[str, Any]:
+        if self.fmt == "csv":
+            values = next(csv.reader([line]))
+            if len(values) != len(self.columns):
+                raise ValueError(f"Expected {len(self.columns)} fields, got {len(values)}.")
+            record = {column: value for column, value in zip(self.columns, values) if value.strip() != ""}
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON: {e}") from None
+            if not isinstance(record, dict):
+                raise ValueError("Each NDJSON line must be a JSON object.")
+            unknown = [key for key in record if key not in FIELD_TYPES]
+            if unknown:
+                raise ValueError(f"Unknown risk factor fields: {', '.join(unknown)}.")
+            record = {key: value for key, value in record.items() if value is not None}
+        return {name: _coerce(name, record[name]) if name in record else FIELD_DEFAULTS[name]
+                for name in FIELD_TYPES}
+
+    def assess_chunk(self, rows: Sequence[Tuple[int, str]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Args:
+            rows (Sequence[Tuple[int, str]]): (row number, raw line) pairs.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The NDJSON text for the chunk, ending with its chunk
+                line, and that chunk line's metrics.
+        """
+        start = time.perf_counter()
+        parsed, errors = [], {}
+        for number, line in rows:
+            try:
+                parsed.append((number, self._parse(line)))
+            except ValueError as e:
+                errors[number] = str(e)
+        parsed_at = time.perf_counter()
+
+        scores = {}
+        if parsed:
+            frame = pd.DataFrame.from_records([tuple(record.values()) for _, record in parsed],
+                                              columns=list(FIELD_TYPES))
+            scored = self.engine.batch_score(frame)
+            for (number, _), score, classification in zip(parsed, scored["score"], scored["classification"]):
+                scores[number] = {"row": number, "score": float(score), "classification": classification}
+        scored_at = time.perf_counter()
+
+        lines = [json.dumps(scores[number] if number in scores else {"row": number, "error": errors[number]})
+                 for number, _ in rows]
+        metrics = {
+            "status": "chunk",
+            "chunk": self.chunks,
+            "rows": len(rows),
+            "errors": len(errors),
+            "parse_seconds": round(parsed_at - start, 6),
+            "score_seconds": round(scored_at - parsed_at, 6),
+        }
+        self.chunks += 1
+        lines.append(json.dumps(metrics))
+        return "\n".join(lines) + "\n", metrics
@@ -43,6 +43,53 @@ class Settings:
     # Example for risk engine specific parameters
     DEFAULT_RISK_TOLERANCE: float = float(os.getenv("DEFAULT_RISK_TOLERANCE", 0.5))
     SIMULATION_ITERATIONS: int = int(os.getenv("SIMULATION_ITERATIONS", 1000))
+    # Memory ceiling (MB) for one chunk of Monte Carlo paths in PortfolioSimulator
+    SIMULATION_MEMORY_BUDGET_MB: float = float(os.getenv("SIMULATION_MEMORY_BUDGET_MB", 64))
+    # Size of the process pool PortfolioSimulator spreads path chunks over (defaults to CPU count)
+    SIMULATION_MAX_WORKERS: int = int(os.getenv("SIMULATION_MAX_WORKERS", os.cpu_count() or 1))
+    # Confidence levels for simulated VaR/CVaR (same defaults as RiskCalculationConfig.CONFIDENCE_INTERVALS)
+    SIMULATION_CONFIDENCE_LEVELS: list = [float(level) for level in os.getenv("SIMULATION_CONFIDENCE_LEVELS", "0.95,0.99").split(',')]
+    # Simulation result cache: "memory" (per-process LRU), "redis" (uses REDIS_* above) or "none"
+    SIMULATION_CACHE_BACKEND: str = os.getenv("SIMULATION_CACHE_BACKEND", "memory")
+    SIMULATION_CACHE_MAX_ENTRIES: int = int(os.getenv("SIMULATION_CACHE_MAX_ENTRIES", 1024))
+    SIMULATION_CACHE_TTL_SECONDS: float = float(os.getenv("SIMULATION_CACHE_TTL_SECONDS", 3600))
+    # Decimal places request floats are rounded to when building cache keys
+    SIMULATION_CACHE_FLOAT_PRECISION: int = int(os.getenv("SIMULATION_CACHE_FLOAT_PRECISION", 4))
+    # Requests above this many simulated path-months (paths x years x 12) run as background jobs
+    SIMULATION_JOB_THRESHOLD_PATH_MONTHS: int = int(os.getenv("SIMULATION_JOB_THRESHOLD_PATH_MONTHS", 12_000_000))
+    # Background simulation jobs run at once, jobs allowed to wait, and how long finished results are kept
+    SIMULATION_JOB_WORKERS: int = int(os.getenv("SIMULATION_JOB_WORKERS", 2))
+    SIMULATION_JOB_MAX_QUEUED: int = int(os.getenv("SIMULATION_JOB_MAX_QUEUED", 100))
+    SIMULATION_JOB_RESULT_TTL_SECONDS: float = float(os.getenv("SIMULATION_JOB_RESULT_TTL_SECONDS", 3600))
+    # Shared-memory pool of pre-generated normal shocks used by unseeded simulations; every
+    # worker on the host attaches to the same named pool (blocks x values float32 normals)
+    SIMULATION_SHOCK_POOL_ENABLED: bool = os.getenv("SIMULATION_SHOCK_POOL_ENABLED", "false").lower() == "true"
+    SIMULATION_SHOCK_POOL_NAME: str = os.getenv("SIMULATION_SHOCK_POOL_NAME", "risk-engine-shocks")
+    SIMULATION_SHOCK_POOL_BLOCKS: int = int(os.getenv("SIMULATION_SHOCK_POOL_BLOCKS", 128))
+    SIMULATION_SHOCK_POOL_BLOCK_VALUES: int = int(os.getenv("SIMULATION_SHOCK_POOL_BLOCK_VALUES", 131072))
+    # Precomputed slider surface written by `python -m src.simulation_surface`; memory-mapped by every worker
+    SIMULATION_SURFACE_PATH: str = os.getenv("SIMULATION_SURFACE_PATH", "simulation_surface.npy")
+    # GDP/inflation per region for the risk engine's region modifier: JSON snapshot loaded at startup,
+    # age after which a region is re-fetched, and how often the background refresh checks
+    MACRO_INDICATOR_SNAPSHOT_PATH: str = os.getenv("MACRO_INDICATOR_SNAPSHOT_PATH", "macro_indicators.json")
+    MACRO_INDICATOR_TTL_SECONDS: float = float(os.getenv("MACRO_INDICATOR_TTL_SECONDS", 86400))
+    MACRO_INDICATOR_REFRESH_SECONDS: float = float(os.getenv("MACRO_INDICATOR_REFRESH_SECONDS", 60))
+    # Rows parsed and scored together by /assess-risk/bulk when the request doesn't pass chunk_size
+    RISK_BULK_CHUNK_ROWS: int = int(os.getenv("RISK_BULK_CHUNK_ROWS", 5000))
+    # Nightly projection batch (`python -m src.projection_batch`, reads DATABASE_URL): portfolios per
+    # keyset page, paths and horizon per portfolio, and worker processes simulating each page
+    PROJECTION_BATCH_PAGE_SIZE: int = int(os.getenv("PROJECTION_BATCH_PAGE_SIZE", 500))
+    PROJECTION_BATCH_SIMULATIONS: int = int(os.getenv("PROJECTION_BATCH_SIMULATIONS", 2000))
+    PROJECTION_BATCH_YEARS: int = int(os.getenv("PROJECTION_BATCH_YEARS", 30))
+    PROJECTION_BATCH_WORKERS: int = int(os.getenv("PROJECTION_BATCH_WORKERS", os.cpu_count() or 1))
+    # Market data store read by bootstrap simulations (db_loader DatabaseConfig fields); empty type disables it
+    MARKET_DATA_DB_TYPE: str = os.getenv("MARKET_DATA_DB_TYPE", "")
+    MARKET_DATA_DB_HOST: str = os.getenv("MARKET_DATA_DB_HOST", "localhost")
+    MARKET_DATA_DB_PORT: int = int(os.getenv("MARKET_DATA_DB_PORT", 5432))
+    MARKET_DATA_DB_NAME: str = os.getenv("MARKET_DATA_DB_NAME", "market_data")
+    MARKET_DATA_DB_USER: str = os.getenv("MARKET_DATA_DB_USER", "")
+    MARKET_DATA_DB_PASSWORD: str = os.getenv("MARKET_DATA_DB_PASSWORD", "")
+    MARKET_DATA_SQLITE_PATH: str = os.getenv("MARKET_DATA_SQLITE_PATH", "market_data.db")
 
     # For development/production distinction
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development") # "development", "production", "testing"
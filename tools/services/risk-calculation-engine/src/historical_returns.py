@@ -0,0 +1,102 @@
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Return frequencies the store can build, and how many of each make one simulated month.
+PERIODS_PER_MONTH = {"monthly": 1, "daily": 21}
+
+# Number of (holdings, date range, frequency) return arrays kept in memory.
+RETURN_CACHE_SIZE = 32
+
+class HistoricalReturnStore:
+    """
+    Builds and caches historical portfolio return series for bootstrap simulations.
+
+    Prices are read once through a market data loader (any object with the
+    db_loader read API, i.e. an async get_data_by_date_range(symbol, start, end)
+    returning rows with 'timestamp' and 'close_price') and reduced to a compact
+    float32 array of portfolio returns, which is then reused for every simulation
+    over the same holdings, date range and frequency.
+    """
+
+    def __init__(self, loader: Optional[Any] = None, cache_size: int = RETURN_CACHE_SIZE):
+        self.loader = loader
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+
+    async def _load_prices(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.Series:
+        rows = await self.loader.get_data_by_date_range(symbol, start_date, end_date)
+        if not rows:
+            raise ValueError(f"No market data stored for {symbol} between {start_date:%Y-%m-%d} and {end_date:%Y-%m-%d}.")
+        prices = pd.DataFrame(rows, columns=["timestamp", "close_price"])
+        prices["timestamp"] = pd.to_datetime(prices["timestamp"])
+        return prices.set_index("timestamp")["close_price"].astype(float).sort_index().rename(symbol)
+
+    @staticmethod
+    def _portfolio_returns(prices: pd.DataFrame, weights: np.ndarray, frequency: str) -> np.ndarray:
+        """Turns aligned close prices into fixed-weight portfolio returns at the given frequency."""
+        if frequency == "monthly":
+            # Month-end closes; group by period so this works across pandas resample aliases.
+            prices = prices.groupby(prices.index.to_period("M")).last()
+        asset_returns = prices.pct_change().dropna()
+        if len(asset_returns) < 2:
+            raise ValueError("Not enough overlapping price history to build a return series (need at least 3 prices).")
+        # Fixed weights, i.e. rebalanced to target every period.
+        return (asset_returns.to_numpy() @ weights).astype(np.float32)
+
+    async def get_returns(self,
+                          weights: Dict[str, float],
+                          start_date: datetime,
+                          end_date: datetime,
+                          frequency: str = "monthly") -> np.ndarray:
+        """
+        Returns the historical portfolio return series, loading it on first use.
+
+        Args:
+            weights (Dict[str, float]): Ticker -> portfolio weight (non-negative, summing to 1).
+                A single ticker with weight 1 gives that ticker's own returns.
+            start_date (datetime): First date of price history to use.
+            end_date (datetime): Last date of price history to use.
+            frequency (str): "monthly" (month-end to month-end) or "daily" returns.
+
+        Returns:
+            np.ndarray: 1-D float32 array of simple returns, oldest first.
+        """
+        if self.loader is None:
+            raise RuntimeError("No market data loader is configured for historical returns.")
+        if frequency not in PERIODS_PER_MONTH:
+            raise ValueError(f"Frequency must be one of: {', '.join(PERIODS_PER_MONTH)}.")
+        if not weights:
+            raise ValueError("At least one holding is required.")
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date.")
+        tickers = sorted(weights)
+        weight_vector = np.array([weights[ticker] for ticker in tickers], dtype=float)
+        if np.any(weight_vector < 0) or not np.isclose(weight_vector.sum(), 1.0):
+            raise ValueError("Asset weights must be non-negative and sum to 1.")
+
+        key = (tuple(tickers), tuple(weight_vector), start_date, end_date, frequency)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        price_series = [await self._load_prices(ticker, start_date, end_date) for ticker in tickers]
+        # Keep only dates every holding traded on so returns line up.
+        prices = pd.concat(price_series, axis=1, join="inner")
+        returns = self._portfolio_returns(prices, weight_vector, frequency)
+        logger.info(f"Loaded {len(returns)} {frequency} returns for {', '.join(tickers)}")
+
+        self._cache[key] = returns
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return returns
+
+    def clear(self) -> None:
+        self._cache.clear()
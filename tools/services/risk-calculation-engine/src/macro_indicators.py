@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# World Bank indicator codes behind each macro value.
+WORLD_BANK_INDICATORS = {"gdp": "NY.GDP.MKTP.CD", "inflation": "FP.CPI.TOTL.ZG"}
+WORLD_BANK_URL = "https://api.worldbank.org/v2/country/{}/indicator/{}?format=json"
+WORLD_BANK_TIMEOUT_SECONDS = 10.0
+
+# Served for regions with no data yet; gives a neutral region modifier of 1.0, as a failed
+# fetch always has.
+MISSING_INDICATORS = {"gdp": 0.0, "inflation": 0.0}
+
+# ISO 3166 alpha-2/alpha-3 country codes (and the World Bank's three-letter aggregates); lookups
+# of anything else are served neutral values and never fetched.
+REGION_CODE = re.compile(r"[A-Z]{2,3}")
+
+def fetch_world_bank_indicators(region: str, timeout: float = WORLD_BANK_TIMEOUT_SECONDS) -> Dict[str, float]:
+    """
+    Latest non-null GDP (current USD) and CPI inflation (%) for a World Bank country code.
+
+    Raises on network or format errors, so a failed refresh keeps the previous values.
+    """
+    results = {}
+    for key, indicator in WORLD_BANK_INDICATORS.items():
+        response = requests.get(WORLD_BANK_URL.format(region, indicator), timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        latest = next((entry for entry in data[1] or [] if entry["value"] is not None), None)
+        results[key] = float(latest["value"]) if latest else 0.0
+    return results
+
+class MacroIndicatorStore:
+    """
+    In-memory GDP and inflation per region for the risk engine's region modifier.
+
+    Lookups never touch the network: get() reads the in-memory table, which is loaded from
+    an on-disk JSON snapshot when the store is created. A background thread (start_refresh)
+    re-fetches regions older than ttl_seconds, and regions that were looked up but had no
+    data, and rewrites the snapshot so the next process starts warm.
+    """
+
+    def __init__(self,
+                 snapshot_path: Optional[str] = None,
+                 ttl_seconds: float = 86400,
+                 fetcher: Callable[[str], Dict[str, float]] = fetch_world_bank_indicators,
+                 max_pending: int = 256,
+                 retry_seconds: float = 3600):
+        """
+        Args:
+            snapshot_path (Optional[str]): JSON snapshot read at startup and rewritten after
+                every refresh. None keeps the store in memory only.
+            ttl_seconds (float): Age after which a region is re-fetched.
+            fetcher (Callable[[str], Dict[str, float]]): Region -> {'gdp', 'inflation'}; raises on failure.
+            max_pending (int): Most regions queued for the next refresh; lookups beyond it aren't queued.
+            retry_seconds (float): How long a region whose fetch failed is left alone before
+                lookups (or its TTL) queue it again.
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("Macro indicator TTL must be positive.")
+        self.snapshot_path = snapshot_path
+        self.ttl_seconds = ttl_seconds
+        self.fetcher = fetcher
+        self.max_pending = max_pending
+        self.retry_seconds = retry_seconds
+        # Region -> {'gdp', 'inflation', 'fetched_at'}; replaced wholesale, never mutated, so
+        # readers need no lock.
+        self._indicators: Dict[str, Dict[str, float]] = {}
+        # Regions looked up without data. Scoring threads add to it, so it has its own lock
+        # rather than _lock, which is held for the whole of a refresh.
+        self._wanted: set = set()
+        # Region -> when its last fetch failed; guarded by _wanted_lock.
+        self._failed_at: Dict[str, float] = {}
+        self._wanted_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        if snapshot_path is not None:
+            self.load_snapshot()
+
+    @staticmethod
+    def _key(region: str) -> str:
+        return region.strip().upper()
+
+    def load_snapshot(self) -> None:
+        """Replaces the in-memory table with the snapshot on disk, if there is one."""
+        try:
+            with open(self.snapshot_path) as f:
+                regions = json.load(f)["regions"]
+        except FileNotFoundError:
+            logger.info(f"No macro indicator snapshot at {self.snapshot_path}; regions load on first refresh.")
+            return
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable macro indicator snapshot {self.snapshot_path}: {e}")
+            return
+        self._indicators = {self._key(region): values for region, values in regions.items()}
+        logger.info(f"Loaded macro indicators for {len(self._indicators)} regions from {self.snapshot_path}")
+
+    def _write_snapshot(self) -> None:
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"regions": self._indicators}, f)
+        os.replace(temporary, self.snapshot_path)
+
+    def get(self, region: str) -> Dict[str, float]:
+        """GDP and inflation for a region from memory; missing regions are queued for the next refresh."""
+        key = self._key(region)
+        values = self._indicators.get(key)
+        if values is None:
+            self._want(key)
+            return MISSING_INDICATORS
+        return values
+
+    def _recently_failed(self, region: str, now: float) -> bool:
+        return now - self._failed_at.get(region, float("-inf")) < self.retry_seconds
+
+    def _want(self, region: str) -> None:
+        if not REGION_CODE.fullmatch(region):
+            return
+        with self._wanted_lock:
+            if (region in self._wanted or len(self._wanted) >= self.max_pending
+                    or self._recently_failed(region, time.time())):
+                return
+            self._wanted.add(region)
+
+    def stale_regions(self, now: Optional[float] = None) -> Iterable[str]:
+        now = time.time() if now is None else now
+        with self._wanted_lock:
+            wanted = set(self._wanted)
+            expired = {region for region, values in self._indicators.items()
+                       if now - values.get("fetched_at", 0.0) > self.ttl_seconds
+                       and not self._recently_failed(region, now)}
+        return sorted(expired | wanted)
+
+    def _finish_wanted(self, region: str, failed: bool) -> None:
+        with self._wanted_lock:
+            self._wanted.discard(region)
+            if failed:
+                now = time.time()
+                self._failed_at = {key: at for key, at in self._failed_at.items() if now - at < self.retry_seconds}
+                self._failed_at[region] = now
+            else:
+                self._failed_at.pop(region, None)
+
+    def refresh(self, regions: Optional[Iterable[str]] = None) -> int:
+        """
+        Fetches the given regions (by default the stale and wanted ones) and publishes them.
+
+        Returns:
+            int: Number of regions updated. Regions whose fetch fails keep their old values.
+        """
+        with self._lock:
+            regions = [self._key(region) for region in (self.stale_regions() if regions is None else regions)]
+            updated, refreshed = dict(self._indicators), 0
+            for region in regions:
+                try:
+                    values = self.fetcher(region)
+                except Exception as e:
+                    # Not retried (by lookups or the TTL) until retry_seconds have passed.
+                    logger.warning(f"Failed to refresh macro indicators for {region}: {e}")
+                    self._finish_wanted(region, failed=True)
+                    continue
+                updated[region] = {"gdp": float(values.get("gdp", 0.0)),
+                                   "inflation": float(values.get("inflation", 0.0)),
+                                   "fetched_at": time.time()}
+                self._finish_wanted(region, failed=False)
+                refreshed += 1
+            self._indicators = updated
+            if refreshed and self.snapshot_path is not None:
+                self._write_snapshot()
+            return refreshed
+
+    def start_refresh(self, interval_seconds: float = 60.0) -> None:
+        """Starts a daemon thread that refreshes stale and newly seen regions until close()."""
+        if self._refresh_thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"Macro indicator refresh failed: {e}")
+                self._stop.wait(interval_seconds)
+
+        self._refresh_thread = threading.Thread(target=run, name="macro-indicator-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def close(self) -> None:
+        """Stops the refresh thread."""
+        self._stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Numba is optional: without it the same rules run in the vectorised NumPy engine, which
+# loops over months in Python and over paths in NumPy.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+KERNEL_ENGINES = ("auto", "numba", "numpy")
+
+# Paths stepped through the months together; a block's state stays in cache across months.
+KERNEL_BLOCK_PATHS = 256
+
+@dataclass(frozen=True)
+class PathStrategy:
+    """
+    Path-dependent investment rules applied month by month to every simulated path.
+
+    The portfolio holds a risky sleeve, which earns the simulated returns, and a safe sleeve
+    earning safe_annual_return. The risky weight starts at equity_weight and can be lowered by:
+
+    - a glide path on the running balance: the weight falls linearly from equity_weight to
+      glide_final_weight as the balance grows to glide_target_value;
+    - drawdown de-risking: once a path is more than drawdown_trigger below its running peak
+      its risky weight is capped at derisked_weight, until it is back within half the
+      trigger of the peak.
+
+    monthly_withdrawal is taken every month while the balance is positive. With a
+    guardrail_band, at the start of every year the withdrawal is cut by guardrail_adjustment
+    if the withdrawal rate has risen above (1 + band) times the initial rate, and raised by
+    the same fraction if it has fallen below (1 - band) times it.
+    """
+
+    equity_weight: float = 1.0
+    safe_annual_return: float = 2.0
+    glide_target_value: Optional[float] = None
+    glide_final_weight: float = 0.3
+    drawdown_trigger: Optional[float] = None
+    derisked_weight: float = 0.3
+    monthly_withdrawal: float = 0.0
+    guardrail_band: Optional[float] = None
+    guardrail_adjustment: float = 0.1
+
+    def validate(self) -> None:
+        for name in ("equity_weight", "glide_final_weight", "derisked_weight"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"Strategy {name} must be between 0 and 1.")
+        if self.glide_target_value is not None and self.glide_target_value <= 0:
+            raise ValueError("Glide path target value must be positive.")
+        if self.drawdown_trigger is not None and not 0 < self.drawdown_trigger < 1:
+            raise ValueError("Drawdown trigger must be between 0 and 1.")
+        if self.monthly_withdrawal < 0:
+            raise ValueError("Monthly withdrawal cannot be negative.")
+        if self.guardrail_band is not None and not 0 < self.guardrail_band < 1:
+            raise ValueError("Guardrail band must be between 0 and 1.")
+        if not 0 <= self.guardrail_adjustment < 1:
+            raise ValueError("Guardrail adjustment must be between 0 and 1.")
+
+    def kernel_parameters(self, initial_investment: float) -> np.ndarray:
+        """Flat float64 vector read by the kernels; disabled rules are encoded as 0."""
+        initial_rate = 12 * self.monthly_withdrawal / initial_investment if initial_investment > 0 else 0.0
+        return np.array([
+            self.equity_weight,
+            1.0 + self.safe_annual_return / 100 / 12,
+            self.glide_target_value or 0.0,
+            self.glide_final_weight,
+            self.drawdown_trigger or 0.0,
+            self.derisked_weight,
+            self.monthly_withdrawal,
+            initial_rate * (1 + self.guardrail_band) if self.guardrail_band else 0.0,
+            initial_rate * (1 - self.guardrail_band) if self.guardrail_band else 0.0,
+            self.guardrail_adjustment if self.guardrail_band and initial_rate > 0 else 0.0,
+        ])
+
+def _strategy_growth_kernel(risky_growth, initial_investment, monthly_contribution, params, growth_factors):
+    """
+    Reference implementation of the strategy rules, one path at a time; compiled by Numba.
+
+    Writes each month's net growth factor (value after withdrawals over the value a month
+    earlier), so that value = previous * factor + contribution, as in _simulate_paths.
+    """
+    equity_weight, safe_growth, glide_target, glide_final_weight = params[0], params[1], params[2], params[3]
+    trigger, derisked_weight, initial_withdrawal = params[4], params[5], params[6]
+    rate_ceiling, rate_floor, adjustment = params[7], params[8], params[9]
+    num_months, num_paths = risky_growth.shape
+    num_blocks = (num_paths + KERNEL_BLOCK_PATHS - 1) // KERNEL_BLOCK_PATHS
+    for block in range(num_blocks):
+        start = block * KERNEL_BLOCK_PATHS
+        stop = min(start + KERNEL_BLOCK_PATHS, num_paths)
+        size = stop - start
+        value = np.full(size, initial_investment)
+        peak = np.full(size, initial_investment)
+        withdrawal = np.full(size, initial_withdrawal)
+        derisked = np.zeros(size, dtype=np.bool_)
+        for month in range(num_months):
+            for i in range(size):
+                previous = value[i]
+                weight = equity_weight
+                if glide_target > 0:
+                    weight = equity_weight - (equity_weight - glide_final_weight) * min(1.0, max(previous, 0.0) / glide_target)
+                if derisked[i]:
+                    weight = min(weight, derisked_weight)
+                growth = weight * risky_growth[month, start + i] + (1.0 - weight) * safe_growth
+                current = previous * growth
+                if initial_withdrawal > 0 and previous > 0:
+                    if adjustment > 0 and month > 0 and month % 12 == 0:
+                        rate = 12 * withdrawal[i] / previous
+                        if rate > rate_ceiling:
+                            withdrawal[i] *= 1.0 - adjustment
+                        elif rate < rate_floor:
+                            withdrawal[i] *= 1.0 + adjustment
+                    current -= min(withdrawal[i], current)
+                growth_factors[month, start + i] = current / previous if previous > 0 else growth
+                current += monthly_contribution
+                value[i] = current
+                if current > peak[i]:
+                    peak[i] = current
+                if trigger > 0:
+                    if not derisked[i] and current < peak[i] * (1.0 - trigger):
+                        derisked[i] = True
+                    elif derisked[i] and current >= peak[i] * (1.0 - trigger / 2):
+                        derisked[i] = False
+
+if HAS_NUMBA:
+    # Deliberately single-threaded: paths are parallelised by the simulator's worker processes,
+    # which are forked, and Numba's parallel thread pool (TBB) does not survive a fork.
+    _numba_kernel = njit(cache=True)(_strategy_growth_kernel)
+
+def _numpy_strategy_growth(risky_growth: np.ndarray, initial_investment: float, monthly_contribution: float,
+                           params: np.ndarray, growth_factors: np.ndarray) -> None:
+    """The rules of _strategy_growth_kernel vectorised over paths, looping over months only."""
+    equity_weight, safe_growth, glide_target, glide_final_weight, trigger, derisked_weight, \
+        initial_withdrawal, rate_ceiling, rate_floor, adjustment = params
+    num_months, num_paths = risky_growth.shape
+    value = np.full(num_paths, float(initial_investment))
+    peak = value.copy()
+    withdrawal = np.full(num_paths, initial_withdrawal)
+    derisked = np.zeros(num_paths, dtype=bool)
+    weight = np.full(num_paths, equity_weight)
+    growth = np.empty(num_paths)
+    current = np.empty(num_paths)
+    invested = np.empty(num_paths, dtype=bool)
+    for month in range(num_months):
+        np.greater(value, 0, out=invested)
+        if glide_target > 0:
+            np.minimum(1.0, np.maximum(value, 0.0) / glide_target, out=weight)
+            weight *= equity_weight - glide_final_weight
+            np.subtract(equity_weight, weight, out=weight)
+        else:
+            weight.fill(equity_weight)
+        if trigger > 0:
+            np.copyto(weight, np.minimum(weight, derisked_weight), where=derisked)
+        np.multiply(weight, risky_growth[month], out=growth)
+        growth += (1.0 - weight) * safe_growth
+        np.multiply(value, growth, out=current)
+        if initial_withdrawal > 0:
+            if adjustment > 0 and month > 0 and month % 12 == 0:
+                rate = np.divide(12 * withdrawal, value, out=np.zeros(num_paths), where=invested)
+                withdrawal = np.where(invested & (rate > rate_ceiling), withdrawal * (1.0 - adjustment),
+                                      np.where(invested & (rate < rate_floor), withdrawal * (1.0 + adjustment), withdrawal))
+            current -= np.where(invested, np.minimum(withdrawal, current), 0.0)
+        np.copyto(growth_factors[month], growth)
+        np.divide(current, value, out=growth_factors[month], where=invested)
+        current += monthly_contribution
+        value, current = current, value
+        np.maximum(peak, value, out=peak)
+        if trigger > 0:
+            derisked = np.where(derisked, value < peak * (1.0 - trigger / 2), value < peak * (1.0 - trigger))
+
+def resolve_engine(engine: str) -> str:
+    """Maps "auto" to "numba" when it is installed and "numpy" otherwise."""
+    if engine not in KERNEL_ENGINES:
+        raise ValueError(f"Engine must be one of: {', '.join(KERNEL_ENGINES)}.")
+    if engine == "numba" and not HAS_NUMBA:
+        raise ValueError("The numba engine needs Numba installed.")
+    if engine == "auto":
+        return "numba" if HAS_NUMBA else "numpy"
+    return engine
+
+def strategy_growth_factors(risky_growth: np.ndarray, initial_investment: float, monthly_contribution: float,
+                            strategy: PathStrategy, engine: str = "auto") -> np.ndarray:
+    """
+    Net monthly growth factors of every path under the strategy.
+
+    Args:
+        risky_growth (np.ndarray): (num_months, num_paths) gross growth of the risky sleeve.
+        engine (str): "numba", "numpy", or "auto" (Numba when installed).
+
+    Returns:
+        np.ndarray: (num_months, num_paths) factors with value = previous * factor + contribution.
+    """
+    params = strategy.kernel_parameters(initial_investment)
+    growth_factors = np.empty_like(risky_growth, dtype=np.float64)
+    if resolve_engine(engine) == "numba":
+        _numba_kernel(np.ascontiguousarray(risky_growth, dtype=np.float64), float(initial_investment),
+               float(monthly_contribution), params, growth_factors)
+    else:
+        _numpy_strategy_growth(risky_growth, initial_investment, monthly_contribution, params, growth_factors)
+    return growth_factors
@@ -1,12 +1,641 @@
+import os
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
 import numpy as np
 
+from .distribution_sketch import LogHistogram
+from .path_kernels import PathStrategy
+from .return_models import (BlockBootstrapReturns, CorrelatedNormalReturns, PathStrategyReturns,
+                            RebalancedPortfolioReturns, create_return_model, draw_standard_normals)
+from .shock_pool import PooledGenerator, SharedShockPool, attach_shock_pool
+
+# Upper bound on the memory used by one chunk's block of monthly returns.
+# Paths are simulated chunk by chunk so large requests never hold a full
+# (num_simulations x num_months) matrix at once.
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+# Cap on paths per chunk, so even requests that fit the memory budget are split
+# into enough chunks to spread across worker processes. Chunking never depends
+# on the worker count, which keeps seeded results identical however many run.
+MAX_CHUNK_PATHS = 2048
+
+# Percentiles of the final value included in every result.
+REPORTED_PERCENTILES = (10, 50, 90)
+
+# Percentile bands reported for every month when a fan chart is requested.
+FAN_CHART_PERCENTILES = (10, 50, 90)
+
+# How the distribution of final values is returned: a mergeable log-scale histogram of a few
+# KB (default), that histogram plus the raw value of every path as a numpy array, or nothing.
+DISTRIBUTION_FORMATS = ("histogram", "raw", "none")
+
+# Confidence levels for value at risk and CVaR (matches RiskCalculationConfig.CONFIDENCE_INTERVALS),
+# and the percentiles of the per-path maximum drawdown reported with them.
+TAIL_CONFIDENCE_LEVELS = (0.95, 0.99)
+DRAWDOWN_PERCENTILES = (50, 90, 95, 99)
+
+# Number of Cholesky factors kept per simulator, keyed by (universe, window).
+CHOLESKY_CACHE_SIZE = 64
+
+# Adaptive runs use small, equal chunks so the spread of per-chunk percentiles
+# (batch means) gives a standard error after only a few thousand paths.
+ADAPTIVE_CHUNK_PATHS = 512
+MIN_ADAPTIVE_CHUNKS = 4
+
+# Gauss-Hermite nodes/weights (probabilists' form) used to take exact moments of
+# log(1 + r) for normal monthly returns r in the analytic approximation.
+_HERMITE_NODES, _HERMITE_WEIGHTS = np.polynomial.hermite_e.hermegauss(40)
+_HERMITE_WEIGHTS = _HERMITE_WEIGHTS / _HERMITE_WEIGHTS.sum()
+
+# Largest relative percentile error of the analytic approximation against 16k-path
+# Sobol Monte Carlo, measured over annual returns -2..14%, three contribution mixes
+# and the listed volatility/horizon limits: (max annual volatility %, max years, bound).
+ANALYTIC_ERROR_BOUNDS = (
+    (20, 40, 0.015),
+    (30, 30, 0.03),
+    (30, 40, 0.05),
+    (40, 40, 0.17),
+)
+
+# Quantities a goal-seek can solve for, and the bounds searched for each.
+GOAL_SEEK_TARGETS = ("monthly_contribution", "simulation_years", "portfolio_annual_return")
+GOAL_SEEK_MAX_YEARS = 50
+GOAL_SEEK_RETURN_BOUNDS = (-50.0, 100.0)
+# Bisection stops once the annual return bracket is narrower than this (percentage points).
+GOAL_SEEK_RETURN_TOLERANCE = 1e-4
+# Frozen shock matrices kept per simulator, keyed by (months, paths, seed, sampling).
+GOAL_SEEK_SHOCK_CACHE_SIZE = 4
+
+# (name, num_blocks, block_values) of a SharedShockPool; picklable, unlike the pool itself.
+ShockPoolKey = Tuple[str, int, int]
+
+def _chunk_generator(seed_sequence: np.random.SeedSequence, shock_pool: Optional[SharedShockPool]) -> Any:
+    """A chunk's generator; with a shock pool its standard normals are taken from the pool."""
+    rng = np.random.default_rng(seed_sequence)
+    return PooledGenerator(shock_pool, rng) if shock_pool is not None else rng
+
+def _simulate_chunk_group(returns_model: Any,
+                          initial_investment: float,
+                          monthly_contribution: float,
+                          num_months: int,
+                          chunk_tasks: List[Tuple[np.random.SeedSequence, int]],
+                          fan_chart: bool,
+                          tail_metrics: bool = False,
+                          shock_pool_key: Optional[ShockPoolKey] = None,
+                          final_histogram: bool = False) -> Tuple[np.ndarray, Optional[LogHistogram], Optional[np.ndarray], Optional[LogHistogram]]:
+    """
+    Simulates a contiguous group of chunks; runs in-process or in a worker process.
+
+    Each chunk draws from its own generator seeded with its SeedSequence child, so a
+    chunk's paths do not depend on which process simulates it. With a shock_pool_key the
+    chunk's standard normals come from that shared pool instead (unseeded runs only).
+
+    Returns:
+        Tuple[np.ndarray, Optional[LogHistogram], Optional[np.ndarray], Optional[LogHistogram]]:
+        Final values of the group's paths in chunk order, the group's per-month histogram if a
+        fan chart was requested, each path's maximum drawdown if tail metrics were requested,
+        and a histogram of the final values if final_histogram is set.
+    """
+    final_values = []
+    max_drawdowns = []
+    monthly_histogram = LogHistogram(num_series=num_months) if fan_chart else None
+    shock_pool = attach_shock_pool(*shock_pool_key, create=False) if shock_pool_key is not None else None
+    for seed_sequence, chunk_paths in chunk_tasks:
+        rng = _chunk_generator(seed_sequence, shock_pool)
+        growth_factors = returns_model.draw_growth_factors(rng, num_months, chunk_paths)
+        chunk_drawdowns = np.empty(chunk_paths) if tail_metrics else None
+        final_values.append(PortfolioSimulator._simulate_paths(
+            initial_investment, monthly_contribution, growth_factors, record_paths=fan_chart,
+            max_drawdowns=chunk_drawdowns
+        ))
+        if monthly_histogram is not None:
+            monthly_histogram.add(growth_factors)
+        if tail_metrics:
+            max_drawdowns.append(chunk_drawdowns)
+    final_values = np.concatenate(final_values)
+    final_value_histogram = None
+    if final_histogram:
+        final_value_histogram = LogHistogram()
+        final_value_histogram.add(final_values)
+    return (final_values, monthly_histogram, np.concatenate(max_drawdowns) if tail_metrics else None,
+            final_value_histogram)
+
+def _simulate_batch_chunk_group(scenarios: List[Tuple[float, float, int, float, float]],
+                                chunk_tasks: List[Tuple[np.random.SeedSequence, int]],
+                                sampling: str,
+                                fan_chart: bool,
+                                shock_pool_key: Optional[ShockPoolKey] = None) -> Tuple[List[np.ndarray], List[Optional[LogHistogram]]]:
+    """
+    Simulates a contiguous group of chunks for every scenario of a batch with common random numbers.
+
+    Each chunk draws a single block of standard normal shocks covering the longest horizon;
+    every scenario rescales (a prefix of) that same block into its own growth factors, so the
+    differences between scenarios come from their inputs rather than from sampling noise.
+
+    Args:
+        scenarios (List[Tuple[float, float, int, float, float]]): (initial_investment,
+            monthly_contribution, num_months, monthly_mean, monthly_std_dev) per scenario.
+
+    Returns:
+        Tuple[List[np.ndarray], List[Optional[LogHistogram]]]: Per scenario, the final values
+        of the group's paths in chunk order and its per-month histogram (None without a fan chart).
+    """
+    max_months = max(scenario[2] for scenario in scenarios)
+    final_values: List[List[np.ndarray]] = [[] for _ in scenarios]
+    histograms = [LogHistogram(num_series=scenario[2]) if fan_chart else None for scenario in scenarios]
+    shock_pool = attach_shock_pool(*shock_pool_key, create=False) if shock_pool_key is not None else None
+    for seed_sequence, chunk_paths in chunk_tasks:
+        rng = _chunk_generator(seed_sequence, shock_pool)
+        shocks = draw_standard_normals(rng, (max_months, chunk_paths), sampling)
+        # One reusable growth-factor block; every scenario overwrites its prefix.
+        growth_buffer = np.empty_like(shocks)
+        for index, (initial, contribution, num_months, monthly_mean, monthly_std_dev) in enumerate(scenarios):
+            growth_factors = growth_buffer[:num_months]
+            np.multiply(shocks[:num_months], monthly_std_dev, out=growth_factors)
+            growth_factors += 1.0 + monthly_mean
+            final_values[index].append(PortfolioSimulator._simulate_paths(
+                initial, contribution, growth_factors, record_paths=fan_chart
+            ))
+            if histograms[index] is not None:
+                histograms[index].add(growth_factors)
+    return [np.concatenate(values) for values in final_values], histograms
+
 class PortfolioSimulator:
     """
     A class to perform Monte Carlo simulations for investment portfolios.
+
+    Simulations are vectorized: each chunk of paths draws its whole block of
+    monthly returns in a single RNG call and the contribution recursion is
+    applied to every path in the chunk at once, so the only Python-level loop
+    runs over months rather than over paths x months. Chunks can optionally be
+    spread over a pool of worker processes.
     """
 
-    def __init__(self):
-        pass # No specific initialization needed for fixed parameters yet
+    def __init__(self,
+                 memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+                 max_workers: Optional[int] = None,
+                 confidence_levels: Sequence[float] = TAIL_CONFIDENCE_LEVELS,
+                 shock_pool: Optional[SharedShockPool] = None):
+        """
+        Args:
+            memory_budget_mb (float): Maximum size, in megabytes, of the block of
+                simulated monthly returns held in memory for one chunk of paths.
+                Each worker process holds one chunk at a time.
+            max_workers (Optional[int]): Size of the process pool used for parallel
+                runs. Defaults to the number of CPUs.
+            confidence_levels (Sequence[float]): Levels at which value at risk and CVaR are
+                reported when tail metrics are requested.
+            shock_pool (Optional[SharedShockPool]): Pre-generated standard normals used by
+                unseeded runs instead of drawing their own; worker processes attach to it by name.
+        """
+        if memory_budget_mb <= 0:
+            raise ValueError("Memory budget must be positive.")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("Maximum number of workers must be positive.")
+        if not confidence_levels or not all(0 < level < 1 for level in confidence_levels):
+            raise ValueError("Confidence levels must be between 0 and 1.")
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.confidence_levels = tuple(sorted(confidence_levels))
+        self.shock_pool = shock_pool
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cholesky_cache: "OrderedDict[Tuple[Tuple[str, ...], Hashable], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._shock_cache: "OrderedDict[Tuple[int, int, int, str], np.ndarray]" = OrderedDict()
+        # Guards the pool and caches when requests run on several threads at once.
+        self._lock = threading.RLock()
+
+    def close(self) -> None:
+        """Shuts down the worker pool, if one was started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Starts the worker pool on first use so serial-only callers never pay for it."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _shock_pool_key(self, seed: Optional[int], sampling: str) -> Optional[ShockPoolKey]:
+        """
+        Pooled shocks are only used without a seed, so seeded runs stay reproducible, and not
+        for Sobol sampling, whose points are constructed rather than drawn.
+        """
+        if self.shock_pool is None or seed is not None or sampling == "sobol":
+            return None
+        return (self.shock_pool.name, self.shock_pool.num_blocks, self.shock_pool.block_values)
+
+    def _chunk_size(self, num_months: int, values_per_path_month: int = 1) -> int:
+        """Number of paths whose (num_months x paths x values) float64 block fits the memory budget."""
+        bytes_per_path = num_months * values_per_path_month * np.dtype(np.float64).itemsize
+        return max(1, min(MAX_CHUNK_PATHS, self.memory_budget_bytes // bytes_per_path))
+
+    def _chunk_sizes(self, num_simulations: int, num_months: int, values_per_path_month: int = 1) -> List[int]:
+        """Number of paths in each chunk, covering num_simulations in total."""
+        chunk_size = self._chunk_size(num_months, values_per_path_month)
+        return [min(chunk_size, num_simulations - start) for start in range(0, num_simulations, chunk_size)]
+
+    @staticmethod
+    def _validate_common_inputs(initial_investment: float,
+                                monthly_contribution: float,
+                                num_simulations: int,
+                                simulation_years: int) -> None:
+        """Checks the arguments shared by every simulation mode."""
+        if not all(isinstance(arg, (int, float)) for arg in [initial_investment, monthly_contribution]):
+            raise ValueError("Initial investment and monthly contribution must be numeric.")
+        if not all(isinstance(arg, int) for arg in [num_simulations, simulation_years]):
+            raise ValueError("Number of simulations and simulation years must be integers.")
+        if initial_investment < 0 or monthly_contribution < 0:
+            raise ValueError("Initial investment and monthly contribution cannot be negative.")
+        if num_simulations <= 0 or simulation_years <= 0:
+            raise ValueError("Number of simulations and simulation years must be positive.")
+
+    @staticmethod
+    def _simulate_paths(initial_investment: float,
+                        monthly_contribution: float,
+                        growth_factors: np.ndarray,
+                        record_paths: bool = False,
+                        max_drawdowns: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Applies the monthly growth-then-contribute recursion to a block of paths.
+
+        Args:
+            initial_investment (float): Starting value of every path.
+            monthly_contribution (float): Amount added after each month's return.
+            growth_factors (np.ndarray): Time-major (num_months, num_paths) array of 1 + monthly return.
+            record_paths (bool): If True, each row of growth_factors is overwritten with the
+                portfolio values at the end of that month, reusing the block instead of
+                allocating a second one.
+            max_drawdowns (Optional[np.ndarray]): If given, filled with each path's largest
+                fall from its running peak value, as a fraction of that peak. Only a running
+                peak and the lowest value/peak ratio are kept, never the path itself.
+
+        Returns:
+            np.ndarray: Final value of each path.
+        """
+        num_paths = growth_factors.shape[1]
+        portfolio_values = np.full(num_paths, float(initial_investment))
+        if max_drawdowns is not None:
+            peak_values = portfolio_values.copy()
+            lowest_ratio = np.ones(num_paths)
+            ratio = np.empty(num_paths)
+        for month_growth in growth_factors:
+            # Rows are contiguous, so each step is a single pass over the chunk.
+            portfolio_values *= month_growth
+            portfolio_values += monthly_contribution
+            if max_drawdowns is not None:
+                np.maximum(peak_values, portfolio_values, out=peak_values)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    np.divide(portfolio_values, peak_values, out=ratio)
+                # fmin skips the 0/0 of a path that has not had any value yet.
+                np.fmin(lowest_ratio, ratio, out=lowest_ratio)
+            if record_paths:
+                month_growth[:] = portfolio_values
+        if max_drawdowns is not None:
+            np.subtract(1.0, lowest_ratio, out=max_drawdowns)
+        return portfolio_values
+
+    @staticmethod
+    def _validate_run_options(workers: int, tolerance: Optional[float], distribution: str = "histogram") -> None:
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("Number of workers must be a positive integer.")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("Tolerance must be positive.")
+        if distribution not in DISTRIBUTION_FORMATS:
+            raise ValueError(f"Distribution format must be one of {', '.join(DISTRIBUTION_FORMATS)}.")
+
+    def _run_chunks(self,
+                    initial_investment: float,
+                    monthly_contribution: float,
+                    num_simulations: int,
+                    num_months: int,
+                    returns_model: Any,
+                    seed: Optional[int] = None,
+                    fan_chart: bool = False,
+                    workers: int = 1,
+                    tolerance: Optional[float] = None,
+                    tail_metrics: bool = False,
+                    distribution: str = "histogram") -> dict:
+        """
+        Simulates num_simulations paths chunk by chunk and summarizes them.
+
+        Every chunk gets its own child of SeedSequence(seed), and chunk sizes depend only
+        on the request and the memory budget. Workers receive contiguous groups of chunks
+        and their outputs are concatenated in chunk order, so a seeded run gives the same
+        bits for any number of workers and the merged statistics are exact.
+
+        Args:
+            returns_model (Any): Picklable model from return_models providing
+                draw_growth_factors(rng, num_months, num_paths) and values_per_path_month.
+            seed (Optional[int]): Root seed; None draws fresh entropy.
+            fan_chart (bool): Whether to accumulate per-month percentile bands.
+            workers (int): Number of worker processes to spread chunks over; 1 runs in-process.
+            tolerance (Optional[float]): If set, stop early once the relative standard error of
+                every reported percentile is at or below this value (see _iter_progress).
+            tail_metrics (bool): Whether to track each path's maximum drawdown and report
+                value at risk, CVaR and the drawdown distribution (see _tail_risk).
+            distribution (str): One of DISTRIBUTION_FORMATS. Histograms of the final values are
+                built per group of chunks (in the worker processes) and merged here.
+
+        Returns:
+            dict: Statistics in the format returned by run_monte_carlo_simulation.
+        """
+        self._validate_run_options(workers, tolerance, distribution)
+        if tolerance is not None:
+            *_, results = self._iter_progress(initial_investment, monthly_contribution, num_simulations, num_months,
+                                              returns_model, seed, fan_chart, workers, tolerance,
+                                              report_progress=False, tail_metrics=tail_metrics,
+                                              distribution=distribution)
+            return results
+
+        chunk_sizes = self._chunk_sizes(num_simulations, num_months, returns_model.values_per_path_month)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        chunk_tasks = list(zip(seed_sequences, chunk_sizes))
+        shock_pool_key = self._shock_pool_key(seed, getattr(returns_model, "sampling", "standard"))
+        final_histogram = distribution != "none"
+
+        num_groups = min(workers, self.max_workers, len(chunk_tasks))
+        if num_groups == 1:
+            group_results = [_simulate_chunk_group(returns_model, initial_investment, monthly_contribution,
+                                                   num_months, chunk_tasks, fan_chart, tail_metrics, shock_pool_key,
+                                                   final_histogram)]
+        else:
+            bounds = np.linspace(0, len(chunk_tasks), num_groups + 1).astype(int)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_simulate_chunk_group, returns_model, initial_investment, monthly_contribution,
+                                num_months, chunk_tasks[start:end], fan_chart, tail_metrics, shock_pool_key,
+                                final_histogram)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            group_results = [future.result() for future in futures]
+
+        final_portfolio_values = np.concatenate([values for values, _, _, _ in group_results])
+        monthly_histogram = None
+        if fan_chart:
+            monthly_histogram = group_results[0][1]
+            for _, histogram, _, _ in group_results[1:]:
+                monthly_histogram.merge(histogram)
+        final_value_histogram = None
+        if final_histogram:
+            final_value_histogram = group_results[0][3]
+            for *_, histogram in group_results[1:]:
+                final_value_histogram.merge(histogram)
+
+        results = self._summarize(final_portfolio_values, monthly_histogram, distribution, final_value_histogram)
+        if tail_metrics:
+            max_drawdowns = np.concatenate([drawdowns for _, _, drawdowns, _ in group_results])
+            results["tail_risk"] = self._tail_risk(final_portfolio_values, max_drawdowns,
+                                                   initial_investment + monthly_contribution * num_months)
+        return results
+
+    def _iter_chunk_results(self,
+                            initial_investment: float,
+                            monthly_contribution: float,
+                            num_months: int,
+                            returns_model: Any,
+                            chunk_tasks: List[Tuple[np.random.SeedSequence, int]],
+                            fan_chart: bool,
+                            workers: int,
+                            tail_metrics: bool = False,
+                            shock_pool_key: Optional[ShockPoolKey] = None,
+                            final_histogram: bool = False) -> Iterator[Tuple[np.ndarray, Optional[LogHistogram], Optional[np.ndarray], Optional[LogHistogram]]]:
+        """
+        Yields (final_values, monthly_histogram, max_drawdowns, final_value_histogram) for
+        every chunk, in chunk order.
+
+        With several workers a round of chunks is simulated in parallel and then yielded
+        one at a time, so callers can stop between chunks; closing the generator cancels
+        any chunks of the current round that have not started yet.
+        """
+        round_size = min(workers, self.max_workers)
+        for start in range(0, len(chunk_tasks), round_size):
+            round_tasks = chunk_tasks[start:start + round_size]
+            if len(round_tasks) == 1:
+                yield _simulate_chunk_group(returns_model, initial_investment, monthly_contribution,
+                                            num_months, round_tasks, fan_chart, tail_metrics, shock_pool_key,
+                                            final_histogram)
+                continue
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_simulate_chunk_group, returns_model, initial_investment, monthly_contribution,
+                                num_months, [task], fan_chart, tail_metrics, shock_pool_key, final_histogram)
+                for task in round_tasks
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _iter_progress(self,
+                       initial_investment: float,
+                       monthly_contribution: float,
+                       num_simulations: int,
+                       num_months: int,
+                       returns_model: Any,
+                       seed: Optional[int],
+                       fan_chart: bool,
+                       workers: int,
+                       tolerance: Optional[float],
+                       report_progress: bool = True,
+                       tail_metrics: bool = False,
+                       distribution: str = "histogram") -> Iterator[dict]:
+        """
+        Simulates chunk by chunk, yielding an interim estimate after every chunk but the
+        last and then the full result.
+
+        Without a tolerance the chunk plan and seeds are those of _run_chunks, so the final
+        result is identical to the non-streaming one. Interim estimates carry the exact
+        running mean and standard deviation and percentiles read from a log-scale histogram
+        of the final values, which costs O(bins) per update however many paths have run.
+
+        With a tolerance (adaptive mode) equal chunks are drawn until the reported percentiles
+        have converged or num_simulations is hit. The standard error of each percentile is
+        estimated by batch means: the standard deviation of that percentile across chunks
+        divided by sqrt(number of chunks). The stopping rule is checked chunk by chunk in
+        order, so a seed gives the same answer (and path count) for any worker count.
+
+        Yields:
+            dict: Interim estimates ('status': 'running', 'paths_completed', 'mean_final_value',
+            'std_dev_final_value', 'percentiles' and, in adaptive mode, 'standard_errors'),
+            then the statistics as in run_monte_carlo_simulation. In adaptive mode the final
+            result adds 'paths_used', 'converged' and 'standard_errors'.
+        """
+        if tolerance is None:
+            chunk_sizes = self._chunk_sizes(num_simulations, num_months, returns_model.values_per_path_month)
+            chunk_paths = None
+        else:
+            chunk_paths = min(ADAPTIVE_CHUNK_PATHS, self._chunk_size(num_months, returns_model.values_per_path_month))
+            chunk_sizes = [min(chunk_paths, num_simulations - start) for start in range(0, num_simulations, chunk_paths)]
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        chunk_tasks = list(zip(seed_sequences, chunk_sizes))
+
+        chunk_values: List[np.ndarray] = []
+        chunk_drawdowns: List[np.ndarray] = []
+        chunk_percentiles: List[np.ndarray] = []
+        monthly_histogram = LogHistogram(num_series=num_months) if fan_chart else None
+        # Serves the interim percentiles as well as the returned distribution.
+        final_histogram = report_progress or distribution != "none"
+        final_value_histogram = LogHistogram() if final_histogram else None
+        paths_completed, running_mean, running_m2 = 0, 0.0, 0.0
+        converged = False
+        standard_errors = np.full(len(REPORTED_PERCENTILES), np.nan)
+
+        chunk_results = self._iter_chunk_results(initial_investment, monthly_contribution, num_months,
+                                                 returns_model, chunk_tasks, fan_chart, workers, tail_metrics,
+                                                 self._shock_pool_key(seed, getattr(returns_model, "sampling", "standard")),
+                                                 final_histogram)
+        try:
+            for index, (values, histogram, drawdowns, values_histogram) in enumerate(chunk_results):
+                chunk_values.append(values)
+                if tail_metrics:
+                    chunk_drawdowns.append(drawdowns)
+                if monthly_histogram is not None:
+                    monthly_histogram.merge(histogram)
+                if final_value_histogram is not None:
+                    final_value_histogram.merge(values_histogram)
+
+                # The final chunk may be short; batch means only use full-size chunks.
+                if tolerance is not None:
+                    if len(values) == chunk_paths:
+                        chunk_percentiles.append(np.percentile(values, REPORTED_PERCENTILES))
+                    if len(chunk_percentiles) >= MIN_ADAPTIVE_CHUNKS:
+                        batches = np.array(chunk_percentiles)
+                        standard_errors = batches.std(axis=0, ddof=1) / np.sqrt(len(batches))
+                        estimates = np.percentile(np.concatenate(chunk_values), REPORTED_PERCENTILES)
+                        converged = bool(np.all(standard_errors <= tolerance * np.abs(estimates)))
+                        if converged:
+                            break
+
+                if not report_progress or index == len(chunk_tasks) - 1:
+                    continue
+
+                # Merge this chunk's mean and sum of squared deviations into the running totals.
+                chunk_mean = float(values.mean())
+                chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+                total = paths_completed + len(values)
+                delta = chunk_mean - running_mean
+                running_mean += delta * len(values) / total
+                running_m2 += chunk_m2 + delta ** 2 * paths_completed * len(values) / total
+                paths_completed = total
+
+                estimates = final_value_histogram.quantiles(np.array(REPORTED_PERCENTILES) / 100)[:, 0]
+                progress = {
+                    "status": "running",
+                    "paths_completed": paths_completed,
+                    "num_simulations": num_simulations,
+                    "mean_final_value": running_mean,
+                    "std_dev_final_value": float(np.sqrt(running_m2 / paths_completed)),
+                    "percentiles": {
+                        f"{percentile}th": float(value) for percentile, value in zip(REPORTED_PERCENTILES, estimates)
+                    },
+                }
+                if tolerance is not None:
+                    progress["standard_errors"] = {
+                        f"{percentile}th": float(error) for percentile, error in zip(REPORTED_PERCENTILES, standard_errors)
+                    }
+                yield progress
+        finally:
+            chunk_results.close()
+
+        final_portfolio_values = np.concatenate(chunk_values)
+        results = self._summarize(final_portfolio_values, monthly_histogram, distribution, final_value_histogram)
+        if tail_metrics:
+            results["tail_risk"] = self._tail_risk(final_portfolio_values, np.concatenate(chunk_drawdowns),
+                                                   initial_investment + monthly_contribution * num_months)
+        if tolerance is not None:
+            results["paths_used"] = len(final_portfolio_values)
+            results["converged"] = converged
+            results["standard_errors"] = {
+                f"{percentile}th": float(error) for percentile, error in zip(REPORTED_PERCENTILES, standard_errors)
+            }
+        yield results
+
+    def _tail_risk(self, final_portfolio_values: np.ndarray, max_drawdowns: np.ndarray, total_invested: float) -> dict:
+        """
+        Value at risk and CVaR of the final value, plus the distribution of maximum drawdowns.
+
+        Losses are measured against the total amount invested (initial investment plus all
+        contributions), so a negative VaR means even the bad tail ends up ahead. The worst
+        (1 - level) share of paths for every confidence level is isolated with a single
+        np.partition call rather than a full sort.
+        """
+        num_paths = len(final_portfolio_values)
+        # Rounded first so e.g. (1 - 0.95) * 3000 is a tail of 150 paths, not 151.
+        tail_sizes = [max(1, int(np.ceil(round((1 - level) * num_paths, 9)))) for level in self.confidence_levels]
+        partitioned = np.partition(final_portfolio_values, sorted({size - 1 for size in tail_sizes}))
+
+        value_at_risk, conditional_value_at_risk = {}, {}
+        for level, tail_size in zip(self.confidence_levels, tail_sizes):
+            label = f"{level * 100:g}"
+            value_at_risk[label] = float(total_invested - partitioned[tail_size - 1])
+            # After partitioning, the first tail_size entries are the tail_size worst outcomes.
+            conditional_value_at_risk[label] = float(total_invested - partitioned[:tail_size].mean())
+
+        drawdown_percentiles = np.percentile(max_drawdowns, DRAWDOWN_PERCENTILES)
+        return {
+            "total_invested": float(total_invested),
+            "value_at_risk": value_at_risk,
+            "conditional_value_at_risk": conditional_value_at_risk,
+            "max_drawdown": {
+                "mean": float(max_drawdowns.mean()),
+                **{f"{percentile}th": float(value) for percentile, value in zip(DRAWDOWN_PERCENTILES, drawdown_percentiles)},
+            },
+        }
+
+    @staticmethod
+    def _summarize(final_portfolio_values: np.ndarray,
+                   monthly_histogram: Optional[LogHistogram] = None,
+                   distribution: str = "histogram",
+                   final_value_histogram: Optional[LogHistogram] = None) -> dict:
+        """
+        Computes the result statistics from the final value of every path.
+
+        The distribution itself is returned in the requested format; a final_value_histogram
+        merged from the chunks is used as is, otherwise one is built from the values.
+        """
+        # Calculate statistics
+        mean_final_value = np.mean(final_portfolio_values)
+        median_final_value = np.median(final_portfolio_values)
+        std_dev_final_value = np.std(final_portfolio_values)
+
+        # Calculate percentiles (e.g., 10th percentile for "bad" outcome, 90th for "good" outcome)
+        p10, p50, p90 = np.percentile(final_portfolio_values, REPORTED_PERCENTILES)
+
+        results = {
+            "mean_final_value": float(mean_final_value),
+            "median_final_value": float(median_final_value),
+            "std_dev_final_value": float(std_dev_final_value),
+            "percentiles": {
+                "10th": float(p10),
+                "50th": float(p50),
+                "90th": float(p90)
+            }
+        }
+
+        if distribution != "none":
+            if final_value_histogram is None:
+                final_value_histogram = LogHistogram()
+                final_value_histogram.add(final_portfolio_values)
+            results["distribution"] = final_value_histogram.to_dict()
+        if distribution == "raw":
+            results["final_portfolio_values"] = final_portfolio_values
+
+        if monthly_histogram is not None:
+            bands = monthly_histogram.quantiles(np.array(FAN_CHART_PERCENTILES) / 100)
+            results["fan_chart"] = {
+                f"{percentile}th": band.tolist() for percentile, band in zip(FAN_CHART_PERCENTILES, bands)
+            }
+
+        return results
 
     def run_monte_carlo_simulation(self,
                                    initial_investment: float,
@@ -14,7 +643,16 @@ class PortfolioSimulator:
                                    num_simulations: int,
                                    simulation_years: int,
                                    portfolio_annual_return: float, # Expected annual return in percentage (e.g., 7 for 7%)
-                                   portfolio_annual_volatility: float # Annual standard deviation in percentage (e.g., 10 for 10%)
+                                   portfolio_annual_volatility: float, # Annual standard deviation in percentage (e.g., 10 for 10%)
+                                   seed: Optional[int] = None,
+                                   fan_chart: bool = False,
+                                   workers: int = 1,
+                                   sampling: str = "standard",
+                                   tolerance: Optional[float] = None,
+                                   return_model: str = "normal",
+                                   model_options: Optional[Dict[str, float]] = None,
+                                   tail_metrics: bool = False,
+                                   distribution: str = "histogram"
                                    ) -> dict:
         """
         Runs a Monte Carlo simulation for a portfolio.
@@ -26,36 +664,382 @@ class PortfolioSimulator:
             simulation_years (int): The duration of each simulation in years.
             portfolio_annual_return (float): The expected average annual return of the portfolio (e.g., 7 for 7%).
             portfolio_annual_volatility (float): The expected annual standard deviation of returns (e.g., 10 for 10%).
+            seed (Optional[int]): Seed for the random number generator. Leave unset for fresh randomness.
+                A given seed reproduces the same results for any number of workers.
+            fan_chart (bool): If True, also estimate the 10th/50th/90th percentile of the portfolio
+                value at the end of every month. Bands are accumulated chunk by chunk in a
+                mergeable log-scale histogram, so memory grows with the number of months only.
+            workers (int): Number of worker processes to spread chunks of paths over (capped
+                at the simulator's max_workers). 1 runs everything in the calling process.
+            sampling (str): How shocks are drawn: "standard", "antithetic" (mirrored path pairs)
+                or "sobol" (scrambled Sobol quasi-Monte Carlo).
+            tolerance (Optional[float]): Enables adaptive mode: chunks are drawn until the standard
+                error of each reported percentile is at most this fraction of its value (e.g. 0.005
+                for 0.5%), with num_simulations as the upper limit on paths.
+            return_model (str): Distribution of monthly returns: "normal", "student_t" (fat tails),
+                "regime_switching" (calm/stressed Markov regimes) or "garch" (GARCH(1,1) volatility
+                clustering). The annual return and volatility set the mean and the (long-run)
+                volatility; for "regime_switching" they describe the calm regime.
+            model_options (Optional[Dict[str, float]]): Parameters of the chosen model, all optional:
+                degrees_of_freedom (student_t, default 5); stressed_annual_return and
+                stressed_annual_volatility in % (default -15 and 30), to_stressed_probability and
+                to_calm_probability per month (default 0.02 and 0.10) for regime_switching; alpha
+                and beta (default 0.1 and 0.85) for garch.
+            tail_metrics (bool): If True, also report 95%/99% value at risk and CVaR of the final
+                value (as losses against the total amount invested) and the distribution of each
+                path's maximum drawdown, all computed in the same pass that simulates the paths.
+            distribution (str): How the distribution of final values is returned: "histogram"
+                (a compact log-scale histogram, see LogHistogram.to_dict), "raw" (that plus every
+                path's final value) or "none".
 
         Returns:
             dict: A dictionary containing simulation results:
-                  - 'final_portfolio_values': A list of the final value for each simulation.
+                  - 'distribution' (unless distribution is "none"): Histogram of the final values
+                    in LogHistogram.to_dict form; LogHistogram.from_dict restores it for merging
+                    with other runs or reading further quantiles.
+                  - 'final_portfolio_values' (distribution "raw" only): np.ndarray with the final
+                    value of each simulation.
                   - 'mean_final_value': The average of all final portfolio values.
                   - 'median_final_value': The median of all final portfolio values (50th percentile).
                   - 'std_dev_final_value': The standard deviation of final portfolio values.
                   - 'percentiles': A dictionary with 10th, 50th, and 90th percentile values.
+                  - 'fan_chart' (only if requested): A dictionary mapping '10th', '50th' and '90th'
+                    to lists with one value per simulated month.
+                  - 'paths_used', 'converged', 'standard_errors' (adaptive mode only): Paths actually
+                    simulated, whether the tolerance was met, and each percentile's standard error.
+                  - 'tail_risk' (only if requested): 'total_invested', 'value_at_risk' and
+                    'conditional_value_at_risk' keyed by confidence level ('95', '99'), and
+                    'max_drawdown' with its mean and 50th/90th/95th/99th percentiles.
+        """
+
+        returns_model = self._single_asset_returns_model(initial_investment, monthly_contribution, num_simulations,
+                                                         simulation_years, portfolio_annual_return,
+                                                         portfolio_annual_volatility, sampling, return_model,
+                                                         model_options)
+        return self._run_chunks(initial_investment, monthly_contribution, num_simulations, simulation_years * 12,
+                                returns_model, seed=seed, fan_chart=fan_chart, workers=workers,
+                                tolerance=tolerance, tail_metrics=tail_metrics, distribution=distribution)
+
+    def run_batch_simulation(self,
+                             scenarios: Sequence[Dict[str, float]],
+                             num_simulations: int,
+                             seed: Optional[int] = None,
+                             fan_chart: bool = False,
+                             workers: int = 1,
+                             sampling: str = "standard",
+                             distribution: str = "histogram") -> List[dict]:
+        """
+        Runs several single-asset scenarios over common random numbers.
+
+        Every scenario is driven by the same standard normal shocks (truncated to its own
+        horizon), so comparing scenarios, e.g. two contribution levels, shows the effect of
+        the inputs with far less noise than independent runs, and the shocks are drawn and
+        allocated once per chunk instead of once per scenario.
+
+        Args:
+            scenarios (Sequence[Dict[str, float]]): One dict per scenario with the keys
+                initial_investment, monthly_contribution, simulation_years,
+                portfolio_annual_return and portfolio_annual_volatility, as for
+                run_monte_carlo_simulation.
+            num_simulations (int): Number of paths shared by every scenario.
+            seed (Optional[int]): Seed for the random number generator.
+            fan_chart (bool): If True, also return per-month percentile bands for every scenario.
+            workers (int): Number of worker processes to spread chunks of paths over.
+            sampling (str): "standard", "antithetic" or "sobol"; see run_monte_carlo_simulation.
+            distribution (str): "histogram", "raw" or "none"; see run_monte_carlo_simulation.
+
+        Returns:
+            List[dict]: One result per scenario, in order, each with the same structure as
+            run_monte_carlo_simulation.
+        """
+        if not scenarios:
+            raise ValueError("At least one scenario is required.")
+        self._validate_run_options(workers, None, distribution)
+        scenario_params = []
+        for scenario in scenarios:
+            returns_model = self._single_asset_returns_model(scenario["initial_investment"], scenario["monthly_contribution"],
+                                                             num_simulations, scenario["simulation_years"],
+                                                             scenario["portfolio_annual_return"],
+                                                             scenario["portfolio_annual_volatility"], sampling)
+            scenario_params.append((scenario["initial_investment"], scenario["monthly_contribution"],
+                                    scenario["simulation_years"] * 12, returns_model.monthly_mean,
+                                    returns_model.monthly_std_dev))
+
+        # Shocks plus the shared growth-factor buffer are held per path and month.
+        max_months = max(params[2] for params in scenario_params)
+        chunk_sizes = self._chunk_sizes(num_simulations, max_months, values_per_path_month=2)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        chunk_tasks = list(zip(seed_sequences, chunk_sizes))
+        shock_pool_key = self._shock_pool_key(seed, sampling)
+
+        num_groups = min(workers, self.max_workers, len(chunk_tasks))
+        if num_groups == 1:
+            group_results = [_simulate_batch_chunk_group(scenario_params, chunk_tasks, sampling, fan_chart, shock_pool_key)]
+        else:
+            bounds = np.linspace(0, len(chunk_tasks), num_groups + 1).astype(int)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_simulate_batch_chunk_group, scenario_params, chunk_tasks[start:end],
+                                sampling, fan_chart, shock_pool_key)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            group_results = [future.result() for future in futures]
+
+        results = []
+        for index in range(len(scenario_params)):
+            final_portfolio_values = np.concatenate([values[index] for values, _ in group_results])
+            monthly_histogram = None
+            if fan_chart:
+                monthly_histogram = group_results[0][1][index]
+                for _, histograms in group_results[1:]:
+                    monthly_histogram.merge(histograms[index])
+            results.append(self._summarize(final_portfolio_values, monthly_histogram, distribution))
+        return results
+
+    def iter_monte_carlo_simulation(self,
+                                    initial_investment: float,
+                                    monthly_contribution: float,
+                                    num_simulations: int,
+                                    simulation_years: int,
+                                    portfolio_annual_return: float,
+                                    portfolio_annual_volatility: float,
+                                    seed: Optional[int] = None,
+                                    fan_chart: bool = False,
+                                    workers: int = 1,
+                                    sampling: str = "standard",
+                                    tolerance: Optional[float] = None,
+                                    return_model: str = "normal",
+                                    model_options: Optional[Dict[str, float]] = None,
+                                    tail_metrics: bool = False,
+                                    distribution: str = "histogram") -> Iterator[dict]:
+        """
+        Runs the same simulation as run_monte_carlo_simulation, reporting progress as it goes.
+
+        Takes the same arguments. Inputs are validated before the first chunk runs; stop
+        iterating (or close the generator) to abandon the run after the current chunk.
+
+        Yields:
+            dict: After every chunk but the last, an interim estimate with 'status' set to
+            'running', 'paths_completed', 'num_simulations', 'mean_final_value',
+            'std_dev_final_value' and approximate 'percentiles' (plus 'standard_errors' in
+            adaptive mode). The last item is exactly what run_monte_carlo_simulation returns
+            for the same inputs and seed.
         """
+        returns_model = self._single_asset_returns_model(initial_investment, monthly_contribution, num_simulations,
+                                                         simulation_years, portfolio_annual_return,
+                                                         portfolio_annual_volatility, sampling, return_model,
+                                                         model_options)
+        self._validate_run_options(workers, tolerance, distribution)
+        return self._iter_progress(initial_investment, monthly_contribution, num_simulations, simulation_years * 12,
+                                   returns_model, seed, fan_chart, workers, tolerance, tail_metrics=tail_metrics,
+                                   distribution=distribution)
+
+    def _frozen_shocks(self, num_months: int, num_simulations: int, seed: Optional[int], sampling: str) -> np.ndarray:
+        """
+        Draws (or reuses) a time-major (num_months, num_simulations) block of standard normal
+        shocks for goal seeking. Seeded blocks are cached, so repeated solves for the same
+        horizon and seed skip random generation entirely. Stored as float32 to halve memory.
+        """
+        key = (num_months, num_simulations, seed, sampling)
+        with self._lock:
+            shocks = self._shock_cache.get(key) if seed is not None else None
+            if shocks is not None:
+                self._shock_cache.move_to_end(key)
+                return shocks
+
+        shocks = np.empty((num_months, num_simulations), dtype=np.float32)
+        chunk_sizes = [min(MAX_CHUNK_PATHS, num_simulations - start) for start in range(0, num_simulations, MAX_CHUNK_PATHS)]
+        start = 0
+        for seed_sequence, chunk_paths in zip(np.random.SeedSequence(seed).spawn(len(chunk_sizes)), chunk_sizes):
+            rng = np.random.default_rng(seed_sequence)
+            shocks[:, start:start + chunk_paths] = draw_standard_normals(rng, (num_months, chunk_paths), sampling)
+            start += chunk_paths
 
+        if seed is not None:
+            with self._lock:
+                self._shock_cache[key] = shocks
+                while len(self._shock_cache) > GOAL_SEEK_SHOCK_CACHE_SIZE:
+                    self._shock_cache.popitem(last=False)
+        return shocks
+
+    @staticmethod
+    def _growth_and_annuity(shocks: np.ndarray, monthly_mean: float, monthly_std_dev: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reduces a shock block to per-path factors G and H with final value = V0 * G + c * H.
+
+        G is the compounded growth of the initial investment and H the accumulated value of
+        a contribution of 1 per month, so for fixed shocks the final value is linear in both
+        the initial investment and the monthly contribution.
+        """
+        growth = np.ones(shocks.shape[1])
+        annuity = np.zeros(shocks.shape[1])
+        month_growth = np.empty(shocks.shape[1])
+        for month_shocks in shocks:
+            np.multiply(month_shocks, monthly_std_dev, out=month_growth)
+            month_growth += 1.0 + monthly_mean
+            growth *= month_growth
+            annuity *= month_growth
+            annuity += 1.0
+        return growth, annuity
+
+    def solve_goal(self,
+                   target_value: float,
+                   probability: float,
+                   solve_for: str,
+                   initial_investment: float,
+                   portfolio_annual_volatility: float,
+                   monthly_contribution: Optional[float] = None,
+                   simulation_years: Optional[int] = None,
+                   portfolio_annual_return: Optional[float] = None,
+                   num_simulations: int = 10000,
+                   seed: Optional[int] = None,
+                   sampling: str = "standard",
+                   max_years: int = GOAL_SEEK_MAX_YEARS,
+                   return_bounds: Tuple[float, float] = GOAL_SEEK_RETURN_BOUNDS) -> dict:
+        """
+        Finds the monthly contribution, horizon or annual return at which the portfolio reaches
+        target_value with at least the given probability.
+
+        One block of shocks is generated (and cached when seeded) and every candidate is
+        evaluated against those same frozen paths, so each solve is a handful of vectorised
+        passes rather than repeated simulations:
+          - monthly_contribution: with frozen shocks the final value is V0 * G + c * H per path,
+            so each path's required contribution is (target - V0 * G) / H and the answer is
+            their probability-quantile, exact in a single pass.
+          - simulation_years: portfolio values at every year end up to max_years come from one
+            pass; the answer is the first year whose success rate reaches the probability.
+          - portfolio_annual_return: final values rise with the return, so the return is found
+            by bisection within return_bounds, each step re-evaluating all paths at once.
+
+        Args:
+            target_value (float): Portfolio value to reach.
+            probability (float): Required probability of reaching it, strictly between 0 and 1.
+            solve_for (str): One of GOAL_SEEK_TARGETS; that argument is left unset and the
+                other two of monthly_contribution, simulation_years and portfolio_annual_return
+                must be given.
+            num_simulations (int): Paths in the frozen shock block.
+            seed (Optional[int]): Seed for the shocks; seeded blocks are reused across solves.
+            sampling (str): "standard", "antithetic" or "sobol"; see run_monte_carlo_simulation.
+            max_years (int): Longest horizon considered when solving for simulation_years.
+            return_bounds (Tuple[float, float]): Annual return range (%) searched when solving
+                for portfolio_annual_return.
+
+        Returns:
+            dict: 'solve_for', 'value' (None if the target cannot be reached within the bounds),
+            'achievable', and 'success_probability', the share of paths reaching the target at
+            the solved value (or at the most favourable bound when unreachable).
+        """
+        if solve_for not in GOAL_SEEK_TARGETS:
+            raise ValueError(f"Can only solve for one of: {', '.join(GOAL_SEEK_TARGETS)}.")
+        if not 0 < probability < 1:
+            raise ValueError("Probability must be between 0 and 1.")
+        if target_value <= 0:
+            raise ValueError("Target value must be positive.")
+        inputs = {"monthly_contribution": monthly_contribution, "simulation_years": simulation_years,
+                  "portfolio_annual_return": portfolio_annual_return}
+        if any(value is None for name, value in inputs.items() if name != solve_for):
+            raise ValueError(f"All of {', '.join(name for name in inputs if name != solve_for)} are required when solving for {solve_for}.")
+
+        # Validate with placeholders for the unknown, then read the fixed monthly parameters.
+        horizon = max_years if solve_for == "simulation_years" else simulation_years
+        returns_model = self._single_asset_returns_model(initial_investment,
+                                                         monthly_contribution if monthly_contribution is not None else 0.0,
+                                                         num_simulations, horizon,
+                                                         portfolio_annual_return if portfolio_annual_return is not None else 0.0,
+                                                         portfolio_annual_volatility, sampling)
+        shocks = self._frozen_shocks(horizon * 12, num_simulations, seed, sampling)
+        # Index of the path that must reach the target: at least probability * N paths succeed.
+        required_rank = int(np.ceil(probability * num_simulations)) - 1
+
+        if solve_for == "monthly_contribution":
+            growth, annuity = self._growth_and_annuity(shocks, returns_model.monthly_mean, returns_model.monthly_std_dev)
+            shortfall = target_value - initial_investment * growth
+            with np.errstate(divide="ignore", invalid="ignore"):
+                required = np.where(shortfall <= 0, 0.0, np.where(annuity > 0, shortfall / annuity, np.inf))
+            value = float(np.partition(required, required_rank)[required_rank])
+            achievable = bool(np.isfinite(value))
+            if achievable:
+                success = float(np.mean(initial_investment * growth + value * annuity >= target_value))
+            else:
+                # Paths that no finite contribution can rescue.
+                success = float(np.mean(np.isfinite(required)))
+
+        elif solve_for == "simulation_years":
+            portfolio_values = np.full(num_simulations, float(initial_investment))
+            month_growth = np.empty(num_simulations)
+            success_by_year = np.empty(max_years)
+            for month, month_shocks in enumerate(shocks):
+                np.multiply(month_shocks, returns_model.monthly_std_dev, out=month_growth)
+                month_growth += 1.0 + returns_model.monthly_mean
+                portfolio_values *= month_growth
+                portfolio_values += monthly_contribution
+                if month % 12 == 11:
+                    success_by_year[month // 12] = np.mean(portfolio_values >= target_value)
+            reached = np.flatnonzero(success_by_year >= probability)
+            achievable = len(reached) > 0
+            value = int(reached[0]) + 1 if achievable else None
+            success = float(success_by_year[reached[0]] if achievable else success_by_year.max())
+
+        else:
+            lower, upper = return_bounds
+            if lower >= upper:
+                raise ValueError("Return bounds must be increasing.")
+
+            def reaches_target(path_shocks: np.ndarray, annual_return: float) -> np.ndarray:
+                growth, annuity = self._growth_and_annuity(path_shocks, annual_return / 100 / 12,
+                                                           returns_model.monthly_std_dev)
+                return initial_investment * growth + monthly_contribution * annuity >= target_value
+
+            # Each path's final value rises with the return, so a path that reaches the target
+            # at the bracket's lower end always does and one that misses at the upper end never
+            # does; only the undecided paths in between are re-evaluated at each step.
+            reaches_upper = reaches_target(shocks, upper)
+            success = float(np.mean(reaches_upper))
+            achievable = success >= probability
+            value = None
+            if achievable:
+                reaches_lower = reaches_target(shocks, lower)
+                certain = int(reaches_lower.sum())
+                if certain / num_simulations >= probability:
+                    upper, success = lower, certain / num_simulations
+                undecided = shocks[:, reaches_upper & ~reaches_lower]
+                while upper - lower > GOAL_SEEK_RETURN_TOLERANCE:
+                    middle = (lower + upper) / 2
+                    reaches_middle = reaches_target(undecided, middle)
+                    middle_success = (certain + int(reaches_middle.sum())) / num_simulations
+                    if middle_success >= probability:
+                        upper, success = middle, middle_success
+                        undecided = undecided[:, reaches_middle]
+                    else:
+                        lower = middle
+                        certain += int(reaches_middle.sum())
+                        undecided = undecided[:, ~reaches_middle]
+                value = upper
+
+        return {
+            "solve_for": solve_for,
+            "value": value if achievable else None,
+            "achievable": achievable,
+            "success_probability": success,
+        }
+
+    def _single_asset_returns_model(self,
+                                    initial_investment: float,
+                                    monthly_contribution: float,
+                                    num_simulations: int,
+                                    simulation_years: int,
+                                    portfolio_annual_return: float,
+                                    portfolio_annual_volatility: float,
+                                    sampling: str,
+                                    return_model: str = "normal",
+                                    model_options: Optional[Dict[str, float]] = None) -> Any:
+        """Validates single-asset inputs and builds the matching monthly return model."""
         if not all(isinstance(arg, (int, float)) for arg in [initial_investment, monthly_contribution, portfolio_annual_return, portfolio_annual_volatility]):
             raise ValueError("Initial investment, monthly contribution, annual return, and volatility must be numeric.")
-        if not all(isinstance(arg, int) for arg in [num_simulations, simulation_years]):
-            raise ValueError("Number of simulations and simulation years must be integers.")
-        
-        if initial_investment < 0 or monthly_contribution < 0:
-            raise ValueError("Initial investment and monthly contribution cannot be negative.")
-        if num_simulations <= 0 or simulation_years <= 0:
-            raise ValueError("Number of simulations and simulation years must be positive.")
+        self._validate_common_inputs(initial_investment, monthly_contribution, num_simulations, simulation_years)
         if portfolio_annual_volatility < 0:
             raise ValueError("Portfolio annual volatility cannot be negative.")
 
-        # Convert annual return and volatility to monthly
-        # E.g., 7% annual return -> 0.07 annual return factor
-        # Monthly return factor = (1 + annual return factor)^(1/12) - 1
-        # For simplicity, using simple division for now, but geometric is more accurate for long term.
-        # More robust: annual_return_factor = 1 + portfolio_annual_return / 100
-        # monthly_return = (annual_return_factor**(1/12)) - 1
-        # monthly_std_dev = portfolio_annual_volatility / 100 / np.sqrt(12)
-
         # Assuming returns are normally distributed on an annual basis and then scaled to monthly
         # Annual return % to decimal
         annual_return_decimal = portfolio_annual_return / 100
@@ -66,49 +1050,424 @@ class PortfolioSimulator:
         monthly_average_return = annual_return_decimal / 12
         monthly_std_dev = annual_volatility_decimal / np.sqrt(12)
 
+        options = dict(model_options or {})
+        # Stressed-regime assumptions are given in annual % like the main inputs.
+        if "stressed_annual_return" in options:
+            options["stressed_monthly_mean"] = options.pop("stressed_annual_return") / 100 / 12
+        if "stressed_annual_volatility" in options:
+            options["stressed_monthly_std_dev"] = options.pop("stressed_annual_volatility") / 100 / np.sqrt(12)
+        return create_return_model(return_model, monthly_average_return, monthly_std_dev, sampling=sampling, **options)
+
+    @staticmethod
+    def _final_value_moments(initial_investment: float,
+                             monthly_contribution: float,
+                             num_months: int,
+                             monthly_mean: float,
+                             monthly_std_dev: float) -> Tuple[float, float]:
+        """
+        Exact mean and variance of the final value under the Monte Carlo model.
+
+        With growth g ~ N(a, sd^2), a = 1 + mean, and V' = g V + c, the first two moments
+        follow E[V'] = a E[V] + c and E[V'^2] = b E[V^2] + 2ca E[V] + c^2 with
+        b = a^2 + sd^2; both recursions are summed in closed form.
+        """
+        a = 1 + monthly_mean
+        b = a * a + monthly_std_dev ** 2
+        v0, c, n = initial_investment, monthly_contribution, num_months
+
+        if abs(a - 1) < 1e-6 or abs(b - a) < 1e-6 or abs(b - 1) < 1e-6:
+            # Near a pole of the geometric sums; the recursion itself is exact and cheap.
+            mean, second_moment = v0, v0 * v0
+            for _ in range(n):
+                second_moment = b * second_moment + 2 * c * a * mean + c * c
+                mean = a * mean + c
+        else:
+            # E[V_t] = A a^t + B with B the fixed point of the mean recursion.
+            fixed_point = c / (1 - a)
+            transient = v0 - fixed_point
+            mean = transient * a ** n + fixed_point
+            second_moment = (b ** n * v0 * v0
+                             + 2 * c * a * transient * (b ** n - a ** n) / (b - a)
+                             + (2 * c * a * fixed_point + c * c) * (b ** n - 1) / (b - 1))
+        return mean, max(second_moment - mean * mean, 0.0)
+
+    @staticmethod
+    def _analytic_percentiles(initial_investment: float,
+                              monthly_contribution: float,
+                              num_months: int,
+                              monthly_mean: float,
+                              monthly_std_dev: float,
+                              percentiles: Sequence[float]) -> np.ndarray:
+        """
+        Approximate final-value percentiles via a comonotonic conditional-expectation bound.
+
+        The final value is a weighted sum of lognormal-like terms: the initial investment
+        grows over every month, each contribution over the months after it. Taking
+        X = log(1 + r) as normal (moments from Gauss-Hermite quadrature), each term's log
+        is a sum of X's. Conditioning every term on one normal variable L, the first-order
+        weighted sum of all monthly log returns, gives E[V | L], which is increasing in L,
+        so its percentiles follow directly from the percentiles of L.
+        """
+        log_growth = np.log(np.maximum(1 + monthly_mean + monthly_std_dev * _HERMITE_NODES, 1e-12))
+        log_mean = _HERMITE_WEIGHTS @ log_growth
+        log_var = _HERMITE_WEIGHTS @ (log_growth - log_mean) ** 2
+
+        # Term j = 0 is the initial investment, exposed to all months; term j >= 1 is the
+        # contribution made at the end of month j, exposed to the remaining months.
+        months_exposed = np.arange(num_months, -1, -1)
+        amounts = np.r_[initial_investment, np.full(num_months, monthly_contribution)]
+        term_log_mean = months_exposed * log_mean
+        term_log_var = months_exposed * log_var
+
+        # Month s's return affects terms 0..s-1; weight it by their expected size.
+        month_weights = np.cumsum(amounts * np.exp(term_log_mean))[:num_months]
+        conditioning_var = log_var * np.sum(month_weights ** 2)
+        # Covariance of each term with L: sum of weights of the last k months it is exposed to.
+        trailing_weights = np.r_[0.0, np.cumsum(month_weights[::-1])]
+        covariance = log_var * trailing_weights[months_exposed]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.where(term_log_var > 0, covariance / np.sqrt(term_log_var * conditioning_var), 0.0)
+        correlation = np.nan_to_num(correlation)
+
+        z_scores = np.array([NormalDist().inv_cdf(p / 100) for p in percentiles])
+        term_std = np.sqrt(term_log_var)
+        exponents = (term_log_mean + (1 - correlation ** 2) * term_log_var / 2)[None, :] \
+            + np.outer(z_scores, correlation * term_std)
+        return np.exp(exponents) @ amounts
+
+    def run_analytic_approximation(self,
+                                   initial_investment: float,
+                                   monthly_contribution: float,
+                                   simulation_years: int,
+                                   portfolio_annual_return: float,
+                                   portfolio_annual_volatility: float
+                                   ) -> dict:
+        """
+        Answers a simulation request in closed form, without drawing any paths.
+
+        The mean and standard deviation are exact for the Monte Carlo model. Percentiles
+        come from a comonotonic approximation (see _analytic_percentiles) whose largest
+        observed relative error against Monte Carlo is listed in ANALYTIC_ERROR_BOUNDS:
+        1.5% for volatility up to 20% and horizons up to 40 years, 3% (5%) for volatility
+        up to 30% over 30 (40) years, and up to 17% at 40% volatility. Intended for instant
+        previews while a full simulation runs.
+
+        Args:
+            initial_investment (float): The starting amount of money in the portfolio.
+            monthly_contribution (float): The amount added to the portfolio each month.
+            simulation_years (int): The duration of the projection in years.
+            portfolio_annual_return (float): The expected average annual return (e.g., 7 for 7%).
+            portfolio_annual_volatility (float): The expected annual standard deviation (e.g., 10 for 10%).
+
+        Returns:
+            dict: 'mean_final_value', 'median_final_value', 'std_dev_final_value' and
+                  'percentiles' as in run_monte_carlo_simulation, plus 'method' ("analytic")
+                  and 'error_bound', the documented relative percentile error bound for these
+                  inputs (None when they lie outside the measured range).
+        """
+        if not all(isinstance(arg, (int, float)) for arg in [portfolio_annual_return, portfolio_annual_volatility]):
+            raise ValueError("Annual return and volatility must be numeric.")
+        self._validate_common_inputs(initial_investment, monthly_contribution, 1, simulation_years)
+        if portfolio_annual_volatility < 0:
+            raise ValueError("Portfolio annual volatility cannot be negative.")
+
+        # Same monthly scaling as run_monte_carlo_simulation.
+        monthly_mean = portfolio_annual_return / 100 / 12
+        monthly_std_dev = portfolio_annual_volatility / 100 / np.sqrt(12)
         num_months = simulation_years * 12
-        final_portfolio_values = []
-
-        for _ in range(num_simulations):
-            portfolio_value = initial_investment
-            for month in range(num_months):
-                # Generate a random monthly return from a normal distribution
-                # The mean is the monthly average return, std dev is monthly std dev
-                monthly_return = np.random.normal(monthly_average_return, monthly_std_dev)
-                
-                # Apply return to current portfolio value
-                portfolio_value *= (1 + monthly_return)
-                
-                # Add monthly contribution
-                portfolio_value += monthly_contribution
-            
-            final_portfolio_values.append(portfolio_value)
-        
-        # Convert to numpy array for easier statistical calculations
-        final_portfolio_values = np.array(final_portfolio_values)
 
-        # Calculate statistics
-        mean_final_value = np.mean(final_portfolio_values)
-        median_final_value = np.median(final_portfolio_values)
-        std_dev_final_value = np.std(final_portfolio_values)
+        mean, variance = self._final_value_moments(initial_investment, monthly_contribution, num_months,
+                                                   monthly_mean, monthly_std_dev)
+        if initial_investment == 0 and monthly_contribution == 0:
+            p10 = p50 = p90 = 0.0
+        else:
+            p10, p50, p90 = self._analytic_percentiles(initial_investment, monthly_contribution, num_months,
+                                                       monthly_mean, monthly_std_dev, REPORTED_PERCENTILES)
 
-        # Calculate percentiles (e.g., 10th percentile for "bad" outcome, 90th for "good" outcome)
-        p10 = np.percentile(final_portfolio_values, 10)
-        p50 = np.percentile(final_portfolio_values, 50)
-        p90 = np.percentile(final_portfolio_values, 90)
+        error_bound = next((bound for max_volatility, max_years, bound in ANALYTIC_ERROR_BOUNDS
+                            if portfolio_annual_volatility <= max_volatility and simulation_years <= max_years), None)
 
         return {
-            "final_portfolio_values": final_portfolio_values.tolist(), # Convert numpy array to list for JSON serialization
-            "mean_final_value": mean_final_value,
-            "median_final_value": median_final_value,
-            "std_dev_final_value": std_dev_final_value,
+            "mean_final_value": float(mean),
+            "median_final_value": float(p50),
+            "std_dev_final_value": float(np.sqrt(variance)),
             "percentiles": {
-                "10th": p10,
-                "50th": p50,
-                "90th": p90
-            }
+                "10th": float(p10),
+                "50th": float(p50),
+                "90th": float(p90)
+            },
+            "method": "analytic",
+            "error_bound": error_bound
         }
 
+    @staticmethod
+    def _correlation_array(correlation_matrix: Any, tickers: Sequence[str]) -> np.ndarray:
+        """
+        Converts a correlation matrix into an array ordered like `tickers`.
+
+        Accepts the DataFrame produced by CorrelationCalculator.calculate_correlation_matrix,
+        the nested dict returned by CorrelationCalculator.get_correlations, or an array-like
+        already in ticker order.
+        """
+        if hasattr(correlation_matrix, "loc"):
+            missing = [t for t in tickers if t not in correlation_matrix.index or t not in correlation_matrix.columns]
+            if missing:
+                raise ValueError(f"Correlation matrix is missing assets: {', '.join(missing)}")
+            matrix = correlation_matrix.loc[list(tickers), list(tickers)].to_numpy(dtype=np.float64)
+        elif isinstance(correlation_matrix, dict):
+            try:
+                matrix = np.array([[correlation_matrix[row][col] for col in tickers] for row in tickers], dtype=np.float64)
+            except KeyError as e:
+                raise ValueError(f"Correlation matrix is missing asset: {e.args[0]}")
+        else:
+            matrix = np.asarray(correlation_matrix, dtype=np.float64)
+
+        if matrix.shape != (len(tickers), len(tickers)):
+            raise ValueError("Correlation matrix must be square with one row per asset.")
+        if not np.allclose(matrix, matrix.T) or not np.allclose(np.diag(matrix), 1.0):
+            raise ValueError("Correlation matrix must be symmetric with ones on the diagonal.")
+        return matrix
+
+    @staticmethod
+    def _cholesky(correlation: np.ndarray) -> np.ndarray:
+        """
+        Lower-triangular Cholesky factor of a correlation matrix.
+
+        Matrices estimated from short or constant return series (CorrelationCalculator
+        fills undefined correlations with 0) can be singular or slightly indefinite;
+        those are projected onto the nearest positive definite correlation matrix first.
+        """
+        try:
+            return np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError:
+            eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+            repaired = (eigenvectors * np.maximum(eigenvalues, 1e-10)) @ eigenvectors.T
+            scale = 1 / np.sqrt(np.diag(repaired))
+            return np.linalg.cholesky(repaired * np.outer(scale, scale))
+
+    def _get_cholesky_factor(self, tickers: Sequence[str], window: Hashable, correlation: np.ndarray) -> np.ndarray:
+        """
+        Returns the Cholesky factor for a (universe, window) pair, decomposing only on a cache miss.
+
+        The cached matrix is compared with the incoming one so a window label reused with
+        refreshed data never serves a stale factor.
+        """
+        key = (tuple(tickers), window)
+        with self._lock:
+            cached = self._cholesky_cache.get(key)
+            if cached is not None and np.array_equal(cached[0], correlation):
+                self._cholesky_cache.move_to_end(key)
+                return cached[1]
+
+            factor = self._cholesky(correlation)
+            self._cholesky_cache[key] = (correlation.copy(), factor)
+            self._cholesky_cache.move_to_end(key)
+            while len(self._cholesky_cache) > CHOLESKY_CACHE_SIZE:
+                self._cholesky_cache.popitem(last=False)
+            return factor
+
+    def run_multi_asset_simulation(self,
+                                   initial_investment: float,
+                                   monthly_contribution: float,
+                                   num_simulations: int,
+                                   simulation_years: int,
+                                   asset_weights: Dict[str, float],
+                                   asset_annual_returns: Dict[str, float],
+                                   asset_annual_volatilities: Dict[str, float],
+                                   correlation_matrix: Any,
+                                   correlation_window: Hashable = None,
+                                   seed: Optional[int] = None,
+                                   fan_chart: bool = False,
+                                   workers: int = 1,
+                                   sampling: str = "standard",
+                                   tolerance: Optional[float] = None,
+                                   tail_metrics: bool = False,
+                                   rebalance_months: Optional[int] = 1,
+                                   rebalance_threshold: Optional[float] = None,
+                                   transaction_cost: float = 0.0,
+                                   distribution: str = "histogram"
+                                   ) -> dict:
+        """
+        Runs a Monte Carlo simulation for a portfolio of correlated assets.
+
+        By default the portfolio is rebalanced to its target weights every month at no cost,
+        so it behaves like a fixed-weight portfolio. With a longer rebalance interval, a drift
+        threshold or transaction costs, holdings drift with their own returns between
+        rebalances and every trade back to target pays the cost (see RebalancedPortfolioReturns).
+
+        Args:
+            initial_investment (float): The starting amount of money in the portfolio.
+            monthly_contribution (float): The amount added to the portfolio each month.
+            num_simulations (int): The number of independent simulation paths to run.
+            simulation_years (int): The duration of each simulation in years.
+            asset_weights (Dict[str, float]): Portfolio weight per ticker; must be non-negative and sum to 1.
+            asset_annual_returns (Dict[str, float]): Expected annual return per ticker (e.g., 7 for 7%).
+            asset_annual_volatilities (Dict[str, float]): Annual standard deviation per ticker (e.g., 10 for 10%).
+            correlation_matrix (Any): Output of CorrelationCalculator.calculate_correlation_matrix
+                (DataFrame) or get_correlations (nested dict), or an array in asset_weights order.
+            correlation_window (Hashable): Label of the lookback window the correlations were
+                estimated over (e.g. "1y"). Together with the tickers it keys the Cholesky cache.
+            seed (Optional[int]): Seed for the random number generator.
+            fan_chart (bool): If True, also return per-month percentile bands.
+            workers (int): Number of worker processes to spread chunks of paths over.
+            sampling (str): "standard", "antithetic" or "sobol"; see run_monte_carlo_simulation.
+            tolerance (Optional[float]): Relative standard error target for adaptive mode.
+            tail_metrics (bool): If True, also report VaR, CVaR and maximum drawdowns.
+            rebalance_months (Optional[int]): Months between scheduled rebalances (1 monthly, 12
+                annual); None only rebalances on the threshold, or never (buy and hold).
+            rebalance_threshold (Optional[float]): Also rebalance a path as soon as any asset's
+                weight drifts further than this from its target (e.g. 0.05 for 5 points).
+            transaction_cost (float): Cost of trading, in percent of the value traded (e.g. 0.1
+                for 0.1%). Contributions are invested at the target weights free of charge.
+            distribution (str): "histogram", "raw" or "none"; see run_monte_carlo_simulation.
+
+        Returns:
+            dict: Same structure as run_monte_carlo_simulation.
+        """
+        self._validate_common_inputs(initial_investment, monthly_contribution, num_simulations, simulation_years)
+        if not 0 <= transaction_cost < 100:
+            raise ValueError("Transaction cost must be between 0 and 100%.")
+
+        tickers = list(asset_weights)
+        if not tickers:
+            raise ValueError("At least one asset is required.")
+        if set(asset_annual_returns) != set(tickers) or set(asset_annual_volatilities) != set(tickers):
+            raise ValueError("Weights, returns and volatilities must be given for the same assets.")
+
+        weights = np.array([asset_weights[t] for t in tickers], dtype=np.float64)
+        annual_returns = np.array([asset_annual_returns[t] for t in tickers], dtype=np.float64)
+        annual_volatilities = np.array([asset_annual_volatilities[t] for t in tickers], dtype=np.float64)
+        if np.any(weights < 0) or not np.isclose(weights.sum(), 1.0):
+            raise ValueError("Asset weights must be non-negative and sum to 1.")
+        if np.any(annual_volatilities < 0):
+            raise ValueError("Asset volatilities cannot be negative.")
+
+        correlation = self._correlation_array(correlation_matrix, tickers)
+        cholesky_factor = self._get_cholesky_factor(tickers, correlation_window, correlation)
+
+        # Same monthly scaling as the single-asset model.
+        monthly_means = annual_returns / 100 / 12
+        monthly_std_devs = annual_volatilities / 100 / np.sqrt(12)
+
+        num_months = simulation_years * 12
+        if rebalance_months == 1 and transaction_cost == 0:
+            # Costless monthly rebalancing keeps the weights fixed, so no holdings need tracking.
+            returns_model = CorrelatedNormalReturns(monthly_means, monthly_std_devs, cholesky_factor, weights,
+                                                    sampling=sampling)
+        else:
+            returns_model = RebalancedPortfolioReturns(monthly_means, monthly_std_devs, cholesky_factor, weights,
+                                                       initial_investment, monthly_contribution,
+                                                       rebalance_months=rebalance_months,
+                                                       rebalance_threshold=rebalance_threshold,
+                                                       transaction_cost=transaction_cost / 100,
+                                                       sampling=sampling)
+
+        return self._run_chunks(initial_investment, monthly_contribution, num_simulations, num_months,
+                                returns_model, seed=seed, fan_chart=fan_chart, workers=workers,
+                                tolerance=tolerance, tail_metrics=tail_metrics, distribution=distribution)
+
+    def run_bootstrap_simulation(self,
+                                 initial_investment: float,
+                                 monthly_contribution: float,
+                                 num_simulations: int,
+                                 simulation_years: int,
+                                 historical_returns: np.ndarray,
+                                 periods_per_month: int = 1,
+                                 mean_block_months: float = 6.0,
+                                 seed: Optional[int] = None,
+                                 fan_chart: bool = False,
+                                 workers: int = 1,
+                                 tolerance: Optional[float] = None,
+                                 tail_metrics: bool = False,
+                                 distribution: str = "histogram"
+                                 ) -> dict:
+        """
+        Runs a simulation whose monthly returns are block-bootstrapped from history instead
+        of drawn from a normal distribution, keeping the fat tails and volatility clustering
+        of the historical series.
+
+        Args:
+            initial_investment (float): The starting amount of money in the portfolio.
+            monthly_contribution (float): The amount added to the portfolio each month.
+            num_simulations (int): The number of independent simulation paths to run.
+            simulation_years (int): The duration of each simulation in years.
+            historical_returns (np.ndarray): 1-D series of simple portfolio returns, oldest first,
+                e.g. from HistoricalReturnStore.get_returns.
+            periods_per_month (int): Historical periods per simulated month (1 for monthly
+                returns, 21 for daily).
+            mean_block_months (float): Average length of the resampled blocks, in months.
+            seed (Optional[int]): Seed for the random number generator.
+            fan_chart (bool): If True, also return per-month percentile bands.
+            workers (int): Number of worker processes to spread chunks of paths over.
+            tolerance (Optional[float]): Relative standard error target for adaptive mode.
+            tail_metrics (bool): If True, also report VaR, CVaR and maximum drawdowns.
+            distribution (str): "histogram", "raw" or "none"; see run_monte_carlo_simulation.
+
+        Returns:
+            dict: Same structure as run_monte_carlo_simulation.
+        """
+        self._validate_common_inputs(initial_investment, monthly_contribution, num_simulations, simulation_years)
+        returns_model = BlockBootstrapReturns(historical_returns, mean_block_months * periods_per_month,
+                                              periods_per_month)
+
+        return self._run_chunks(initial_investment, monthly_contribution, num_simulations, simulation_years * 12,
+                                returns_model, seed=seed, fan_chart=fan_chart, workers=workers,
+                                tolerance=tolerance, tail_metrics=tail_metrics, distribution=distribution)
+
+    def run_strategy_simulation(self,
+                                initial_investment: float,
+                                monthly_contribution: float,
+                                num_simulations: int,
+                                simulation_years: int,
+                                portfolio_annual_return: float,
+                                portfolio_annual_volatility: float,
+                                strategy: PathStrategy,
+                                seed: Optional[int] = None,
+                                fan_chart: bool = False,
+                                workers: int = 1,
+                                sampling: str = "standard",
+                                tolerance: Optional[float] = None,
+                                tail_metrics: bool = False,
+                                distribution: str = "histogram",
+                                engine: str = "auto"
+                                ) -> dict:
+        """
+        Runs a simulation in which every path follows path-dependent rules: drawdown-triggered
+        de-risking, a glide path on the running balance and guarded withdrawals (see PathStrategy).
+
+        Args:
+            initial_investment (float): The starting amount of money in the portfolio.
+            monthly_contribution (float): The amount added to the portfolio each month.
+            num_simulations (int): The number of independent simulation paths to run.
+            simulation_years (int): The duration of each simulation in years.
+            portfolio_annual_return (float): Expected annual return of the risky sleeve in %.
+            portfolio_annual_volatility (float): Annual volatility of the risky sleeve in %.
+            strategy (PathStrategy): The rules applied to every path.
+            seed (Optional[int]): Seed for the random number generator.
+            fan_chart (bool): If True, also return per-month percentile bands.
+            workers (int): Number of worker processes to spread chunks of paths over.
+            sampling (str): "standard", "antithetic" or "sobol".
+            tolerance (Optional[float]): Relative standard error target for adaptive mode.
+            tail_metrics (bool): If True, also report VaR, CVaR and maximum drawdowns.
+            distribution (str): "histogram", "raw" or "none"; see run_monte_carlo_simulation.
+            engine (str): "numba" (compiled kernel; use workers to parallelise), "numpy" (vectorised
+                fallback) or "auto", which picks Numba when it is installed.
+
+        Returns:
+            dict: Same structure as run_monte_carlo_simulation.
+        """
+        self._validate_common_inputs(initial_investment, monthly_contribution, num_simulations, simulation_years)
+        if portfolio_annual_volatility < 0:
+            raise ValueError("Portfolio annual volatility cannot be negative.")
+        returns_model = PathStrategyReturns(portfolio_annual_return / 100 / 12,
+                                            portfolio_annual_volatility / 100 / np.sqrt(12),
+                                            strategy, initial_investment, monthly_contribution,
+                                            sampling=sampling, engine=engine)
+
+        return self._run_chunks(initial_investment, monthly_contribution, num_simulations, simulation_years * 12,
+                                returns_model, seed=seed, fan_chart=fan_chart, workers=workers,
+                                tolerance=tolerance, tail_metrics=tail_metrics, distribution=distribution)
+
 if __name__ == "__main__":
     # Example Usage:
     simulator = PortfolioSimulator()
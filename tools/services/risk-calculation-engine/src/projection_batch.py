@@ -0,0 +1,350 @@
+"""
+Nightly projection batch: simulates every stored portfolio and writes summary percentiles
+to the portfolio_projection table, so dashboards read one indexed row instead of running
+a simulation per page load.
+
+Schedule it nightly (e.g. cron) from the service directory:
+
+    python -m src.projection_batch [--run-id 2026-01-31]
+
+A run reads "Portfolio" in keyset-paginated pages (ordered by id), simulates each page in
+a process pool while the next page loads, and commits the page's results together with
+its checkpoint. A run that crashes resumes after the last committed page when started
+again with the same run ID (by default, today's UTC date).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import settings
+from .portfolio_simulator import PortfolioSimulator
+
+# asyncpg is only needed against a real database; the batch itself runs over any store.
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+
+logger = logging.getLogger(__name__)
+
+# Annual return and volatility (%) assumed per RiskProfile.riskTolerance; portfolios whose
+# owner has no risk profile use "medium".
+PROJECTION_ASSUMPTIONS = {"low": (4.0, 8.0), "medium": (6.0, 12.0), "high": (8.0, 18.0)}
+DEFAULT_RISK_TOLERANCE = "medium"
+
+@dataclass(frozen=True)
+class PortfolioRow:
+    portfolio_id: str
+    user_id: str
+    current_value: float
+    risk_tolerance: str = DEFAULT_RISK_TOLERANCE
+
+@dataclass(frozen=True)
+class Projection:
+    portfolio_id: str
+    user_id: str
+    current_value: float
+    annual_return: float
+    annual_volatility: float
+    horizon_years: int
+    mean_final_value: float
+    p10: float
+    p50: float
+    p90: float
+
+def holdings_value(holdings: Any) -> float:
+    """
+    Market value of a Portfolio.holdings JSON document (a string or parsed JSON).
+
+    Holdings may be a list or a symbol-keyed object of entries. An entry is either a number
+    (its market value) or an object with marketValue / market_value / value, or else a
+    quantity and a currentPrice / current_price / price / averagePrice.
+    """
+    if isinstance(holdings, (str, bytes)):
+        holdings = json.loads(holdings)
+    if holdings is None:
+        return 0.0
+    entries = holdings.values() if isinstance(holdings, dict) else holdings
+    total = 0.0
+    for entry in entries:
+        if isinstance(entry, (int, float)) and not isinstance(entry, bool):
+            total += entry
+        elif isinstance(entry, dict):
+            value = next((entry[k] for k in ("marketValue", "market_value", "value") if entry.get(k) is not None), None)
+            if value is None:
+                price = next((entry[k] for k in ("currentPrice", "current_price", "price", "averagePrice")
+                              if entry.get(k) is not None), 0.0)
+                value = float(entry.get("quantity") or 0.0) * float(price)
+            total += float(value)
+    return total
+
+def portfolio_seed(portfolio_id: str) -> int:
+    """Stable per-portfolio seed, so a resumed or repeated run reproduces the same numbers."""
+    return int.from_bytes(hashlib.sha256(portfolio_id.encode()).digest()[:8], "little")
+
+# One simulator per worker process, created on first use.
+_worker_simulator: Optional[PortfolioSimulator] = None
+
+def project_portfolios(rows: Sequence[PortfolioRow], num_simulations: int, horizon_years: int) -> Tuple[List[Projection], int]:
+    """
+    Simulates a slice of portfolios in a worker process.
+
+    Returns:
+        Tuple[List[Projection], int]: The projections and the number of portfolios skipped
+            because their inputs were invalid (e.g. a negative value).
+    """
+    global _worker_simulator
+    if _worker_simulator is None:
+        _worker_simulator = PortfolioSimulator(max_workers=1)
+    projections, failed = [], 0
+    for row in rows:
+        annual_return, annual_volatility = PROJECTION_ASSUMPTIONS.get(row.risk_tolerance,
+                                                                      PROJECTION_ASSUMPTIONS[DEFAULT_RISK_TOLERANCE])
+        if row.current_value == 0:
+            # Nothing invested and nothing contributed: every path stays at 0.
+            stats = {"mean_final_value": 0.0, "percentiles": {"10th": 0.0, "50th": 0.0, "90th": 0.0}}
+        else:
+            try:
+                stats = _worker_simulator.run_monte_carlo_simulation(
+                    row.current_value, 0.0, num_simulations, horizon_years, annual_return, annual_volatility,
+                    seed=portfolio_seed(row.portfolio_id), distribution="none")
+            except ValueError as e:
+                logger.warning(f"Skipping portfolio {row.portfolio_id}: {e}")
+                failed += 1
+                continue
+        percentiles = stats["percentiles"]
+        projections.append(Projection(row.portfolio_id, row.user_id, row.current_value, annual_return,
+                                      annual_volatility, horizon_years, float(stats["mean_final_value"]),
+                                      float(percentiles["10th"]), float(percentiles["50th"]), float(percentiles["90th"])))
+    return projections, failed
+
+class ProjectionBatch:
+    """
+    Simulates every portfolio a store yields and writes the results back, page by page.
+
+    The store is any object with the PostgresProjectionStore API: async load_checkpoint(run_id)
+    returning (last_portfolio_id, completed), fetch_portfolios(after, limit) returning
+    PortfolioRows ordered by ID, save_results(run_id, projections, last_portfolio_id, failed),
+    which must write results and checkpoint atomically, and complete_run(run_id).
+    """
+
+    def __init__(self,
+                 store: Any,
+                 page_size: int = 500,
+                 num_simulations: int = 2000,
+                 horizon_years: int = 30,
+                 max_workers: int = 1):
+        if page_size <= 0 or num_simulations <= 0 or horizon_years <= 0 or max_workers <= 0:
+            raise ValueError("Page size, simulations, horizon and workers must be positive.")
+        self.store = store
+        self.page_size = page_size
+        self.num_simulations = num_simulations
+        self.horizon_years = horizon_years
+        self.max_workers = max_workers
+
+    async def _project_page(self, pool: ProcessPoolExecutor, page: List[PortfolioRow]) -> Tuple[List[Projection], int]:
+        loop = asyncio.get_running_loop()
+        size = -(-len(page) // self.max_workers)
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, project_portfolios, page[start:start + size], self.num_simulations,
+                                 self.horizon_years)
+            for start in range(0, len(page), size)
+        ])
+        return [projection for projections, _ in results for projection in projections], sum(f for _, f in results)
+
+    async def run(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Runs (or resumes) a batch.
+
+        Args:
+            run_id (Optional[str]): Identifies the run for checkpointing; defaults to today's UTC date.
+
+        Returns:
+            Dict[str, Any]: run_id, portfolios projected and skipped in this invocation, whether
+                it resumed an earlier one, and elapsed seconds.
+        """
+        run_id = run_id or datetime.now(timezone.utc).date().isoformat()
+        after, completed = await self.store.load_checkpoint(run_id)
+        summary = {"run_id": run_id, "projected": 0, "failed": 0, "resumed": after is not None, "seconds": 0.0}
+        if completed:
+            logger.info(f"Projection run {run_id} already completed")
+            return summary
+
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            page = await self.store.fetch_portfolios(after, self.page_size)
+            while page:
+                # Load the next page while this one is simulated.
+                next_page = asyncio.ensure_future(self.store.fetch_portfolios(page[-1].portfolio_id, self.page_size))
+                try:
+                    projections, failed = await self._project_page(pool, page)
+                    await self.store.save_results(run_id, projections, page[-1].portfolio_id, failed)
+                except BaseException:
+                    next_page.cancel()
+                    raise
+                summary["projected"] += len(projections)
+                summary["failed"] += failed
+                logger.info(f"Projection run {run_id}: {summary['projected']} portfolios projected")
+                page = await next_page
+        await self.store.complete_run(run_id)
+        summary["seconds"] = time.perf_counter() - started
+        return summary
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS portfolio_projection (
+    portfolio_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    current_value DOUBLE PRECISION NOT NULL,
+    annual_return DOUBLE PRECISION NOT NULL,
+    annual_volatility DOUBLE PRECISION NOT NULL,
+    horizon_years INTEGER NOT NULL,
+    mean_final_value DOUBLE PRECISION NOT NULL,
+    p10 DOUBLE PRECISION NOT NULL,
+    p50 DOUBLE PRECISION NOT NULL,
+    p90 DOUBLE PRECISION NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS portfolio_projection_user_id_idx ON portfolio_projection (user_id);
+CREATE TABLE IF NOT EXISTS projection_batch_run (
+    run_id TEXT PRIMARY KEY,
+    last_portfolio_id TEXT,
+    projected INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    completed_at TIMESTAMPTZ
+);
+"""
+
+# Keyset page of portfolios with their owner's risk tolerance. Portfolios whose holdings carry
+# no value fall back to their net invested amount from "Transaction" (portfolioId index).
+_FETCH_SQL = """
+SELECT p.id, p."userId", p.holdings, r."riskTolerance"::text AS risk_tolerance, t.net_invested
+FROM "Portfolio" p
+LEFT JOIN "RiskProfile" r ON r."userId" = p."userId"
+LEFT JOIN LATERAL (
+    SELECT sum(CASE x.type WHEN 'BUY' THEN x.total WHEN 'SELL' THEN -x.total ELSE 0 END) AS net_invested
+    FROM "Transaction" x WHERE x."portfolioId" = p.id
+) t ON true
+{where}
+ORDER BY p.id
+LIMIT $1
+"""
+
+_UPSERT_SQL = """
+INSERT INTO portfolio_projection (portfolio_id, user_id, run_id, current_value, annual_return, annual_volatility,
+                                  horizon_years, mean_final_value, p10, p50, p90, computed_at)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, now())
+ON CONFLICT (portfolio_id) DO UPDATE SET
+    user_id = EXCLUDED.user_id, run_id = EXCLUDED.run_id, current_value = EXCLUDED.current_value,
+    annual_return = EXCLUDED.annual_return, annual_volatility = EXCLUDED.annual_volatility,
+    horizon_years = EXCLUDED.horizon_years, mean_final_value = EXCLUDED.mean_final_value,
+    p10 = EXCLUDED.p10, p50 = EXCLUDED.p50, p90 = EXCLUDED.p90, computed_at = EXCLUDED.computed_at
+"""
+
+_CHECKPOINT_SQL = """
+INSERT INTO projection_batch_run (run_id, last_portfolio_id, projected, failed)
+VALUES ($1, $2, $3, $4)
+ON CONFLICT (run_id) DO UPDATE SET
+    last_portfolio_id = EXCLUDED.last_portfolio_id,
+    projected = projection_batch_run.projected + EXCLUDED.projected,
+    failed = projection_batch_run.failed + EXCLUDED.failed,
+    updated_at = now()
+"""
+
+class PostgresProjectionStore:
+    """Reads portfolios from and writes projections to the application's Postgres database."""
+
+    def __init__(self, dsn: str):
+        if not HAS_ASYNCPG:
+            raise ImportError("asyncpg is required for the projection batch")
+        self.dsn = dsn
+        self.pool = None
+
+    async def connect(self) -> None:
+        self.pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=2)
+        async with self.pool.acquire() as conn:
+            await conn.execute(_SCHEMA_SQL)
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def load_checkpoint(self, run_id: str) -> Tuple[Optional[str], bool]:
+        row = await self.pool.fetchrow(
+            "SELECT last_portfolio_id, completed_at FROM projection_batch_run WHERE run_id = $1", run_id)
+        if row is None:
+            return None, False
+        return row["last_portfolio_id"], row["completed_at"] is not None
+
+    async def fetch_portfolios(self, after: Optional[str], limit: int) -> List[PortfolioRow]:
+        if after is None:
+            rows = await self.pool.fetch(_FETCH_SQL.format(where=""), limit)
+        else:
+            rows = await self.pool.fetch(_FETCH_SQL.format(where="WHERE p.id > $2"), limit, after)
+        portfolios = []
+        for row in rows:
+            try:
+                value = holdings_value(row["holdings"])
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Unreadable holdings for portfolio {row['id']}: {e}")
+                value = 0.0
+            if value == 0 and row["net_invested"] is not None:
+                value = max(float(row["net_invested"]), 0.0)
+            portfolios.append(PortfolioRow(row["id"], row["userId"], value,
+                                           row["risk_tolerance"] or DEFAULT_RISK_TOLERANCE))
+        return portfolios
+
+    async def save_results(self, run_id: str, projections: Sequence[Projection], last_portfolio_id: str,
+                           failed: int = 0) -> None:
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(_UPSERT_SQL, [
+                    (p.portfolio_id, p.user_id, run_id, p.current_value, p.annual_return, p.annual_volatility,
+                     p.horizon_years, p.mean_final_value, p.p10, p.p50, p.p90)
+                    for p in projections
+                ])
+                await conn.execute(_CHECKPOINT_SQL, run_id, last_portfolio_id, len(projections), failed)
+
+    async def complete_run(self, run_id: str) -> None:
+        await self.pool.execute(
+            "INSERT INTO projection_batch_run (run_id, completed_at) VALUES ($1, now()) "
+            "ON CONFLICT (run_id) DO UPDATE SET completed_at = now(), updated_at = now()", run_id)
+
+    async def get_projection(self, portfolio_id: str) -> Optional[Dict[str, Any]]:
+        """The dashboard read: one primary-key lookup."""
+        row = await self.pool.fetchrow("SELECT * FROM portfolio_projection WHERE portfolio_id = $1", portfolio_id)
+        return dict(row) if row is not None else None
+
+async def _run_nightly(run_id: Optional[str]) -> Dict[str, Any]:
+    store = PostgresProjectionStore(settings.DATABASE_URL)
+    await store.connect()
+    try:
+        batch = ProjectionBatch(store, page_size=settings.PROJECTION_BATCH_PAGE_SIZE,
+                                num_simulations=settings.PROJECTION_BATCH_SIMULATIONS,
+                                horizon_years=settings.PROJECTION_BATCH_YEARS,
+                                max_workers=settings.PROJECTION_BATCH_WORKERS)
+        return await batch.run(run_id)
+    finally:
+        await store.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Project every stored portfolio and store the percentiles.")
+    parser.add_argument("--run-id", default=None, help="Checkpoint key; defaults to today's UTC date.")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    summary = asyncio.run(_run_nightly(args.run_id))
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
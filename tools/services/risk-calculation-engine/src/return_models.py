@@ -0,0 +1,577 @@
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from .path_kernels import PathStrategy, resolve_engine, strategy_growth_factors
+
+# scipy is only needed for quasi-Monte Carlo sampling.
+try:
+    from scipy.special import ndtri
+    from scipy.stats import qmc
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# Ways of drawing the standard normal shocks behind every return model:
+#   standard   - independent pseudo-random draws.
+#   antithetic - the second half of each chunk's paths mirrors the first (z, -z),
+#                cancelling odd-order noise in the path distribution.
+#   sobol      - scrambled Sobol points, one dimension per month (and asset),
+#                mapped through the inverse normal CDF and assigned to months with a
+#                Brownian bridge. Each chunk is an independent scramble, so chunks are
+#                i.i.d. randomized-QMC replicates.
+SAMPLING_METHODS = ("standard", "antithetic", "sobol")
+
+# Single-asset return generators selectable per request (see create_return_model).
+RETURN_MODELS = ("normal", "student_t", "regime_switching", "garch")
+# Options each model accepts; anything else is rejected rather than silently ignored.
+RETURN_MODEL_OPTIONS = {
+    "normal": (),
+    "student_t": ("degrees_of_freedom",),
+    "regime_switching": ("stressed_monthly_mean", "stressed_monthly_std_dev", "to_stressed_probability",
+                         "to_calm_probability"),
+    "garch": ("alpha", "beta"),
+}
+
+_bridge_schedules = {}
+
+def _brownian_bridge_schedule(num_steps: int):
+    """
+    Order in which a Brownian bridge fills W(1..num_steps): the endpoint first, then
+    successive midpoints. Each entry is (point, left, right, left_weight, right_weight, std).
+    """
+    schedule = _bridge_schedules.get(num_steps)
+    if schedule is None:
+        schedule = [(num_steps, 0, None, 0.0, 0.0, np.sqrt(num_steps))]
+        intervals = [(0, num_steps)]
+        while intervals:
+            left, right = intervals.pop(0)
+            if right - left < 2:
+                continue
+            mid = (left + right) // 2
+            span = right - left
+            schedule.append((mid, left, right, (right - mid) / span, (mid - left) / span,
+                             np.sqrt((mid - left) * (right - mid) / span)))
+            intervals.extend([(left, mid), (mid, right)])
+        _bridge_schedules[num_steps] = schedule
+    return schedule
+
+def _brownian_bridge_increments(shocks: np.ndarray) -> np.ndarray:
+    """
+    Turns time-major standard normals into Brownian increments via a bridge construction.
+
+    The first shock sets every path's endpoint and later shocks refine ever shorter
+    intervals, which concentrates the variance of quantities driven by the cumulative
+    shock (such as the final portfolio value) in the leading Sobol dimensions.
+    """
+    num_steps = shocks.shape[0]
+    path = np.zeros((num_steps + 1,) + shocks.shape[1:])
+    for step, (point, left, right, left_weight, right_weight, std) in enumerate(_brownian_bridge_schedule(num_steps)):
+        if right is None:
+            path[point] = std * shocks[step]
+        else:
+            path[point] = left_weight * path[left] + right_weight * path[right] + std * shocks[step]
+    return np.diff(path, axis=0)
+
+def validate_sampling(sampling: str) -> None:
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"Sampling must be one of: {', '.join(SAMPLING_METHODS)}.")
+    if sampling == "sobol" and not HAS_SCIPY:
+        raise ValueError("Sobol sampling requires scipy to be installed.")
+
+def draw_standard_normals(rng: np.random.Generator, shape: Tuple[int, ...], sampling: str = "standard") -> np.ndarray:
+    """
+    Draws a time-major block of standard normal shocks.
+
+    Args:
+        rng (np.random.Generator): Generator for this chunk.
+        shape (Tuple[int, ...]): (num_months, num_paths, *per_step_dims).
+        sampling (str): One of SAMPLING_METHODS.
+
+    Returns:
+        np.ndarray: C-contiguous array of the requested shape.
+    """
+    num_months, num_paths = shape[0], shape[1]
+    if sampling == "standard":
+        return rng.standard_normal(shape)
+    if sampling == "antithetic":
+        half = rng.standard_normal((num_months, (num_paths + 1) // 2) + tuple(shape[2:]))
+        return np.concatenate([half, -half], axis=1)[:, :num_paths]
+    if sampling == "sobol":
+        dimensions = int(np.prod(shape)) // num_paths
+        sobol = qmc.Sobol(d=dimensions, scramble=True, seed=rng)
+        # Take a prefix of the next power-of-two sample to keep Sobol's balance properties.
+        points = sobol.random_base2(int(np.ceil(np.log2(num_paths))))[:num_paths]
+        np.clip(points, 1e-12, 1 - 1e-12, out=points)
+        shocks = ndtri(points).reshape((num_paths, num_months) + tuple(shape[2:]))
+        return _brownian_bridge_increments(np.moveaxis(shocks, 0, 1))
+    raise ValueError(f"Sampling must be one of: {', '.join(SAMPLING_METHODS)}.")
+
+class NormalReturns:
+    """
+    Independent, normally distributed monthly portfolio returns.
+
+    Return models are small picklable objects so that chunks of paths can be
+    generated in worker processes: each one turns a random generator and a chunk
+    shape into a time-major (num_months, num_paths) block of growth factors.
+    """
+
+    # Floats held per path and month while a chunk is generated.
+    values_per_path_month = 1
+
+    def __init__(self, monthly_mean: float, monthly_std_dev: float, sampling: str = "standard"):
+        validate_sampling(sampling)
+        self.monthly_mean = monthly_mean
+        self.monthly_std_dev = monthly_std_dev
+        self.sampling = sampling
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        # Draw the whole chunk's shocks at once and turn them into growth
+        # factors in place to avoid a second block-sized allocation.
+        growth_factors = draw_standard_normals(rng, (num_months, num_paths), self.sampling)
+        growth_factors *= self.monthly_std_dev
+        growth_factors += 1.0 + self.monthly_mean
+        return growth_factors
+
+def _mirror_for_antithetic(values: np.ndarray, num_paths: int, sampling: str) -> np.ndarray:
+    """Repeats the first half of a chunk's paths in the second half so antithetic pairs share them."""
+    if sampling != "antithetic":
+        return values
+    half = values[:, :(num_paths + 1) // 2]
+    return np.concatenate([half, half], axis=1)[:, :num_paths]
+
+class StudentTReturns:
+    """
+    Fat-tailed monthly returns: Student-t shocks scaled to the given mean and standard deviation.
+
+    Each shock is a normal divided by sqrt(chi-square / degrees_of_freedom) and rescaled to unit
+    variance, so the returns keep the requested volatility but put more weight on large moves.
+    """
+
+    values_per_path_month = 2
+
+    def __init__(self, monthly_mean: float, monthly_std_dev: float, degrees_of_freedom: float = 5.0,
+                 sampling: str = "standard"):
+        validate_sampling(sampling)
+        if degrees_of_freedom <= 2:
+            raise ValueError("Degrees of freedom must be greater than 2 for a finite variance.")
+        self.monthly_mean = monthly_mean
+        self.monthly_std_dev = monthly_std_dev
+        self.degrees_of_freedom = float(degrees_of_freedom)
+        self.sampling = sampling
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        growth_factors = draw_standard_normals(rng, (num_months, num_paths), self.sampling)
+        # Antithetic pairs share the chi-square draw so the mirrored shocks stay mirrored.
+        scale = _mirror_for_antithetic(rng.chisquare(self.degrees_of_freedom, (num_months, num_paths)),
+                                       num_paths, self.sampling)
+        # z * sqrt(df / W) has variance df / (df - 2); fold the unit-variance rescaling in.
+        np.divide(self.degrees_of_freedom - 2.0, scale, out=scale)
+        np.sqrt(scale, out=scale)
+        growth_factors *= scale
+        growth_factors *= self.monthly_std_dev
+        growth_factors += 1.0 + self.monthly_mean
+        return growth_factors
+
+class RegimeSwitchingReturns:
+    """
+    Normal monthly returns whose mean and volatility follow a two-state Markov chain
+    (state 0: the calm regime, state 1: the stressed regime).
+
+    Every path starts in a state drawn from the chain's stationary distribution, and the
+    state of all paths is advanced together one month at a time.
+    """
+
+    values_per_path_month = 2
+
+    def __init__(self,
+                 monthly_means: Tuple[float, float],
+                 monthly_std_devs: Tuple[float, float],
+                 switch_probabilities: Tuple[float, float],
+                 sampling: str = "standard"):
+        """
+        Args:
+            monthly_means (Tuple[float, float]): Mean monthly return in the calm and stressed regimes.
+            monthly_std_devs (Tuple[float, float]): Monthly standard deviation in each regime.
+            switch_probabilities (Tuple[float, float]): Monthly probability of moving from the calm
+                to the stressed regime, and from the stressed back to the calm one.
+        """
+        validate_sampling(sampling)
+        to_stressed, to_calm = switch_probabilities
+        if not (0 < to_stressed < 1 and 0 < to_calm < 1):
+            raise ValueError("Regime switching probabilities must be between 0 and 1.")
+        if min(monthly_std_devs) < 0:
+            raise ValueError("Regime volatilities cannot be negative.")
+        self.monthly_means = tuple(float(mean) for mean in monthly_means)
+        self.monthly_std_devs = tuple(float(std) for std in monthly_std_devs)
+        self.switch_probabilities = (float(to_stressed), float(to_calm))
+        self.sampling = sampling
+
+    @property
+    def stationary_stressed_probability(self) -> float:
+        to_stressed, to_calm = self.switch_probabilities
+        return to_stressed / (to_stressed + to_calm)
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        growth_factors = draw_standard_normals(rng, (num_months, num_paths), self.sampling)
+        uniforms = _mirror_for_antithetic(rng.random((num_months, num_paths)), num_paths, self.sampling)
+        to_stressed, to_calm = self.switch_probabilities
+        (calm_mean, stressed_mean), (calm_std, stressed_std) = self.monthly_means, self.monthly_std_devs
+
+        stressed = uniforms[0] < self.stationary_stressed_probability
+        for month, month_growth in enumerate(growth_factors):
+            if month > 0:
+                # Stressed paths stay unless they draw an exit; calm paths enter on a low draw.
+                stressed = np.where(stressed, uniforms[month] >= to_calm, uniforms[month] < to_stressed)
+            month_growth *= np.where(stressed, stressed_std, calm_std)
+            month_growth += np.where(stressed, 1.0 + stressed_mean, 1.0 + calm_mean)
+        return growth_factors
+
+class GarchReturns:
+    """
+    Monthly returns with GARCH(1,1) volatility clustering:
+
+        r_t = mean + e_t,  e_t = sqrt(h_t) * z_t,  h_t = omega + alpha * e_{t-1}^2 + beta * h_{t-1}
+
+    omega is set so the long-run variance equals monthly_std_dev squared, and every path
+    starts at that long-run variance. The recursion is vectorised across paths and only
+    loops over months.
+    """
+
+    values_per_path_month = 1
+
+    def __init__(self, monthly_mean: float, monthly_std_dev: float, alpha: float = 0.1, beta: float = 0.85,
+                 sampling: str = "standard"):
+        validate_sampling(sampling)
+        if alpha < 0 or beta < 0 or alpha + beta >= 1:
+            raise ValueError("GARCH parameters must satisfy alpha >= 0, beta >= 0 and alpha + beta < 1.")
+        self.monthly_mean = monthly_mean
+        self.monthly_std_dev = monthly_std_dev
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.omega = monthly_std_dev ** 2 * (1.0 - alpha - beta)
+        self.sampling = sampling
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        growth_factors = draw_standard_normals(rng, (num_months, num_paths), self.sampling)
+        variance = np.full(num_paths, self.monthly_std_dev ** 2)
+        scratch = np.empty(num_paths)
+        for month_growth in growth_factors:
+            # Turn this month's shocks into innovations e_t, then roll the variance forward.
+            np.sqrt(variance, out=scratch)
+            month_growth *= scratch
+            np.square(month_growth, out=scratch)
+            scratch *= self.alpha
+            variance *= self.beta
+            variance += self.omega
+            variance += scratch
+            month_growth += 1.0 + self.monthly_mean
+        return growth_factors
+
+class CorrelatedNormalReturns:
+    """
+    Correlated normal monthly asset returns combined at fixed portfolio weights.
+    """
+
+    def __init__(self,
+                 monthly_means: np.ndarray,
+                 monthly_std_devs: np.ndarray,
+                 cholesky_factor: np.ndarray,
+                 weights: np.ndarray,
+                 sampling: str = "standard"):
+        validate_sampling(sampling)
+        self.monthly_means = monthly_means
+        self.monthly_std_devs = monthly_std_devs
+        self.cholesky_factor = cholesky_factor
+        self.weights = weights
+        self.sampling = sampling
+
+    @property
+    def values_per_path_month(self) -> int:
+        return len(self.weights)
+
+    def draw_asset_returns(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        """
+        Draws correlated monthly asset returns for a chunk of paths.
+
+        Independent standard normals for every (month, path) pair are correlated with a
+        single matmul against the Cholesky factor, then scaled and shifted per asset.
+
+        Returns:
+            np.ndarray: Array of shape (num_months, num_paths, num_assets).
+        """
+        num_assets = self.cholesky_factor.shape[0]
+        shocks = draw_standard_normals(rng, (num_months, num_paths, num_assets), self.sampling)
+        asset_returns = shocks.reshape(num_months * num_paths, num_assets) @ self.cholesky_factor.T
+        asset_returns *= self.monthly_std_devs
+        asset_returns += self.monthly_means
+        return asset_returns.reshape(num_months, num_paths, num_assets)
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        # Fixed weights, i.e. the portfolio is rebalanced back to target every month.
+        growth_factors = self.draw_asset_returns(rng, num_months, num_paths) @ self.weights
+        growth_factors += 1.0
+        return growth_factors
+
+class RebalancedPortfolioReturns(CorrelatedNormalReturns):
+    """
+    Correlated normal asset returns for a portfolio that drifts between rebalances and
+    pays proportional transaction costs when it trades back to its target weights.
+
+    Each month every path's holdings grow with its asset returns; paths then rebalance if
+    the month is on the schedule or (with a threshold) if any weight has drifted too far
+    from target, paying transaction_cost times the value traded. The contribution is
+    invested at the target weights afterwards. Holdings for all paths of a chunk are kept
+    in one (num_paths, num_assets) array and triggers are boolean masks over it, so the
+    only Python-level loop is over months. The output is the portfolio's monthly growth
+    factor net of costs, which _simulate_paths turns back into the same portfolio values.
+    """
+
+    def __init__(self,
+                 monthly_means: np.ndarray,
+                 monthly_std_devs: np.ndarray,
+                 cholesky_factor: np.ndarray,
+                 weights: np.ndarray,
+                 initial_investment: float,
+                 monthly_contribution: float,
+                 rebalance_months: Optional[int] = 1,
+                 rebalance_threshold: Optional[float] = None,
+                 transaction_cost: float = 0.0,
+                 sampling: str = "standard"):
+        """
+        Args:
+            initial_investment (float): Starting portfolio value. Drift depends on how large
+                the contributions are relative to the holdings, so both are part of the model.
+            monthly_contribution (float): Amount invested at the target weights every month.
+            rebalance_months (Optional[int]): Months between scheduled rebalances (1 is monthly,
+                12 annual); None never rebalances on a schedule.
+            rebalance_threshold (Optional[float]): Rebalance a path whenever any asset's weight is
+                more than this far from its target (e.g. 0.05 for 5 percentage points).
+            transaction_cost (float): Cost per unit of value traded (e.g. 0.001 for 10 bps).
+        """
+        super().__init__(monthly_means, monthly_std_devs, cholesky_factor, weights, sampling=sampling)
+        if rebalance_months is not None and (not isinstance(rebalance_months, int) or rebalance_months <= 0):
+            raise ValueError("Rebalance interval must be a positive number of months.")
+        if rebalance_threshold is not None and not 0 < rebalance_threshold < 1:
+            raise ValueError("Rebalance threshold must be between 0 and 1.")
+        if not 0 <= transaction_cost < 1:
+            raise ValueError("Transaction cost must be between 0 and 1.")
+        self.initial_investment = float(initial_investment)
+        self.monthly_contribution = float(monthly_contribution)
+        self.rebalance_months = rebalance_months
+        self.rebalance_threshold = rebalance_threshold
+        self.transaction_cost = float(transaction_cost)
+
+    @property
+    def values_per_path_month(self) -> int:
+        # Shocks, the asset-major growth block and the portfolio growth factors.
+        return 2 * len(self.weights) + 1
+
+    def draw_asset_growth(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        """
+        Draws the same correlated returns as draw_asset_returns, as 1 + return, laid out
+        asset-major: (num_months, num_assets, num_paths). Each month's holdings update and
+        the reductions across assets then run over contiguous rows of paths.
+        """
+        shocks = draw_standard_normals(rng, (num_months, num_paths, len(self.weights)), self.sampling)
+        asset_growth = np.matmul(self.cholesky_factor, shocks.transpose(0, 2, 1))
+        asset_growth *= self.monthly_std_devs[:, None]
+        asset_growth += 1.0 + self.monthly_means[:, None]
+        return asset_growth
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        asset_growth = self.draw_asset_growth(rng, num_months, num_paths)
+        growth_factors = np.empty((num_months, num_paths))
+        weights = self.weights[:, None]
+
+        holdings = np.tile(self.initial_investment * weights, (1, num_paths))
+        previous_value = np.full(num_paths, self.initial_investment)
+        contribution = self.monthly_contribution * weights
+        value = np.empty(num_paths)
+        trades = np.empty_like(holdings)
+        rebalance = np.empty(num_paths, dtype=bool)
+        checks_drift = self.rebalance_threshold is not None
+        scheduled = np.zeros(num_months, dtype=bool)
+        if self.rebalance_months is not None:
+            scheduled[self.rebalance_months - 1::self.rebalance_months] = True
+
+        for month, month_growth in enumerate(asset_growth):
+            holdings *= month_growth
+            np.sum(holdings, axis=0, out=value)
+
+            if scheduled[month] or checks_drift:
+                # Distance of every holding from its target, in dollars.
+                np.multiply(weights, value, out=trades)
+                np.subtract(holdings, trades, out=trades)
+                np.abs(trades, out=trades)
+                if scheduled[month]:
+                    rebalance.fill(True)
+                else:
+                    # |h / V - w| > threshold for some asset, without dividing by V.
+                    np.greater(trades.max(axis=0), self.rebalance_threshold * value, out=rebalance)
+                if rebalance.any():
+                    if self.transaction_cost > 0:
+                        value -= np.where(rebalance, self.transaction_cost * trades.sum(axis=0), 0.0)
+                    np.copyto(holdings, weights * value, where=rebalance)
+
+            # A path with nothing invested yet grows at the target-weighted return.
+            np.matmul(self.weights, month_growth, out=growth_factors[month])
+            np.divide(value, previous_value, out=growth_factors[month], where=previous_value > 0)
+            holdings += contribution
+            np.add(value, self.monthly_contribution, out=previous_value)
+        return growth_factors
+
+class PathStrategyReturns:
+    """
+    Normal returns of a risky sleeve run through a PathStrategy's month-by-month rules
+    (drawdown de-risking, balance-dependent glide paths, withdrawal guardrails).
+
+    Those rules depend on each path's running balance, so they cannot be vectorised across
+    months; path_kernels applies them with a compiled Numba kernel, or with the NumPy engine
+    when Numba is not installed. The kernel is single-threaded: paths are parallelised by
+    spreading chunks over the simulator's worker processes. As with RebalancedPortfolioReturns
+    the output is the portfolio's net monthly growth factor.
+    """
+
+    # Shocks (turned into risky growth in place) and the net growth factors.
+    values_per_path_month = 2
+
+    def __init__(self,
+                 monthly_mean: float,
+                 monthly_std_dev: float,
+                 strategy: PathStrategy,
+                 initial_investment: float,
+                 monthly_contribution: float,
+                 sampling: str = "standard",
+                 engine: str = "auto"):
+        """
+        Args:
+            monthly_mean (float): Mean monthly return of the risky sleeve.
+            monthly_std_dev (float): Standard deviation of the risky sleeve's monthly return.
+            strategy (PathStrategy): Rules applied to every path.
+            initial_investment (float): Starting balance, which the rules depend on.
+            monthly_contribution (float): Amount added to every path each month.
+            engine (str): "numba", "numpy", or "auto" (Numba when installed).
+        """
+        validate_sampling(sampling)
+        strategy.validate()
+        self.monthly_mean = monthly_mean
+        self.monthly_std_dev = monthly_std_dev
+        self.strategy = strategy
+        self.initial_investment = float(initial_investment)
+        self.monthly_contribution = float(monthly_contribution)
+        self.sampling = sampling
+        self.engine = resolve_engine(engine)
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        risky_growth = draw_standard_normals(rng, (num_months, num_paths), self.sampling)
+        risky_growth *= self.monthly_std_dev
+        risky_growth += 1.0 + self.monthly_mean
+        return strategy_growth_factors(risky_growth, self.initial_investment, self.monthly_contribution,
+                                       self.strategy, self.engine)
+
+class BlockBootstrapReturns:
+    """
+    Monthly returns resampled from a historical return series with the stationary
+    (Politis-Romano) block bootstrap.
+
+    Each path walks through the history in blocks of consecutive periods whose lengths
+    are geometric with the given mean, starting each block at a uniformly random period
+    and wrapping around at the end, so volatility clustering and fat tails of the
+    history carry over into the simulated paths. Indices for a whole chunk are built
+    with vectorised index arithmetic and the returns gathered in one fancy-indexing step.
+    """
+
+    def __init__(self, historical_returns: np.ndarray, mean_block_length: float, periods_per_month: int = 1):
+        """
+        Args:
+            historical_returns (np.ndarray): 1-D array of simple returns per period, oldest first.
+            mean_block_length (float): Average block length, in periods.
+            periods_per_month (int): Historical periods compounded into one simulated month
+                (1 for monthly history, ~21 for daily).
+        """
+        historical_returns = np.asarray(historical_returns, dtype=np.float32)
+        if historical_returns.ndim != 1 or len(historical_returns) < 2:
+            raise ValueError("Historical returns must be a 1-D series of at least 2 periods.")
+        if not np.all(np.isfinite(historical_returns)) or np.any(historical_returns <= -1):
+            raise ValueError("Historical returns must be finite and greater than -100%.")
+        if mean_block_length < 1:
+            raise ValueError("Mean block length must be at least one period.")
+        if not isinstance(periods_per_month, int) or periods_per_month <= 0:
+            raise ValueError("Periods per month must be a positive integer.")
+        self.historical_returns = historical_returns
+        self.mean_block_length = float(mean_block_length)
+        self.periods_per_month = periods_per_month
+
+    @property
+    def values_per_path_month(self) -> int:
+        # Uniform draws, block-start steps, start positions, indices and gathered returns per period.
+        return 5 * self.periods_per_month
+
+    def draw_indices(self, rng: np.random.Generator, num_steps: int, num_paths: int) -> np.ndarray:
+        """
+        Draws stationary-bootstrap positions into the history.
+
+        Returns:
+            np.ndarray: Integer array of shape (num_steps, num_paths).
+        """
+        num_periods = len(self.historical_returns)
+        new_block = rng.random((num_steps, num_paths)) < 1.0 / self.mean_block_length
+        new_block[0] = True
+
+        # Step at which each (step, path)'s current block began: a running maximum of the
+        # block-start steps down the time axis.
+        steps = np.arange(num_steps)[:, None]
+        block_start = np.where(new_block, steps, 0)
+        np.maximum.accumulate(block_start, axis=0, out=block_start)
+
+        start_positions = np.zeros((num_steps, num_paths), dtype=np.int64)
+        start_positions[new_block] = rng.integers(0, num_periods, size=int(new_block.sum()))
+
+        indices = start_positions[block_start, np.arange(num_paths)]
+        indices += steps - block_start
+        indices %= num_periods
+        return indices
+
+    def draw_growth_factors(self, rng: np.random.Generator, num_months: int, num_paths: int) -> np.ndarray:
+        indices = self.draw_indices(rng, num_months * self.periods_per_month, num_paths)
+        growth_factors = self.historical_returns[indices].astype(np.float64)
+        growth_factors += 1.0
+        if self.periods_per_month > 1:
+            growth_factors = growth_factors.reshape(num_months, self.periods_per_month, num_paths).prod(axis=1)
+        return growth_factors
+
+def create_return_model(name: str, monthly_mean: float, monthly_std_dev: float, sampling: str = "standard",
+                        **options: Any) -> Any:
+    """
+    Builds a single-asset return model from its name and monthly mean/standard deviation.
+
+    Args:
+        name (str): One of RETURN_MODELS.
+        monthly_mean (float): Mean monthly return (of the calm regime for "regime_switching").
+        monthly_std_dev (float): Monthly standard deviation (long-run for "garch"; of the calm
+            regime for "regime_switching").
+        sampling (str): One of SAMPLING_METHODS.
+        **options: Model parameters: degrees_of_freedom ("student_t"); stressed_monthly_mean,
+            stressed_monthly_std_dev, to_stressed_probability and to_calm_probability
+            ("regime_switching"); alpha and beta ("garch"). Omitted ones take their defaults;
+            options the model does not take raise a ValueError.
+    """
+    if name not in RETURN_MODELS:
+        raise ValueError(f"Return model must be one of: {', '.join(RETURN_MODELS)}.")
+    unexpected = sorted(set(options) - set(RETURN_MODEL_OPTIONS[name]))
+    if unexpected:
+        raise ValueError(f"Unexpected options for the {name} return model: {', '.join(unexpected)}.")
+    if name == "normal":
+        return NormalReturns(monthly_mean, monthly_std_dev, sampling=sampling)
+    if name == "student_t":
+        return StudentTReturns(monthly_mean, monthly_std_dev, options.get("degrees_of_freedom", 5.0), sampling=sampling)
+    if name == "regime_switching":
+        return RegimeSwitchingReturns(
+            (monthly_mean, options.get("stressed_monthly_mean", -0.15 / 12)),
+            (monthly_std_dev, options.get("stressed_monthly_std_dev", 0.30 / np.sqrt(12))),
+            (options.get("to_stressed_probability", 0.02), options.get("to_calm_probability", 0.10)),
+            sampling=sampling,
+        )
+    return GarchReturns(monthly_mean, monthly_std_dev, options.get("alpha", 0.1), options.get("beta", 0.85),
+                        sampling=sampling)
@@ -1,14 +1,17 @@
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass, field
+import json
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from dataclasses import dataclass, field, replace, asdict
 import numpy as np
 import pandas as pd
-import requests
 from sklearn.linear_model import LinearRegression
 
+from .macro_indicators import MacroIndicatorStore, fetch_world_bank_indicators
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class RiskFactors:
     income: float = 0.0
     expenses: float = 0.0
@@ -30,6 +33,161 @@ class RiskFactors:
     marital_status: str = "single"
     region: str = "us"
 
+# Normalised features in _normalize_data order; the columns of batch feature matrices.
+FEATURES = (
+    'income', 'expenses', 'assets', 'liabilities', 'credit_score', 'investment_experience',
+    'risk_tolerance', 'market_volatility', 'industry_risk', 'economic_outlook', 'age', 'dependents',
+    'is_immigrant', 'is_retired', 'employment_status_score', 'education_level_score',
+    'marital_status_score', 'region_modifier'
+)
+
+# RiskFactors fields whose feature is min(value / divisor, cap) -> (divisor, cap), as in _normalize_data.
+NUMERIC_FEATURES = {
+    'income': (100000, 1.0),
+    'expenses': (100000, 1.0),
+    'assets': (1000000, 1.0),
+    'liabilities': (1000000, 1.0),
+    'credit_score': (850, np.inf),
+    'investment_experience': (20, 1.0),
+    'risk_tolerance': (10, np.inf),
+    'market_volatility': (100, np.inf),
+    'industry_risk': (100, np.inf),
+    'economic_outlook': (100, np.inf),
+    'age': (100, 1.0),
+    'dependents': (10, 1.0),
+}
+FLAG_FEATURES = ('is_immigrant', 'is_retired')
+# Text accepted for flags in DataFrame columns (e.g. read from CSV), compared lower-cased.
+TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+FALSE_VALUES = {"false", "0", "no", "n", "f"}
+
+EMPLOYMENT_SCORES = {
+    'employed': 1.0,
+    'self-employed': 0.8,
+    'student': 0.5,
+    'retired': 0.3,
+    'unemployed': 0.0
+}
+EDUCATION_SCORES = {
+    'high_school': 0.4,
+    'associate': 0.5,
+    'bachelor': 0.7,
+    'master': 0.85,
+    'doctorate': 1.0
+}
+MARITAL_SCORES = {
+    'single': 0.5,
+    'married': 0.7,
+    'divorced': 0.4,
+    'widowed': 0.6
+}
+UNKNOWN_CATEGORY_SCORE = 0.5
+
+# Stocks/bonds/cash percentages recommended for each classification; riskier profiles hold less equity.
+RECOMMENDED_ALLOCATIONS = {
+    "High Risk": {"stocks": 30, "bonds": 50, "cash": 20},
+    "Moderate Risk": {"stocks": 60, "bonds": 30, "cash": 10},
+    "Low Risk": {"stocks": 80, "bonds": 15, "cash": 5},
+}
+# Categorical RiskFactors fields -> (feature, category scores), in FEATURES order.
+CATEGORY_FEATURES = {
+    'employment_status': ('employment_status_score', EMPLOYMENT_SCORES),
+    'education_level': ('education_level_score', EDUCATION_SCORES),
+    'marital_status': ('marital_status_score', MARITAL_SCORES),
+}
+
+def _round_like_builtin(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    np.round, except that values whose scaled form lands on (or within a hair of) a .5 tie
+    are redone with the builtin round(), which decides ties on the exact binary value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_tie)):
+        rounded[index] = round(float(values[index]), digits)
+    return rounded
+
+class WeightTable(dict):
+    """Feature -> weight dict that counts its edits, so a compiled model can tell it is stale."""
+    __slots__ = ('version',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+def _counts_edit(method):
+    def edit(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.version += 1
+        return result
+    edit.__name__ = method.__name__
+    return edit
+
+for _name in ('__setitem__', '__delitem__', '__ior__', 'update', 'pop', 'popitem', 'clear', 'setdefault'):
+    setattr(WeightTable, _name, _counts_edit(getattr(dict, _name)))
+
+class CompiledRiskModel:
+    """
+    A set of engine weights frozen for scoring: a read-only coefficient vector over FEATURES,
+    and a code table per categorical field (categories[name][code] scores
+    category_scores[name][code]; code -1, an unknown category, hits the table's last entry).
+
+    score() walks prebuilt (field, divisor, cap, coefficient) tuples, so scoring one
+    RiskFactors builds no dicts. Terms are added in FEATURES order, the order of the default
+    weights, so scores match the engine's per-feature sum exactly.
+    """
+    __slots__ = ('weights', 'coefficients', 'categories', 'category_scores', '_numeric_terms', '_flag_terms',
+                 '_category_terms', '_region_coefficient', '_region_modifier')
+
+    def __init__(self, weights: Dict[str, float], region_modifier: Callable[[str], float]):
+        """
+        Args:
+            weights (Dict[str, float]): Feature -> weight; features without one weigh 0.
+            region_modifier (Callable[[str], float]): Region -> region_modifier feature value.
+        """
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown risk features in weights: {', '.join(sorted(unknown))}.")
+        self.weights = dict(weights)
+        self.coefficients = np.array([weights.get(name, 0) for name in FEATURES], dtype=np.float64)
+        self.coefficients.setflags(write=False)
+        coefficient = dict(zip(FEATURES, self.coefficients.tolist()))
+        self._numeric_terms = tuple((name, divisor, cap, coefficient[name])
+                                    for name, (divisor, cap) in NUMERIC_FEATURES.items())
+        self._flag_terms = tuple((name, coefficient[name]) for name in FLAG_FEATURES)
+        self._category_terms = tuple((name, scores, coefficient[feature])
+                                     for name, (feature, scores) in CATEGORY_FEATURES.items())
+        self.categories = {name: pd.Index(list(scores)) for name, (_, scores) in CATEGORY_FEATURES.items()}
+        self.category_scores = {name: np.array([*scores.values(), UNKNOWN_CATEGORY_SCORE])
+                                for name, (_, scores) in CATEGORY_FEATURES.items()}
+        self._region_coefficient = coefficient['region_modifier']
+        self._region_modifier = region_modifier
+
+    def score(self, data: RiskFactors) -> float:
+        total = 0.0
+        for name, divisor, cap, coefficient in self._numeric_terms:
+            total += min(getattr(data, name) / divisor, cap) * coefficient
+        for name, coefficient in self._flag_terms:
+            total += (1.0 if getattr(data, name) else 0.0) * coefficient
+        for name, scores, coefficient in self._category_terms:
+            total += scores.get(getattr(data, name), UNKNOWN_CATEGORY_SCORE) * coefficient
+        return total + self._region_modifier(data.region) * self._region_coefficient
+
+    def normalize(self, data: RiskFactors) -> np.ndarray:
+        """The normalised features of one RiskFactors, in FEATURES order."""
+        values = [min(getattr(data, name) / divisor, cap) for name, divisor, cap, _ in self._numeric_terms]
+        values += [1.0 if getattr(data, name) else 0.0 for name, _ in self._flag_terms]
+        values += [scores.get(getattr(data, name), UNKNOWN_CATEGORY_SCORE) for name, scores, _ in self._category_terms]
+        values.append(self._region_modifier(data.region))
+        return np.array(values)
+
+    def category_codes(self, name: str, values: Any) -> np.ndarray:
+        """Code-table index of each value of a categorical field, -1 for unknown categories."""
+        return self.categories[name].get_indexer(values)
+
 @dataclass
 class RiskAssessmentEngine:
     weights: Dict[str, float] = field(default_factory=lambda: {
@@ -52,39 +210,45 @@ class RiskAssessmentEngine:
         'marital_status_score': 0.05,
         'region_modifier': 0.1
     })
+    # GDP/inflation per region served from memory; scoring never calls the World Bank API itself.
+    macro_indicators: MacroIndicatorStore = field(default_factory=MacroIndicatorStore, repr=False, compare=False)
+    _compiled: Optional[CompiledRiskModel] = field(default=None, init=False, repr=False, compare=False)
+    # The WeightTable, and its version, that _compiled was built from.
+    _compiled_weights: Optional[WeightTable] = field(default=None, init=False, repr=False, compare=False)
+    _compiled_version: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Weights are kept in a WeightTable however they are assigned, so in-place edits are seen.
+        if name == 'weights' and not isinstance(value, WeightTable):
+            value = WeightTable(value)
+        super().__setattr__(name, value)
+
+    def compiled(self) -> CompiledRiskModel:
+        """The compiled form of the current weights, rebuilt once weights has been edited or replaced."""
+        weights = self.weights
+        if self._compiled_weights is not weights or self._compiled_version != weights.version:
+            self._compiled = CompiledRiskModel(weights, self.compute_region_modifier)
+            self._compiled_weights, self._compiled_version = weights, weights.version
+        return self._compiled
 
     def fetch_gdp_and_inflation(self, region_code: str) -> Dict[str, float]:
-        base_url = "https://api.worldbank.org/v2/country/{}/indicator/{}?format=json"
-        indicators = {
-            'gdp': 'NY.GDP.MKTP.CD',
-            'inflation': 'FP.CPI.TOTL.ZG'
-        }
-        results = {}
-        for key, ind in indicators.items():
-            try:
-                url = base_url.format(region_code, ind)
-                response = requests.get(url)
-                data = response.json()
-                latest = next((e for e in data[1] if e['value'] is not None), None)
-                results[key] = latest['value'] if latest else 0.0
-            except Exception as e:
-                logger.warning(f"Failed to fetch {key} for {region_code}: {e}")
-                results[key] = 0.0
-        return results
+        """Live World Bank lookup (with a timeout); zeros when it fails. Not used while scoring."""
+        try:
+            return fetch_world_bank_indicators(region_code)
+        except Exception as e:
+            logger.warning(f"Failed to fetch macro indicators for {region_code}: {e}")
+            return {'gdp': 0.0, 'inflation': 0.0}
 
     def compute_region_modifier(self, region: str) -> float:
-        metrics = self.fetch_gdp_and_inflation(region)
+        metrics = self.macro_indicators.get(region)
         gdp = metrics.get('gdp', 0)
         inflation = metrics.get('inflation', 0)
         gdp_score = min(gdp / 1e13, 0.1)
         inflation_penalty = max(min(inflation / 10, 0.1), 0)
         return max(min(1.0 + gdp_score - inflation_penalty, 1.2), 0.7)
 
-    def score(self, data: RiskFactors, explain: bool = False) -> float:
-        normalized = self._normalize_data(data)
-        weighted_factors = {k: normalized[k] * self.weights.get(k, 0) for k in self.weights}
-        score = sum(weighted_factors.values())
-        return score
+    def score(self, data: RiskFactors) -> float:
+        return self.compiled().score(data)
 
     def classify(self, score: float) -> str:
         if score < 0.3:
@@ -93,6 +257,19 @@ class RiskAssessmentEngine:
             return "Moderate Risk"
         return "Low Risk"
 
+    def recommended_allocation(self, classification: str) -> Dict[str, int]:
+        return dict(RECOMMENDED_ALLOCATIONS[classification])
+
+    def assess_risk(self, data: RiskFactors) -> Dict[str, Any]:
+        """Score, classification and recommended allocation: the /assess-risk response."""
+        score = self.score(data)
+        classification = self.classify(score)
+        return {
+            "risk_score": round(score, 2),
+            "risk_label": classification,
+            "recommended_allocation": self.recommended_allocation(classification),
+        }
+
     def _normalize_data(self, data: RiskFactors) -> Dict[str, float]:
         return {
             'income': min(data.income / 100000, 1.0),
@@ -116,33 +293,13 @@ class RiskAssessmentEngine:
         }
 
     def _employment_score(self, status: str) -> float:
-        mapping = {
-            'employed': 1.0,
-            'self-employed': 0.8,
-            'student': 0.5,
-            'retired': 0.3,
-            'unemployed': 0.0
-        }
-        return mapping.get(status, 0.5)
+        return EMPLOYMENT_SCORES.get(status, UNKNOWN_CATEGORY_SCORE)
 
     def _education_score(self, level: str) -> float:
-        mapping = {
-            'high_school': 0.4,
-            'associate': 0.5,
-            'bachelor': 0.7,
-            'master': 0.85,
-            'doctorate': 1.0
-        }
-        return mapping.get(level, 0.5)
+        return EDUCATION_SCORES.get(level, UNKNOWN_CATEGORY_SCORE)
 
     def _marital_score(self, status: str) -> float:
-        mapping = {
-            'single': 0.5,
-            'married': 0.7,
-            'divorced': 0.4,
-            'widowed': 0.6
-        }
-        return mapping.get(status, 0.5)
+        return MARITAL_SCORES.get(status, UNKNOWN_CATEGORY_SCORE)
 
     def from_dict(self, input_dict: Dict[str, Any]) -> RiskFactors:
         return RiskFactors(**input_dict)
@@ -170,40 +327,144 @@ class RiskAssessmentEngine:
             pd.DataFrame([result]).to_csv(filepath, index=False)
 
     def profile(self, data: RiskFactors) -> Dict[str, Any]:
-        normalized = self._normalize_data(data)
-        weighted = {k: round(normalized[k] * self.weights.get(k, 0), 4) for k in self.weights}
+        model = self.compiled()
+        weighted = {name: round(value * coefficient, 4)
+                    for name, value, coefficient in zip(FEATURES, model.normalize(data).tolist(), model.coefficients.tolist())}
         score = sum(weighted.values())
         return {
             "score": round(score, 2),
             "classification": self.classify(score),
             "contributions": weighted,
-            "raw_input": data.__dict__,
+            "raw_input": asdict(data),
         }
 
+    def _normalize_columns(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        _normalize_data over whole columns: one row per DataFrame row, one column per FEATURES
+        entry. Missing columns take the RiskFactors defaults; categories are scored through the
+        compiled code tables, and regions once per distinct value.
+        """
+        unknown = set(df.columns) - set(RiskFactors.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown risk factor columns: {', '.join(sorted(unknown))}.")
+        defaults = RiskFactors()
+
+        def numeric(name: str) -> np.ndarray:
+            if name not in df:
+                return np.full(len(df), float(getattr(defaults, name)))
+            return df[name].to_numpy(dtype=np.float64)
+
+        def flag(name: str) -> np.ndarray:
+            if name not in df:
+                return np.full(len(df), 1.0 if getattr(defaults, name) else 0.0)
+            column = df[name]
+            if pd.api.types.is_bool_dtype(column) or pd.api.types.is_numeric_dtype(column):
+                values = column.to_numpy(dtype=np.float64)
+                if np.isnan(values).any():
+                    raise ValueError(f"{name} has missing values.")
+                return (values != 0).astype(np.float64)
+            # Text such as "False" or "0" is truthy as a Python string, so it is parsed instead.
+            text = column.astype(str).str.strip().str.lower()
+            truthy, falsy = text.isin(TRUE_VALUES), text.isin(FALSE_VALUES)
+            if not (truthy | falsy).all():
+                raise ValueError(f"{name} must be true or false, got {column[~(truthy | falsy)].iloc[0]!r}.")
+            return truthy.to_numpy(dtype=np.float64)
+
+        def lookup(name: str, score) -> np.ndarray:
+            if name not in df:
+                return np.full(len(df), score(getattr(defaults, name)))
+            codes, categories = pd.factorize(df[name], use_na_sentinel=False)
+            return np.array([score(category) for category in categories], dtype=np.float64)[codes]
+
+        features = np.empty((len(df), len(FEATURES)))
+        for name, (divisor, cap) in NUMERIC_FEATURES.items():
+            features[:, FEATURES.index(name)] = np.minimum(numeric(name) / divisor, cap)
+        for name in FLAG_FEATURES:
+            features[:, FEATURES.index(name)] = flag(name)
+        model = self.compiled()
+        for name, (feature, _) in CATEGORY_FEATURES.items():
+            values = df[name] if name in df else [getattr(defaults, name)] * len(df)
+            features[:, FEATURES.index(feature)] = model.category_scores[name][model.category_codes(name, values)]
+        features[:, FEATURES.index('region_modifier')] = lookup('region', self.compute_region_modifier)
+        return features
+
     def batch_score(self, df: pd.DataFrame) -> pd.DataFrame:
-        results = []
-        for _, row in df.iterrows():
-            rf = self.from_dict(row.to_dict())
-            profile = self.profile(rf)
-            results.append(profile)
-        return pd.DataFrame(results)
+        """
+        Scores every row of a DataFrame with RiskFactors columns, using whole-column operations.
+
+        Returns:
+            pd.DataFrame: Same index as df, with 'score' and 'classification' exactly as profile()
+                gives them, and each factor's weighted contribution in a 'contribution_<factor>' column.
+
+        Changed from the row-by-row version, which returned one row per profile() dict: the
+        'contributions' dict column is now flat contribution_<factor> columns, 'raw_input' is
+        gone (it was df's own row), and the index is df's rather than a fresh RangeIndex.
+        """
+        contributions = _round_like_builtin(self._normalize_columns(df) * self.compiled().coefficients, 4)
+        # profile() adds the rounded contributions left to right; doing the same keeps scores identical.
+        total = np.zeros(len(df))
+        for column in contributions.T:
+            total += column
+        result = pd.DataFrame(contributions, index=df.index, columns=[f"contribution_{name}" for name in FEATURES])
+        result.insert(0, "score", _round_like_builtin(total, 2))
+        result.insert(1, "classification", np.where(total < 0.3, "High Risk", np.where(total < 0.6, "Moderate Risk", "Low Risk")))
+        return result
+
+    @staticmethod
+    def _perturbation_matrix(base: np.ndarray, perturbed: np.ndarray) -> np.ndarray:
+        """
+        Stacks one copy of the normalised features per RiskFactors field, with that field's
+        feature (if it has one) taken from the perturbed normalisation.
+
+        Args:
+            base (np.ndarray): (..., features) normalised features of the unchanged input.
+            perturbed (np.ndarray): Same shape, normalised with every field perturbed at once.
+
+        Returns:
+            np.ndarray: (..., fields, features).
+        """
+        fields = list(RiskFactors.__dataclass_fields__)
+        rows = [i for i, name in enumerate(fields) if name in FEATURES]
+        columns = [FEATURES.index(fields[i]) for i in rows]
+        matrix = np.repeat(base[..., None, :], len(fields), axis=-2)
+        matrix[..., rows, columns] = perturbed[..., columns]
+        return matrix
 
     def sensitivity_analysis(self, data: RiskFactors) -> Dict[str, float]:
-        baseline = self.score(data)
-        analysis = {}
-        for field in data.__dataclass_fields__:
-            original = getattr(data, field)
-            try:
-                if isinstance(original, bool):
-                    setattr(data, field, not original)
-                elif isinstance(original, (int, float)):
-                    setattr(data, field, original * 1.1)
-                score = self.score(data)
-                analysis[field] = round(score - baseline, 4)
-                setattr(data, field, original)
-            except Exception:
-                setattr(data, field, original)
-        return analysis
+        """
+        Score change when each field alone is perturbed: numeric fields scaled by 1.1, flags
+        flipped; text fields report 0.
+
+        The input is normalised twice (as given, and with every field perturbed), and the
+        per-field scores come from one matrix product, so regions are looked up only twice.
+        """
+        perturbed = replace(data,
+                            **{name: getattr(data, name) * 1.1 for name in NUMERIC_FEATURES},
+                            **{name: not getattr(data, name) for name in FLAG_FEATURES})
+        model = self.compiled()
+        base, changed = model.normalize(data), model.normalize(perturbed)
+        deltas = (self._perturbation_matrix(base, changed) - base) @ model.coefficients
+        return {name: round(float(delta), 4) for name, delta in zip(RiskFactors.__dataclass_fields__, deltas)}
+
+    def batch_sensitivity(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        sensitivity_analysis for every row of a DataFrame with RiskFactors columns.
+
+        Returns:
+            pd.DataFrame: Same index as df, one column of score deltas per RiskFactors field.
+        """
+        defaults = RiskFactors()
+        perturbed = df.assign(**{name: df[name] if name in df else getattr(defaults, name)
+                                 for name in (*NUMERIC_FEATURES, *FLAG_FEATURES)})
+        for name in NUMERIC_FEATURES:
+            perturbed[name] = perturbed[name].astype(np.float64) * 1.1
+        for name in FLAG_FEATURES:
+            perturbed[name] = ~perturbed[name].astype(bool)
+        base = self._normalize_columns(df)
+        matrix = self._perturbation_matrix(base, self._normalize_columns(perturbed))
+        deltas = (matrix - base[:, None, :]) @ self.compiled().coefficients
+        return pd.DataFrame(_round_like_builtin(deltas, 4), index=df.index,
+                            columns=list(RiskFactors.__dataclass_fields__))
 
     def auto_tune_weights(self, training_data: List[Tuple[RiskFactors, float]]) -> None:
         X = []
@@ -219,6 +480,7 @@ class RiskAssessmentEngine:
 
 if __name__ == '__main__':
     engine = RiskAssessmentEngine()
+    engine.macro_indicators.refresh(["US"])
     input_data = RiskFactors(
         income=75000, expenses=30000, assets=150000, liabilities=50000,
         credit_score=720, investment_experience=5, risk_tolerance=7,
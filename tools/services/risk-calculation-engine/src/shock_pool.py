@@ -0,0 +1,321 @@
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+
+import numpy as np
+
+# The pool is shared between unrelated processes (every uvicorn worker on the host), so
+# block claims are serialised with an advisory file lock; without fcntl it is unavailable.
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_BLOCKS = 128
+# 2**17 float32 normals (512 KB) per block; a 2048-path, 30-year chunk takes six.
+DEFAULT_BLOCK_VALUES = 2 ** 17
+
+# Block states, stored per block in the shared header. Fresh shared memory is zeroed,
+# so a newly created pool starts with every block empty and waiting to be filled.
+EMPTY, FILLING, READY, IN_USE = 0, 1, 2, 3
+
+# A block left FILLING or IN_USE this long belongs to a process that died mid-claim.
+STALE_CLAIM_SECONDS = 60.0
+# How long an attaching process waits for the creator to initialise the header.
+ATTACH_TIMEOUT_SECONDS = 1.0
+# How often refill threads look for consumed blocks when none were consumed locally.
+REFILL_POLL_SECONDS = 0.05
+
+_MAGIC = 0x53484F434B504F4C  # "SHOCKPOL"
+_HEADER_FIELDS = 4  # magic, num_blocks, block_values, cursor
+
+# Segments created by this process (or by its parent before forking it, whose resource
+# tracker a forked child shares); their tracker registration must stay in place.
+_created_segments: Set[str] = set()
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    Opens an existing segment without letting this process's resource tracker unlink it at
+    exit while other workers still use it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    memory = shared_memory.SharedMemory(name=name)
+    if name not in _created_segments:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+class SharedShockPool:
+    """
+    A host-wide pool of pre-generated standard normal shocks in shared memory.
+
+    The segment holds num_blocks blocks of block_values float32 normals plus a small
+    header with each block's state. Requests take READY blocks round-robin and copy
+    them out; a taken block is marked EMPTY and is never handed out again until a
+    refill thread has overwritten it with draws from fresh OS entropy, so two requests
+    never share draws. Seeded simulations do not use the pool, which keeps them exactly
+    reproducible. When no block is ready the caller falls back to its own generator.
+
+    The first process to open a pool name creates the segment; later ones attach to it.
+    With create=False the segment is only attached, never created.
+    """
+
+    def __init__(self,
+                 name: str,
+                 num_blocks: int = DEFAULT_POOL_BLOCKS,
+                 block_values: int = DEFAULT_BLOCK_VALUES,
+                 create: bool = True):
+        """
+        Args:
+            name (str): Shared memory segment name; processes using the same name share the pool.
+            num_blocks (int): Number of blocks in the pool.
+            block_values (int): Normals per block.
+            create (bool): Whether to create the segment if no process has.
+
+        Raises:
+            FileNotFoundError: If create is False and the segment does not exist.
+            RuntimeError: If file locking is unavailable, or an existing segment of this name
+                has a different layout.
+        """
+        if not HAS_FCNTL:
+            raise RuntimeError("The shared shock pool needs POSIX file locking (fcntl).")
+        if num_blocks <= 0 or block_values <= 0:
+            raise ValueError("Shock pool block count and size must be positive.")
+        self.name = name
+        self.num_blocks = num_blocks
+        self.block_values = block_values
+
+        header_bytes = 8 * (_HEADER_FIELDS + 2 * num_blocks)
+        size = header_bytes + 4 * num_blocks * block_values
+        self.owner = False
+        if create:
+            try:
+                self._memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+                self.owner = True
+                _created_segments.add(name)
+            except FileExistsError:
+                pass
+        if not self.owner:
+            self._memory = _attach_segment(name)
+
+        buffer = self._memory.buf
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buffer)
+        self._states = np.ndarray((num_blocks,), dtype=np.int64, buffer=buffer, offset=8 * _HEADER_FIELDS)
+        self._claimed_at = np.ndarray((num_blocks,), dtype=np.float64, buffer=buffer,
+                                      offset=8 * (_HEADER_FIELDS + num_blocks))
+        self._blocks = np.ndarray((num_blocks, block_values), dtype=np.float32, buffer=buffer, offset=header_bytes)
+
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+")
+        if self.owner:
+            with self._locked():
+                self._header[:] = (_MAGIC, num_blocks, block_values, 0)
+        else:
+            # The creator may not have written the header yet.
+            deadline = time.monotonic() + ATTACH_TIMEOUT_SECONDS
+            while self._header[0] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            if tuple(self._header[:3]) != (_MAGIC, num_blocks, block_values):
+                self._release_views()
+                self._memory.close()
+                self._lock_file.close()
+                raise RuntimeError(f"Shared shock pool '{name}' exists with a different layout.")
+
+        self.hits = 0
+        self.misses = 0
+        self._consumed = threading.Event()
+        self._stop = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # flock excludes other processes only; threads of this process share the lock file.
+        with self._thread_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _claim(self, from_state: int, to_state: int) -> Optional[int]:
+        """Moves the next block in from_state (round-robin from the cursor) to to_state."""
+        with self._locked():
+            cursor = int(self._header[3])
+            order = (np.arange(self.num_blocks) + cursor) % self.num_blocks
+            candidates = order[self._states[order] == from_state]
+            if len(candidates) == 0:
+                return None
+            index = int(candidates[0])
+            self._states[index] = to_state
+            self._claimed_at[index] = time.time()
+            self._header[3] = (index + 1) % self.num_blocks
+            return index
+
+    def _set_state(self, index: int, state: int) -> None:
+        with self._locked():
+            self._states[index] = state
+
+    def take(self, shape: Union[int, Tuple[int, ...]], fallback_rng: np.random.Generator) -> np.ndarray:
+        """
+        Returns a float64 array of standard normals of the given shape, copied out of the pool.
+
+        Each block used is consumed whole, even if only part of it was needed. Whatever the
+        pool cannot supply is drawn from fallback_rng.
+        """
+        shape = (shape,) if isinstance(shape, (int, np.integer)) else tuple(shape)
+        total = int(np.prod(shape))
+        shocks = np.empty(total)
+        filled = 0
+        while filled < total:
+            index = self._claim(READY, IN_USE)
+            if index is None:
+                shocks[filled:] = fallback_rng.standard_normal(total - filled)
+                self.misses += total - filled
+                break
+            count = min(self.block_values, total - filled)
+            shocks[filled:filled + count] = self._blocks[index, :count]
+            self._set_state(index, EMPTY)
+            self._consumed.set()
+            filled += count
+            self.hits += count
+        return shocks.reshape(shape)
+
+    def refill(self, rng: Optional[np.random.Generator] = None) -> int:
+        """Fills every EMPTY block (and reclaims stale ones); returns the number filled."""
+        rng = rng if rng is not None else np.random.default_rng()
+        with self._locked():
+            stale = (self._states != EMPTY) & (self._states != READY) \
+                & (self._claimed_at < time.time() - STALE_CLAIM_SECONDS)
+            self._states[stale] = EMPTY
+        filled = 0
+        while (index := self._claim(EMPTY, FILLING)) is not None:
+            rng.standard_normal(self.block_values, dtype=np.float32, out=self._blocks[index])
+            self._set_state(index, READY)
+            filled += 1
+        return filled
+
+    def start_refill(self) -> None:
+        """Starts a daemon thread that keeps refilling consumed blocks until close()."""
+        if self._refill_thread is not None:
+            return
+
+        def run() -> None:
+            # Fresh entropy for this process's refills, independent of every request seed.
+            rng = np.random.default_rng()
+            while not self._stop.is_set():
+                try:
+                    self.refill(rng)
+                except Exception as e:
+                    logger.warning(f"Shock pool refill failed: {e}")
+                self._consumed.wait(REFILL_POLL_SECONDS)
+                self._consumed.clear()
+
+        self._refill_thread = threading.Thread(target=run, name="shock-pool-refill", daemon=True)
+        self._refill_thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ready blocks host-wide, plus this process's pooled and fallback draw counts."""
+        draws = self.hits + self.misses
+        return {
+            "name": self.name,
+            "blocks": self.num_blocks,
+            "block_values": self.block_values,
+            "ready_blocks": int(np.count_nonzero(self._states == READY)),
+            "pooled_draws": self.hits,
+            "fallback_draws": self.misses,
+            "pooled_share": self.hits / draws if draws else 0.0,
+        }
+
+    def _release_views(self) -> None:
+        # Numpy views pin the buffer; they must go before the segment can be closed.
+        self._header = self._states = self._claimed_at = self._blocks = None
+
+    def close(self) -> None:
+        """Stops the refill thread and detaches; the creating process also removes the segment."""
+        self._stop.set()
+        self._consumed.set()
+        if self._refill_thread is not None:
+            self._refill_thread.join()
+            self._refill_thread = None
+        with _attach_lock:
+            if _attached_pools.get((self.name, self.num_blocks, self.block_values)) is self:
+                del _attached_pools[(self.name, self.num_blocks, self.block_values)]
+        self._release_views()
+        self._memory.close()
+        if self.owner:
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
+            _created_segments.discard(self.name)
+        self._lock_file.close()
+
+class PooledGenerator:
+    """
+    Stands in for an np.random.Generator: standard_normal draws come from a SharedShockPool,
+    every other draw (chi-square, uniforms, integers) from the wrapped generator.
+    """
+
+    def __init__(self, pool: SharedShockPool, rng: np.random.Generator):
+        self.pool = pool
+        self.rng = rng
+
+    def standard_normal(self, size: Union[int, Tuple[int, ...]] = 1) -> np.ndarray:
+        return self.pool.take(size, self.rng)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.rng, name)
+
+# Pools attached by name in this process (worker processes attach on first use).
+_attached_pools: Dict[Tuple[str, int, int], SharedShockPool] = {}
+_attach_lock = threading.Lock()
+
+def _fork_child() -> None:
+    """
+    A forked worker must not reuse its parent's handles: their thread locks may have been
+    held mid-fork and the inherited lock file would share the parent's flock. It reattaches
+    by name on first use instead.
+    """
+    global _attach_lock
+    _attached_pools.clear()
+    _attach_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_fork_child)
+
+def attach_shock_pool(name: str,
+                      num_blocks: int,
+                      block_values: int,
+                      create: bool = True) -> Optional[SharedShockPool]:
+    """
+    Returns this process's handle on the named pool, opening it on first use; None (the
+    caller then draws its own shocks) if it cannot be opened.
+
+    Worker processes pass create=False: if the parent has already closed and unlinked the
+    pool, a worker must not recreate it as a zeroed segment nobody would ever remove.
+    """
+    key = (name, num_blocks, block_values)
+    with _attach_lock:
+        pool = _attached_pools.get(key)
+        if pool is None:
+            try:
+                pool = SharedShockPool(name, num_blocks, block_values, create=create)
+            except FileNotFoundError:
+                if create:
+                    raise
+                logger.debug(f"Shock pool '{name}' is gone, drawing shocks per request.")
+                return None
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Shock pool '{name}' unavailable, drawing shocks per request: {e}")
+                return None
+            _attached_pools[key] = pool
+        return pool
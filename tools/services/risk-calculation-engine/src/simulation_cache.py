@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+# Redis is optional; the in-memory backend needs nothing beyond the stdlib.
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+def _round_floats(value: Any, float_precision: int) -> Any:
+    """Recursively rounds every float so near-identical requests share a key."""
+    if isinstance(value, float):
+        rounded = round(value, float_precision)
+        # Normalise -0.0 and integral floats so 7, 7.0 and 7.00001 all hash alike.
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, dict):
+        return {str(k): _round_floats(v, float_precision) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_round_floats(v, float_precision) for v in value]
+    return value
+
+def canonical_cache_key(namespace: str, payload: Dict[str, Any], float_precision: int = 4) -> str:
+    """
+    Builds a deterministic cache key for a request payload.
+
+    Args:
+        namespace (str): Distinguishes endpoints whose payloads could otherwise collide.
+        payload (Dict[str, Any]): Request fields that determine the result.
+        float_precision (int): Decimal places floats are rounded to before hashing.
+
+    Returns:
+        str: "<namespace>:<sha256 of the canonical JSON>".
+    """
+    canonical = json.dumps(_round_floats(payload, float_precision), sort_keys=True, separators=(",", ":"))
+    return f"{namespace}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+def _cache_stats(backend: str, hits: int, misses: int, size: int) -> Dict[str, Any]:
+    lookups = hits + misses
+    return {
+        "backend": backend,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "size": size,
+    }
+
+class SimulationCache:
+    """
+    In-process LRU cache with a per-entry time-to-live for simulation results.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        if max_entries <= 0 or ttl_seconds <= 0:
+            raise ValueError("Cache size and TTL must be positive.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return _cache_stats(self.backend, self.hits, self.misses, self.size())
+
+class RedisSimulationCache:
+    """
+    Redis-backed cache shared by every worker on the host; Redis handles expiry and
+    eviction (configure maxmemory-policy allkeys-lru for LRU behaviour).
+
+    Connection errors are logged and treated as cache misses so an unavailable Redis
+    never fails a simulation request. Hit/miss counters are kept per process.
+    """
+
+    backend = "redis"
+
+    def __init__(self, host: str, port: int, db: int = 0, ttl_seconds: float = 3600, key_prefix: str = "risk-engine:"):
+        if not HAS_REDIS:
+            raise ImportError("The redis package is required for the Redis simulation cache.")
+        if ttl_seconds <= 0:
+            raise ValueError("Cache TTL must be positive.")
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._client = redis.Redis(host=host, port=port, db=db, socket_timeout=0.5)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self._client.get(self.key_prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Simulation cache read failed: {e}")
+            raw = None
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            self._client.setex(self.key_prefix + key, int(self.ttl_seconds), json.dumps(value))
+        except redis.RedisError as e:
+            logger.warning(f"Simulation cache write failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match=self.key_prefix + "*"):
+                self._client.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"Simulation cache clear failed: {e}")
+
+    def size(self) -> int:
+        try:
+            return sum(1 for _ in self._client.scan_iter(match=self.key_prefix + "*"))
+        except redis.RedisError:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return _cache_stats(self.backend, self.hits, self.misses, self.size())
+
+def create_simulation_cache(settings: Any) -> Optional[Union[SimulationCache, RedisSimulationCache]]:
+    """
+    Builds the cache selected by settings.SIMULATION_CACHE_BACKEND ("memory", "redis" or "none").
+    """
+    backend = settings.SIMULATION_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        return RedisSimulationCache(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            ttl_seconds=settings.SIMULATION_CACHE_TTL_SECONDS,
+        )
+    if backend == "memory":
+        return SimulationCache(
+            max_entries=settings.SIMULATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.SIMULATION_CACHE_TTL_SECONDS,
+        )
+    raise ValueError(f"Unknown simulation cache backend: {settings.SIMULATION_CACHE_BACKEND}")
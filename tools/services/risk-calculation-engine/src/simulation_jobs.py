@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle: queued -> running -> completed | failed.
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+class JobQueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue already holds max_queued jobs."""
+
+@dataclass
+class SimulationJob:
+    job_id: str
+    kind: str
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready view of the job; the result is only included once it has completed."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class SimulationJobQueue:
+    """
+    Runs large simulations in background worker threads and keeps their results by job ID.
+
+    The request that submits a job returns immediately with the job ID; clients poll
+    get() or block in wait() until it finishes. Finished jobs are kept for
+    result_ttl_seconds and then dropped.
+
+    Workers are threads rather than processes on purpose. A job only coordinates: the
+    simulator splits it into chunk groups and runs them in its own process pool, and any
+    group it runs in-process spends its time in NumPy, which releases the GIL. Threads
+    also let a job be any callable (the API submits closures, which a process pool could
+    not pickle), and let jobs share the simulator's caches and shock pool. The event loop
+    only ever hands work over and never runs it.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 100, result_ttl_seconds: float = 3600):
+        """
+        Args:
+            max_workers (int): Jobs that run at the same time.
+            max_queued (int): Jobs allowed to wait for a worker; further submissions are refused.
+            result_ttl_seconds (float): How long a finished job's result stays retrievable.
+        """
+        if max_workers <= 0 or max_queued <= 0:
+            raise ValueError("Job workers and queue size must be positive.")
+        if result_ttl_seconds <= 0:
+            raise ValueError("Job result TTL must be positive.")
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="simulation-job")
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self._started = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _prune(self) -> None:
+        """Drops finished jobs older than the result TTL. Caller holds the lock."""
+        cutoff = time.time() - self.result_ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, kind: str, fn: Callable[..., Dict[str, Any]], *args: Any, **kwargs: Any) -> SimulationJob:
+        """
+        Queues fn(*args, **kwargs) and returns its job straight away.
+
+        Args:
+            kind (str): Label of the kind of simulation (e.g. the endpoint), reported with the job.
+            fn (Callable[..., Dict[str, Any]]): Function returning the job's JSON-ready result.
+
+        Raises:
+            JobQueueFullError: If max_queued jobs are already waiting.
+        """
+        with self._lock:
+            self._prune()
+            if self._count("queued") >= self.max_queued:
+                raise JobQueueFullError("Too many simulations are queued; try again later.")
+            job = SimulationJob(job_id=uuid.uuid4().hex, kind=kind)
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: SimulationJob, fn: Callable[..., Dict[str, Any]], args: tuple, kwargs: dict) -> None:
+        with self._lock:
+            job.status = "running"
+            job.started_at = time.time()
+            wait = job.started_at - job.submitted_at
+            self._started += 1
+            self._total_wait_seconds += wait
+            self._max_wait_seconds = max(self._max_wait_seconds, wait)
+        try:
+            result = fn(*args, **kwargs)
+            status, error = "completed", None
+        except ValueError as e:
+            result, status, error = None, "failed", str(e)
+        except Exception as e:
+            logger.exception(f"Simulation job {job.job_id} failed")
+            result, status, error = None, "failed", f"Internal server error: {e}"
+        with self._lock:
+            job.result, job.error, job.status = result, error, status
+            job.finished_at = time.time()
+            if status == "completed":
+                self.completed += 1
+            else:
+                self.failed += 1
+        job.done.set()
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[SimulationJob]:
+        """Blocks until the job finishes or the timeout passes, then returns it (None if unknown)."""
+        job = self.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+        return job
+
+    def _count(self, status: str) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs, outcome counters and how long jobs wait for a worker."""
+        with self._lock:
+            self._prune()
+            now = time.time()
+            queued = [job for job in self._jobs.values() if job.status == "queued"]
+            return {
+                "queue_depth": len(queued),
+                "running": self._count("running"),
+                "completed": self.completed,
+                "failed": self.failed,
+                "max_workers": self.max_workers,
+                "wait_seconds": {
+                    "mean": self._total_wait_seconds / self._started if self._started else 0.0,
+                    "max": self._max_wait_seconds,
+                    "oldest_queued": max((now - job.submitted_at for job in queued), default=0.0),
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,276 @@
+"""
+Precomputed simulation surface for the simulator sliders.
+
+Build it once (e.g. at deploy time) from the service directory:
+
+    python -m src.simulation_surface [--output simulation_surface.npy] [--paths 8192] [--seed 0]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .return_models import draw_standard_normals
+
+logger = logging.getLogger(__name__)
+
+# Grid axes. Returns and volatilities are annual percentages; the contribution share is the
+# fraction of the total invested (initial investment + all contributions) that is contributed.
+SURFACE_ANNUAL_RETURNS = np.arange(-4.0, 16.0 + 1e-9, 1.0)
+SURFACE_ANNUAL_VOLATILITIES = np.arange(0.0, 40.0 + 1e-9, 2.5)
+SURFACE_YEARS = np.arange(1.0, 51.0)
+# Denser near 0, where a little contribution income moves the lower percentiles most.
+SURFACE_CONTRIBUTION_SHARES = np.array([0.0, 0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+SURFACE_AXES = ("portfolio_annual_return", "portfolio_annual_volatility", "simulation_years", "contribution_share")
+
+# Statistics stored per grid point, all per unit of total invested.
+SURFACE_STATISTICS = ("mean", "std_dev", "10th", "50th", "90th")
+_PERCENTILES = (10, 50, 90)
+# Columns interpolated in log space along return, volatility and horizon (all but std_dev).
+_LOG_INTERPOLATED = [0, 2, 3, 4]
+
+DEFAULT_SURFACE_PATHS = 8192
+# Off-grid points re-simulated after the build to measure the interpolation error.
+DEFAULT_VALIDATION_POINTS = 200
+
+def _unit_statistics(growth: np.ndarray, annuity: np.ndarray, num_months: int, shares: np.ndarray) -> np.ndarray:
+    """
+    Statistics of the final value per unit invested, for every contribution share.
+
+    With per-path growth G of the initial investment and value A of contributions of 1 per
+    month, a total T split into (1 - s) T initially and s T / num_months per month ends at
+    T * ((1 - s) G + s A / num_months), so the statistics scale exactly with T.
+    """
+    values = np.outer(1.0 - shares, growth) + np.outer(shares, annuity / num_months)
+    return np.column_stack([values.mean(axis=1), values.std(axis=1), *np.percentile(values, _PERCENTILES, axis=1)])
+
+def _simulate_factors(shocks: np.ndarray, annual_return: float, annual_volatility: float,
+                      year_ends: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-path growth and annuity factors at the end of each requested month (same scaling as the simulator)."""
+    monthly_mean = annual_return / 100 / 12
+    monthly_std_dev = annual_volatility / 100 / np.sqrt(12)
+    num_paths = shocks.shape[1]
+    growth, annuity, month_growth = np.ones(num_paths), np.zeros(num_paths), np.empty(num_paths)
+    snapshots = set(year_ends)
+    growths, annuities = [], []
+    for month, month_shocks in enumerate(shocks[:max(year_ends)], start=1):
+        np.multiply(month_shocks, monthly_std_dev, out=month_growth)
+        month_growth += 1.0 + monthly_mean
+        growth *= month_growth
+        annuity *= month_growth
+        annuity += 1.0
+        if month in snapshots:
+            growths.append(growth.copy())
+            annuities.append(annuity.copy())
+    return np.array(growths), np.array(annuities)
+
+class SimulationSurface:
+    """
+    Answers simulation requests by multilinear interpolation in a precomputed grid.
+
+    For fixed shocks the final value is linear in the initial investment and the monthly
+    contribution, so the grid only has to cover return, volatility, horizon and the share
+    of the total invested that comes from contributions; the statistics of any amounts
+    are those of the grid point scaled by the total invested. The grid is a memory-mapped
+    .npy file (shared by every worker through the page cache), with its axes and the
+    measured interpolation error bound in a JSON sidecar.
+    """
+
+    def __init__(self, values: np.ndarray, axes: Sequence[np.ndarray], metadata: Dict[str, Any]):
+        """
+        Args:
+            values (np.ndarray): Array of shape (*axis lengths, len(SURFACE_STATISTICS)).
+            axes (Sequence[np.ndarray]): Increasing grid coordinates, in SURFACE_AXES order.
+            metadata (Dict[str, Any]): Build settings and 'error_bound'.
+        """
+        self.values = values
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        self.metadata = metadata
+        self.error_bound = metadata.get("error_bound")
+
+    @staticmethod
+    def metadata_path(path: str) -> str:
+        return f"{path}.json"
+
+    @classmethod
+    def load(cls, path: str) -> "SimulationSurface":
+        """Memory-maps a surface written by build_surface."""
+        with open(cls.metadata_path(path)) as f:
+            metadata = json.load(f)
+        values = np.load(path, mmap_mode="r")
+        return cls(values, [metadata["axes"][name] for name in SURFACE_AXES], metadata)
+
+    @staticmethod
+    def _position(axis: np.ndarray, value: float, name: str) -> Tuple[int, float]:
+        if not axis[0] <= value <= axis[-1]:
+            raise ValueError(f"{name} {value:g} is outside the precomputed range {axis[0]:g} to {axis[-1]:g}.")
+        if len(axis) == 1:
+            return 0, 0.0
+        index = min(int(np.searchsorted(axis, value, side="right")) - 1, len(axis) - 2)
+        return index, (value - axis[index]) / (axis[index + 1] - axis[index])
+
+    def unit_statistics(self, annual_return: float, annual_volatility: float, simulation_years: float,
+                        contribution_share: float) -> np.ndarray:
+        """
+        Interpolated SURFACE_STATISTICS per unit invested at one point of the grid's range.
+
+        The mean and percentiles move multiplicatively with return, volatility and horizon,
+        so along those axes they are interpolated in log space. Every path's value is linear
+        in the contribution share, so that axis (and the standard deviation throughout) is
+        interpolated linearly.
+        """
+        corners, weights = [], []
+        for axis, value, name in zip(self.axes, (annual_return, annual_volatility, simulation_years, contribution_share),
+                                     SURFACE_AXES):
+            index, weight = self._position(axis, value, name)
+            corners.append(slice(index, index + 2))
+            weights.append(weight)
+        block = np.array(self.values[tuple(corners)], dtype=np.float64)
+        block[..., _LOG_INTERPOLATED] = np.log(np.maximum(block[..., _LOG_INTERPOLATED], np.finfo(np.float64).tiny))
+        # Collapse one axis at a time: 16 corners, then 8, 4 and 2, and finally one vector.
+        for weight in weights[:-1]:
+            block = block[0] * (1 - weight) + block[-1] * weight
+        block[..., _LOG_INTERPOLATED] = np.exp(block[..., _LOG_INTERPOLATED])
+        return block[0] * (1 - weights[-1]) + block[-1] * weights[-1]
+
+    def query(self,
+              initial_investment: float,
+              monthly_contribution: float,
+              simulation_years: float,
+              portfolio_annual_return: float,
+              portfolio_annual_volatility: float) -> dict:
+        """
+        Returns the statistics of run_monte_carlo_simulation for these inputs from the grid.
+
+        Raises:
+            ValueError: If the amounts are negative or a coordinate lies outside the grid.
+
+        Returns:
+            dict: 'mean_final_value', 'median_final_value', 'std_dev_final_value' and
+                  'percentiles', plus 'method' ("surface") and 'error_bound', the largest
+                  relative error of the mean and percentiles measured against re-simulating
+                  off-grid points with the same shocks.
+        """
+        if initial_investment < 0 or monthly_contribution < 0:
+            raise ValueError("Initial investment and monthly contribution cannot be negative.")
+        contributed = monthly_contribution * 12 * simulation_years
+        total_invested = initial_investment + contributed
+        share = contributed / total_invested if total_invested > 0 else 0.0
+        mean, std_dev, p10, p50, p90 = total_invested * self.unit_statistics(
+            portfolio_annual_return, portfolio_annual_volatility, simulation_years, share)
+        return {
+            "mean_final_value": float(mean),
+            "median_final_value": float(p50),
+            "std_dev_final_value": float(std_dev),
+            "percentiles": {
+                "10th": float(p10),
+                "50th": float(p50),
+                "90th": float(p90)
+            },
+            "method": "surface",
+            "error_bound": self.error_bound
+        }
+
+def _measure_error_bound(surface: SimulationSurface, shocks: np.ndarray, num_points: int,
+                         rng: np.random.Generator) -> float:
+    """Largest relative error of the interpolated mean and percentiles at random off-grid points."""
+    returns, volatilities, years, shares = surface.axes
+    worst = 0.0
+    for _ in range(num_points):
+        annual_return = rng.uniform(returns[0], returns[-1])
+        annual_volatility = rng.uniform(volatilities[0], volatilities[-1])
+        num_years = int(rng.integers(years[0], years[-1] + 1))
+        share = rng.uniform(shares[0], shares[-1])
+        growth, annuity = _simulate_factors(shocks, annual_return, annual_volatility, [num_years * 12])
+        exact = _unit_statistics(growth[0], annuity[0], num_years * 12, np.array([share]))[0]
+        interpolated = surface.unit_statistics(annual_return, annual_volatility, num_years, share)
+        # Mean and percentiles only; the standard deviation can be ~0.
+        checked = _LOG_INTERPOLATED
+        worst = max(worst, float(np.max(np.abs(interpolated[checked] - exact[checked]) / exact[checked])))
+    return worst
+
+def build_surface(path: str,
+                  num_simulations: int = DEFAULT_SURFACE_PATHS,
+                  seed: Optional[int] = 0,
+                  sampling: str = "sobol",
+                  annual_returns: np.ndarray = SURFACE_ANNUAL_RETURNS,
+                  annual_volatilities: np.ndarray = SURFACE_ANNUAL_VOLATILITIES,
+                  years: np.ndarray = SURFACE_YEARS,
+                  contribution_shares: np.ndarray = SURFACE_CONTRIBUTION_SHARES,
+                  validation_points: int = DEFAULT_VALIDATION_POINTS) -> SimulationSurface:
+    """
+    Simulates every grid point and writes the surface to path (plus its JSON sidecar).
+
+    Every (return, volatility) pair is driven by the same shocks, which keeps the surface
+    smooth between grid points. Files are written under temporary names and moved into
+    place, so workers that have the previous surface mapped keep reading it safely.
+
+    Args:
+        path (str): Destination .npy file.
+        num_simulations (int): Paths per grid point.
+        seed (Optional[int]): Seed of the shared shocks.
+        sampling (str): "standard", "antithetic" or "sobol"; see run_monte_carlo_simulation.
+        validation_points (int): Off-grid points re-simulated to measure the error bound.
+
+    Returns:
+        SimulationSurface: The memory-mapped surface that was written.
+    """
+    axes = [np.asarray(axis, dtype=np.float64) for axis in (annual_returns, annual_volatilities, years,
+                                                            contribution_shares)]
+    if any(np.any(np.diff(axis) <= 0) for axis in axes):
+        raise ValueError("Surface axes must be strictly increasing.")
+    if axes[1][0] < 0 or axes[2][0] < 1 or np.any(axes[2] != np.round(axes[2])) \
+            or axes[3][0] < 0 or axes[3][-1] > 1:
+        raise ValueError("Surface volatilities must be non-negative, years whole and at least 1, shares within 0 to 1.")
+
+    started = time.perf_counter()
+    year_ends = [int(num_years) * 12 for num_years in axes[2]]
+    shocks = draw_standard_normals(np.random.default_rng(seed), (max(year_ends), num_simulations), sampling)
+
+    temporary = f"{path}.tmp.npy"
+    values = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.float64,
+                                       shape=tuple(len(axis) for axis in axes) + (len(SURFACE_STATISTICS),))
+    for i, annual_return in enumerate(axes[0]):
+        for j, annual_volatility in enumerate(axes[1]):
+            growths, annuities = _simulate_factors(shocks, annual_return, annual_volatility, year_ends)
+            for k, num_months in enumerate(year_ends):
+                values[i, j, k] = _unit_statistics(growths[k], annuities[k], num_months, axes[3])
+    values.flush()
+    del values
+
+    metadata = {
+        "axes": {name: axis.tolist() for name, axis in zip(SURFACE_AXES, axes)},
+        "statistics": list(SURFACE_STATISTICS),
+        "num_simulations": num_simulations,
+        "seed": seed,
+        "sampling": sampling,
+        "built_at": time.time(),
+    }
+    surface = SimulationSurface(np.load(temporary, mmap_mode="r"), axes, metadata)
+    metadata["error_bound"] = surface.error_bound = _measure_error_bound(
+        surface, shocks, validation_points, np.random.default_rng(None if seed is None else seed + 1))
+    metadata["build_seconds"] = time.perf_counter() - started
+
+    with open(f"{temporary}.json", "w") as f:
+        json.dump(metadata, f)
+    os.replace(temporary, path)
+    os.replace(f"{temporary}.json", SimulationSurface.metadata_path(path))
+    return SimulationSurface.load(path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute the simulation surface for the slider UI.")
+    parser.add_argument("--output", default="simulation_surface.npy")
+    parser.add_argument("--paths", type=int, default=DEFAULT_SURFACE_PATHS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    surface = build_surface(args.output, num_simulations=args.paths, seed=args.seed)
+    print(f"Wrote {args.output} {surface.values.shape} in {surface.metadata['build_seconds']:.1f}s; "
+          f"interpolation error bound {surface.error_bound:.2%}")
+
+if __name__ == "__main__":
+    main()
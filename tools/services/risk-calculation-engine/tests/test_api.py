@@ -0,0 +1,195 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from src import api
+from src.macro_indicators import MacroIndicatorStore
+from src.portfolio_simulator import PortfolioSimulator
+from src.risk_assessment_engine import RiskAssessmentEngine, RiskFactors
+from src.simulation_surface import build_surface
+
+client = TestClient(api.app)
+
+SIMULATION = {"initial_investment": 10000, "monthly_contribution": 100, "num_simulations": 2000,
+              "simulation_years": 10, "portfolio_annual_return": 7, "portfolio_annual_volatility": 15, "seed": 5}
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Uncached, and small chunks so a stream has several progress lines.
+    simulator = PortfolioSimulator(memory_budget_mb=0.2)
+    monkeypatch.setattr(api, "simulator", simulator)
+    monkeypatch.setattr(api, "simulation_cache", None)
+    yield simulator
+    simulator.close()
+
+def test_stream_ends_with_the_regular_response(small_chunks):
+    direct = client.post("/simulate-portfolio", json=SIMULATION)
+    assert direct.status_code == 200
+
+    response = client.post("/simulate-portfolio/stream", json=SIMULATION)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    progress = lines[:-1]
+    assert len(progress) >= 2 and all(line["status"] == "running" for line in progress)
+    assert [line["paths_completed"] for line in progress] == sorted(line["paths_completed"] for line in progress)
+    assert lines[-1] == direct.json()
+
+    assert client.post("/simulate-portfolio/stream", json={**SIMULATION, "num_simulations": 0}).status_code == 422
+    assert client.post("/simulate-portfolio/stream", json={**SIMULATION, "return_model": "student_t",
+                                                           "model_options": {"bogus": 1}}).status_code == 400
+
+def test_large_requests_are_queued_and_pollable(small_chunks, monkeypatch):
+    direct = client.post("/simulate-portfolio", json=SIMULATION).json()
+    monkeypatch.setattr(api.settings, "SIMULATION_JOB_THRESHOLD_PATH_MONTHS", 0)
+
+    accepted = client.post("/simulate-portfolio", json=SIMULATION)
+    assert accepted.status_code == 202
+    body = accepted.json()
+    assert body["status_url"] == f"/simulate-portfolio/jobs/{body['job_id']}"
+
+    job = client.get(body["status_url"], params={"wait": 30}).json()
+    assert job["status"] == "completed" and job["kind"] == "simulate-portfolio"
+    assert job["result"] == direct
+
+    events = [json.loads(line) for line in client.get(body["events_url"]).text.splitlines()]
+    assert events[-1]["status"] == "completed" and events[-1]["result"] == direct
+
+    metrics = client.get("/simulate-portfolio/jobs/metrics").json()
+    assert metrics["completed"] >= 1 and metrics["queue_depth"] == 0
+    assert client.get("/simulate-portfolio/jobs/not-a-job").status_code == 404
+    assert client.get("/simulate-portfolio/jobs/not-a-job/events").status_code == 404
+
+def test_surface_endpoint_picks_up_builds_and_rebuilds(tmp_path, monkeypatch):
+    path = str(tmp_path / "surface.npy")
+    monkeypatch.setattr(api.settings, "SIMULATION_SURFACE_PATH", path)
+    monkeypatch.setattr(api, "simulation_surface", None)
+    monkeypatch.setattr(api, "_simulation_surface_signature", None)
+    query = {"initial_investment": 10000, "monthly_contribution": 100, "simulation_years": 20,
+             "portfolio_annual_return": 7, "portfolio_annual_volatility": 15}
+    grid = dict(num_simulations=512, annual_returns=[6, 8], annual_volatilities=[10, 20],
+                contribution_shares=np.linspace(0, 1, 3), validation_points=2)
+
+    assert client.post("/simulate-portfolio/surface", json=query).status_code == 503
+    build_surface(path, years=[9, 10], **grid)
+    assert client.post("/simulate-portfolio/surface", json=query).status_code == 400
+    # Rebuilding with a longer horizon is served without a restart.
+    build_surface(path, years=[19, 20], **grid)
+    response = client.post("/simulate-portfolio/surface", json=query)
+    assert response.status_code == 200
+    assert response.json()["method"] == "surface"
+
+APPLICANTS = [
+    {"income": 75000, "expenses": 30000, "assets": 150000, "liabilities": 50000, "credit_score": 720,
+     "investment_experience": 5, "risk_tolerance": 7, "age": 35, "dependents": 2, "is_immigrant": True,
+     "employment_status": "employed", "education_level": "bachelor", "marital_status": "married", "region": "US"},
+    {"income": 32000, "credit_score": 610, "age": 67, "is_retired": True, "employment_status": "retired",
+     "region": "DE", "gender": "fémale"},
+    {"income": 120000, "assets": 900000, "credit_score": 800, "investment_experience": 15, "risk_tolerance": 9,
+     "marital_status": "single", "region": "ZZ"},
+]
+
+@pytest.fixture
+def risk_engine(monkeypatch):
+    indicators = {"US": {"gdp": 2.5e13, "inflation": 3.2}, "DE": {"gdp": 4.1e12, "inflation": 2.4}}
+    store = MacroIndicatorStore(fetcher=lambda region: indicators[region])
+    store.refresh(indicators)
+    engine = RiskAssessmentEngine(macro_indicators=store)
+    monkeypatch.setattr(api, "risk_engine", engine)
+    return engine
+
+def _in_pieces(text, size=7):
+    # A chunked upload whose pieces split lines (and the UTF-8 'é') at arbitrary points.
+    data = text.encode()
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def _bulk(body, **params):
+    response = client.post("/assess-risk/bulk", params=params, content=_in_pieces(body),
+                           headers={"content-type": "text/csv" if params.get("format") == "csv" else "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def _expected(engine, applicant):
+    profile = engine.profile(RiskFactors(**applicant))
+    return {"score": profile["score"], "classification": profile["classification"]}
+
+def test_bulk_assessment_scores_ndjson_in_chunks(risk_engine):
+    rows = APPLICANTS * 3
+    lines = _bulk("\n".join(json.dumps(row) for row in rows) + "\n\n", chunk_size=4)
+
+    results = [line for line in lines if "row" in line]
+    assert [line["row"] for line in results] == list(range(1, len(rows) + 1))
+    for line, applicant in zip(results, rows):
+        assert {key: line[key] for key in ("score", "classification")} == _expected(risk_engine, applicant)
+    chunks = [line for line in lines if line.get("status") == "chunk"]
+    assert [chunk["rows"] for chunk in chunks] == [4, 4, 1]
+    assert all(chunk["parse_seconds"] >= 0 and chunk["score_seconds"] >= 0 for chunk in chunks)
+    assert lines[-1]["status"] == "completed"
+    assert (lines[-1]["rows"], lines[-1]["errors"], lines[-1]["chunks"]) == (9, 0, 3)
+
+def test_bulk_assessment_scores_csv(risk_engine):
+    columns = ["income", "credit_score", "age", "is_retired", "employment_status", "region", "gender"]
+    body = ",".join(columns) + "\r\n" + "".join(
+        ",".join(str(applicant.get(column, "")).lower() if column == "is_retired" else str(applicant.get(column, ""))
+                 for column in columns) + "\r\n"
+        for applicant in APPLICANTS)
+    lines = _bulk(body, format="csv")
+
+    for line, applicant in zip(lines, APPLICANTS):
+        trimmed = {column: applicant[column] for column in columns if column in applicant}
+        assert {key: line[key] for key in ("score", "classification")} == _expected(risk_engine, trimmed)
+    assert lines[-1]["status"] == "completed" and lines[-1]["rows"] == 3
+
+    response = client.post("/assess-risk/bulk", params={"format": "csv"}, content="income,salary\n1,2\n")
+    assert response.status_code == 400 and "salary" in response.json()["detail"]
+
+def test_bulk_assessment_reports_malformed_rows_and_keeps_going(risk_engine):
+    rows = [json.dumps(APPLICANTS[0]), json.dumps(APPLICANTS[1]), '{"income": "lots"',
+            json.dumps({**APPLICANTS[2], "income": "n/a"}), json.dumps({"salary": 1}), json.dumps(APPLICANTS[2])]
+    lines = _bulk("\n".join(rows), chunk_size=3)
+
+    by_row = {line["row"]: line for line in lines if "row" in line}
+    assert "Invalid JSON" in by_row[3]["error"]
+    assert "income must be a number" in by_row[4]["error"]
+    assert "salary" in by_row[5]["error"]
+    for row, applicant in ((1, APPLICANTS[0]), (2, APPLICANTS[1]), (6, APPLICANTS[2])):
+        assert by_row[row]["score"] == _expected(risk_engine, applicant)["score"]
+    assert [line["errors"] for line in lines if line.get("status") == "chunk"] == [1, 2]
+    assert lines[-1] == {**lines[-1], "status": "completed", "rows": 6, "errors": 3}
+
+def test_assess_risk_scores_one_applicant(risk_engine):
+    applicant = {**{name: 0 for name in api.RiskAssessmentInput.model_fields}, **APPLICANTS[0],
+                 "gender": "female", "is_retired": False, "market_volatility": 20, "industry_risk": 15,
+                 "economic_outlook": 60}
+    response = client.post("/assess-risk", json=applicant)
+    assert response.status_code == 200
+    body = response.json()
+    expected = risk_engine.score(RiskFactors(**applicant))
+    assert body["risk_score"] == round(expected, 2)
+    assert body["risk_label"] == risk_engine.classify(expected)
+    assert sum(body["recommended_allocation"].values()) == 100
+
+@pytest.mark.parametrize("spec_version", ["2.0", "2.4"])
+def test_bulk_assessment_stops_when_the_client_disconnects_mid_upload(risk_engine, spec_version):
+    incoming = [{"type": "http.request", "body": (json.dumps(APPLICANTS[0]) + "\n").encode(), "more_body": True}]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0) if incoming else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0", "spec_version": spec_version}, "http_version": "1.1",
+             "method": "POST", "scheme": "http", "path": "/assess-risk/bulk", "raw_path": b"/assess-risk/bulk",
+             "root_path": "", "query_string": b"chunk_size=1", "headers": [(b"content-type", b"application/x-ndjson")],
+             "client": ("test", 1), "server": ("test", 80)}
+    asyncio.run(asyncio.wait_for(api.app(scope, receive, send), timeout=30))
+
+    assert sent[0]["status"] == 200
+    lines = [json.loads(line) for message in sent[1:] for line in message.get("body", b"").decode().splitlines()]
+    assert lines[0]["row"] == 1 and lines[0]["score"] == _expected(risk_engine, APPLICANTS[0])["score"]
+    assert all(line.get("status") != "completed" for line in lines)
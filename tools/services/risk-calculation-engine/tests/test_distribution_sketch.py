@@ -0,0 +1,38 @@
+import json
+import numpy as np
+import pytest
+from src.distribution_sketch import LogHistogram
+
+def test_merged_histograms_match_single_pass():
+    values = np.random.default_rng(0).lognormal(10, 1, size=(3, 20000))
+    whole = LogHistogram(num_series=3)
+    whole.add(values)
+    merged = LogHistogram(num_series=3)
+    for part in np.array_split(values, 4, axis=1):
+        chunk = LogHistogram(num_series=3)
+        chunk.add(part)
+        merged.merge(chunk)
+    np.testing.assert_array_equal(whole.counts, merged.counts)
+    exact = np.quantile(values, [0.1, 0.5, 0.9], axis=1)
+    np.testing.assert_allclose(merged.quantiles([0.1, 0.5, 0.9]), exact, rtol=0.01)
+
+def test_handles_values_outside_range():
+    histogram = LogHistogram(min_value=1.0, max_value=100.0)
+    histogram.add(np.array([-5.0, 0.0, 0.5, 50.0, 1e6]))
+    assert histogram.quantiles(0.0)[0, 0] == -5.0
+    assert histogram.quantiles(1.0)[0, 0] == 1e6
+
+def test_merge_rejects_mismatched_resolution():
+    with pytest.raises(ValueError):
+        LogHistogram(bins_per_decade=100).merge(LogHistogram(bins_per_decade=200))
+
+def test_serialised_histogram_round_trips_and_stays_small():
+    histogram = LogHistogram(num_series=2)
+    histogram.add(np.random.default_rng(1).lognormal(11, 0.8, size=(2, 50000)))
+    data = histogram.to_dict()
+    assert len(json.dumps(data)) < 16_000
+    restored = LogHistogram.from_dict(json.loads(json.dumps(data)))
+    np.testing.assert_array_equal(restored.counts, histogram.counts)
+    np.testing.assert_array_equal(restored.quantiles([0.1, 0.9]), histogram.quantiles([0.1, 0.9]))
+    empty = LogHistogram.from_dict(LogHistogram().to_dict())
+    assert empty.total_count[0] == 0 and empty.minimum[0] == np.inf
@@ -0,0 +1,52 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from src.historical_returns import HistoricalReturnStore
+from src.portfolio_simulator import PortfolioSimulator
+from src.return_models import BlockBootstrapReturns
+
+class FakeLoader:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = 0
+
+    async def get_data_by_date_range(self, symbol, start_date, end_date):
+        self.calls += 1
+        return [
+            {"timestamp": start_date + timedelta(days=i), "close_price": price}
+            for i, price in enumerate(self.prices[symbol])
+        ]
+
+def test_store_builds_weighted_float32_returns_once():
+    loader = FakeLoader({"A": [100.0, 110.0, 99.0, 108.9], "B": [50.0, 50.0, 55.0, 55.0]})
+    store = HistoricalReturnStore(loader)
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    returns = asyncio.run(store.get_returns({"A": 0.5, "B": 0.5}, start, end, frequency="daily"))
+    assert returns.dtype == np.float32
+    np.testing.assert_allclose(returns, [0.05, 0.0, 0.05], atol=1e-6)
+    again = asyncio.run(store.get_returns({"A": 0.5, "B": 0.5}, start, end, frequency="daily"))
+    assert again is returns
+    assert loader.calls == 2
+
+def test_store_rejects_bad_weights():
+    store = HistoricalReturnStore(FakeLoader({}))
+    with pytest.raises(ValueError):
+        asyncio.run(store.get_returns({"A": 0.7}, datetime(2024, 1, 1), datetime(2024, 2, 1)))
+
+def test_bootstrap_indices_follow_blocks_and_wrap():
+    model = BlockBootstrapReturns(np.linspace(-0.05, 0.05, 10), mean_block_length=4)
+    indices = model.draw_indices(np.random.default_rng(0), 500, 300)
+    assert indices.min() >= 0 and indices.max() < 10
+    continues = (indices[1:] - indices[:-1]) % 10 == 1
+    # Roughly 1 - 1/4 of steps continue the current block (plus chance restarts at the next index).
+    assert continues.mean() == pytest.approx(0.75 + 0.25 / 10, abs=0.01)
+
+def test_bootstrap_simulation_with_constant_history_matches_closed_form():
+    simulator = PortfolioSimulator()
+    result = simulator.run_bootstrap_simulation(1000, 100, 20, 2, np.full(36, 0.01), seed=1)
+    growth = 1.01
+    expected = 1000 * growth ** 24 + 100 * (growth ** 24 - 1) / (growth - 1)
+    assert result["mean_final_value"] == pytest.approx(expected, rel=1e-5)
+
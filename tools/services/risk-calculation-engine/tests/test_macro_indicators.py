@@ -0,0 +1,61 @@
+import pytest
+import requests
+from src.macro_indicators import MacroIndicatorStore
+from src.risk_assessment_engine import RiskAssessmentEngine, RiskFactors
+
+def test_scores_come_from_memory_and_refreshes_persist(tmp_path, monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError("scoring must not call the network")
+    monkeypatch.setattr(requests, "get", no_network)
+    fetched = []
+
+    def fetcher(region):
+        fetched.append(region)
+        if region == "XX":
+            raise ConnectionError("unknown country")
+        return {"gdp": 2.5e13, "inflation": 0.5}
+
+    path = str(tmp_path / "macro.json")
+    store = MacroIndicatorStore(path, ttl_seconds=3600, fetcher=fetcher)
+    engine = RiskAssessmentEngine(macro_indicators=store)
+    # Unknown regions are neutral until the background refresh has fetched them.
+    assert engine.compute_region_modifier("us") == 1.0
+    engine.score(RiskFactors(region="xx"))
+    assert fetched == []
+
+    assert store.refresh() == 1 and sorted(fetched) == ["US", "XX"]
+    # GDP bonus capped at 0.1, inflation penalty 0.5 / 10.
+    assert engine.compute_region_modifier("US") == pytest.approx(1.05)
+    assert store.stale_regions() == []
+
+    # A new process starts warm from the snapshot, and re-fetches only once the TTL has passed.
+    warm = MacroIndicatorStore(path, ttl_seconds=3600, fetcher=fetcher)
+    assert warm.get("us")["gdp"] == 2.5e13
+    assert warm.stale_regions() == [] and warm.stale_regions(now=warm.get("US")["fetched_at"] + 7200) == ["US"]
+
+def test_failed_refresh_keeps_previous_values(tmp_path):
+    store = MacroIndicatorStore(str(tmp_path / "macro.json"), fetcher=lambda region: {"gdp": 1e12, "inflation": 2.0})
+    store.refresh(["DE"])
+    store.fetcher = lambda region: (_ for _ in ()).throw(ConnectionError("offline"))
+    assert store.refresh(["DE"]) == 0
+    assert store.get("DE")["inflation"] == 2.0
+
+def test_only_plausible_regions_are_queued_and_failures_back_off():
+    fetched = []
+
+    def fetcher(region):
+        fetched.append(region)
+        raise ConnectionError("unknown country")
+
+    store = MacroIndicatorStore(fetcher=fetcher, max_pending=3)
+    for region in ["not a region", "US1", "u", "'; drop table", "zz", "ZZ", "yy", "xx", "ww"]:
+        assert store.get(region) == {"gdp": 0.0, "inflation": 0.0}
+    assert store.stale_regions() == ["XX", "YY", "ZZ"]
+
+    assert store.refresh() == 0 and sorted(fetched) == ["XX", "YY", "ZZ"]
+    # Failed regions aren't queued again by lookups until retry_seconds have passed.
+    store.get("zz")
+    assert store.stale_regions() == []
+    store.retry_seconds = 0
+    store.get("zz")
+    assert store.stale_regions() == ["ZZ"]
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+from src.path_kernels import HAS_NUMBA, PathStrategy, strategy_growth_factors
+from src.portfolio_simulator import PortfolioSimulator
+
+STRATEGY = PathStrategy(equity_weight=0.8, glide_target_value=400000, drawdown_trigger=0.2,
+                        monthly_withdrawal=1500, guardrail_band=0.2)
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="Numba is not installed")
+def test_numba_and_numpy_engines_agree():
+    risky_growth = 1.005 + 0.045 * np.random.default_rng(0).standard_normal((360, 1000))
+    numba = strategy_growth_factors(risky_growth, 300000, 200, STRATEGY, engine="numba")
+    numpy = strategy_growth_factors(risky_growth, 300000, 200, STRATEGY, engine="numpy")
+    assert np.allclose(numba, numpy)
+
+def test_strategy_rules_change_outcomes_as_expected():
+    simulator = PortfolioSimulator()
+    neutral = simulator.run_strategy_simulation(10000, 100, 4000, 10, 7, 15, PathStrategy(), seed=1,
+                                                distribution="raw", engine="numpy")
+    plain = simulator.run_monte_carlo_simulation(10000, 100, 4000, 10, 7, 15, seed=1, distribution="raw")
+    assert np.allclose(neutral["final_portfolio_values"], plain["final_portfolio_values"])
+
+    def tenth_percentile(strategy):
+        return simulator.run_strategy_simulation(300000, 0, 4000, 30, 7, 18, strategy, seed=2,
+                                                 engine="numpy")["percentiles"]["10th"]
+
+    fixed = PathStrategy(monthly_withdrawal=1800)
+    assert tenth_percentile(PathStrategy(monthly_withdrawal=1800, guardrail_band=0.2)) > tenth_percentile(fixed)
+    derisked = simulator.run_strategy_simulation(300000, 0, 4000, 30, 7, 18, PathStrategy(drawdown_trigger=0.15),
+                                                 seed=2, tail_metrics=True, engine="numpy")
+    baseline = simulator.run_strategy_simulation(300000, 0, 4000, 30, 7, 18, PathStrategy(),
+                                                 seed=2, tail_metrics=True, engine="numpy")
+    assert derisked["tail_risk"]["max_drawdown"]["mean"] < baseline["tail_risk"]["max_drawdown"]["mean"]
+    with pytest.raises(ValueError):
+        simulator.run_strategy_simulation(1000, 0, 10, 1, 7, 15, PathStrategy(equity_weight=1.5))
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="Numba is not installed")
+def test_numba_strategy_run_does_not_hang_later_process_pools():
+    # Numba's parallel thread pool does not survive a fork; when the kernel ran with prange,
+    # a process that forked workers after using it printed its results and then hung on exit.
+    script = textwrap.dedent("""
+        from src.path_kernels import PathStrategy
+        from src.portfolio_simulator import PortfolioSimulator
+        simulator = PortfolioSimulator(max_workers=2)
+        simulator.run_strategy_simulation(1000, 10, 2000, 2, 7, 15, PathStrategy(drawdown_trigger=0.2), engine="numba")
+        simulator.run_monte_carlo_simulation(1000, 10, 20000, 2, 7, 15, seed=1, workers=2)
+        simulator.close()
+    """)
+    completed = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[1], timeout=120)
+    assert completed.returncode == 0
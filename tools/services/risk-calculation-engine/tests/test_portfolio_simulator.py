@@ -0,0 +1,188 @@
+import numpy as np
+import pytest
+from src.distribution_sketch import LogHistogram
+from src.portfolio_simulator import PortfolioSimulator
+
+def test_zero_volatility_matches_closed_form():
+    simulator = PortfolioSimulator()
+    result = simulator.run_monte_carlo_simulation(1000, 100, 50, 2, 12, 0, seed=1)
+    growth = 1 + 0.12 / 12
+    expected = 1000 * growth ** 24 + 100 * (growth ** 24 - 1) / (growth - 1)
+    assert result["mean_final_value"] == pytest.approx(expected)
+    assert result["std_dev_final_value"] == pytest.approx(0, abs=1e-6)
+
+def test_chunked_run_covers_every_path_and_is_seeded():
+    # A tiny budget forces many chunks of a few paths each.
+    simulator = PortfolioSimulator(memory_budget_mb=0.01)
+    first = simulator.run_monte_carlo_simulation(10000, 100, 1001, 10, 7, 15, seed=42)
+    second = simulator.run_monte_carlo_simulation(10000, 100, 1001, 10, 7, 15, seed=42)
+    assert sum(first["distribution"]["counts"][0]) == 1001
+    assert first == second
+    assert first["percentiles"]["10th"] < first["percentiles"]["50th"] < first["percentiles"]["90th"]
+
+def test_rejects_negative_contribution():
+    with pytest.raises(ValueError):
+        PortfolioSimulator().run_monte_carlo_simulation(1000, -1, 10, 1, 7, 15)
+
+def test_fan_chart_bands_track_final_percentiles():
+    simulator = PortfolioSimulator(memory_budget_mb=0.5)
+    result = simulator.run_monte_carlo_simulation(10000, 100, 4000, 5, 7, 15, seed=7, fan_chart=True)
+    bands = result["fan_chart"]
+    assert all(len(bands[key]) == 60 for key in ("10th", "50th", "90th"))
+    assert all(lo <= mid <= hi for lo, mid, hi in zip(bands["10th"], bands["50th"], bands["90th"]))
+    for key in ("10th", "50th", "90th"):
+        assert bands[key][-1] == pytest.approx(result["percentiles"][key], rel=0.01)
+
+def test_multi_asset_matches_blended_single_asset_and_caches_cholesky():
+    simulator = PortfolioSimulator()
+    correlation = {"SPY": {"SPY": 1.0, "BND": -0.2}, "BND": {"SPY": -0.2, "BND": 1.0}}
+    kwargs = dict(
+        asset_weights={"SPY": 0.6, "BND": 0.4},
+        asset_annual_returns={"SPY": 9, "BND": 4},
+        asset_annual_volatilities={"SPY": 18, "BND": 6},
+        correlation_matrix=correlation,
+        correlation_window="1y",
+    )
+    multi = simulator.run_multi_asset_simulation(10000, 100, 20000, 10, seed=1, **kwargs)
+    assert len(simulator._cholesky_cache) == 1
+    simulator.run_multi_asset_simulation(10000, 100, 100, 10, seed=2, **kwargs)
+    assert len(simulator._cholesky_cache) == 1
+
+    # Fixed weights make the portfolio return normal with the blended mean and variance.
+    blended_vol = (0.6 ** 2 * 18 ** 2 + 0.4 ** 2 * 6 ** 2 + 2 * 0.6 * 0.4 * -0.2 * 18 * 6) ** 0.5
+    single = simulator.run_monte_carlo_simulation(10000, 100, 20000, 10, 0.6 * 9 + 0.4 * 4, blended_vol, seed=3)
+    assert multi["mean_final_value"] == pytest.approx(single["mean_final_value"], rel=0.01)
+    assert multi["std_dev_final_value"] == pytest.approx(single["std_dev_final_value"], rel=0.05)
+
+def test_multi_asset_rejects_weights_not_summing_to_one():
+    with pytest.raises(ValueError):
+        PortfolioSimulator().run_multi_asset_simulation(
+            1000, 0, 10, 1, {"A": 0.5, "B": 0.2}, {"A": 5, "B": 5}, {"A": 10, "B": 10}, [[1, 0], [0, 1]]
+        )
+
+def test_parallel_run_is_bit_identical_to_serial():
+    simulator = PortfolioSimulator(memory_budget_mb=0.05, max_workers=2)
+    try:
+        serial = simulator.run_monte_carlo_simulation(10000, 100, 600, 5, 7, 15, seed=11, fan_chart=True)
+        parallel = simulator.run_monte_carlo_simulation(10000, 100, 600, 5, 7, 15, seed=11, fan_chart=True, workers=2)
+    finally:
+        simulator.close()
+    assert serial == parallel
+
+@pytest.mark.parametrize("sampling", ["antithetic", "sobol"])
+def test_variance_reduced_sampling_keeps_the_mean(sampling):
+    simulator = PortfolioSimulator()
+    result = simulator.run_monte_carlo_simulation(10000, 100, 4096, 10, 7, 15, seed=3, sampling=sampling)
+    growth = 1 + 0.07 / 12
+    expected_mean = 10000 * growth ** 120 + 100 * (growth ** 120 - 1) / (growth - 1)
+    assert result["mean_final_value"] == pytest.approx(expected_mean, rel=0.01)
+
+def test_adaptive_mode_stops_early_and_reports_paths_used():
+    simulator = PortfolioSimulator()
+    result = simulator.run_monte_carlo_simulation(10000, 100, 50000, 10, 7, 15, seed=3, sampling="sobol", tolerance=0.01)
+    assert result["converged"]
+    assert result["paths_used"] < 50000
+    assert sum(result["distribution"]["counts"][0]) == result["paths_used"]
+    for key, error in result["standard_errors"].items():
+        assert error <= 0.01 * result["percentiles"][key]
+
+def test_analytic_mode_matches_monte_carlo_within_documented_bound():
+    simulator = PortfolioSimulator()
+    analytic = simulator.run_analytic_approximation(10000, 100, 30, 7, 15)
+    monte_carlo = simulator.run_monte_carlo_simulation(10000, 100, 32768, 30, 7, 15, seed=5, sampling="sobol")
+    assert analytic["method"] == "analytic"
+    assert analytic["error_bound"] == 0.015
+    assert analytic["mean_final_value"] == pytest.approx(monte_carlo["mean_final_value"], rel=0.005)
+    assert analytic["std_dev_final_value"] == pytest.approx(monte_carlo["std_dev_final_value"], rel=0.02)
+    for key in ("10th", "50th", "90th"):
+        assert analytic["percentiles"][key] == pytest.approx(monte_carlo["percentiles"][key], rel=analytic["error_bound"])
+
+def test_streaming_run_ends_with_the_non_streaming_result():
+    simulator = PortfolioSimulator(memory_budget_mb=0.05)
+    updates = list(simulator.iter_monte_carlo_simulation(10000, 100, 900, 5, 7, 15, seed=5, fan_chart=True))
+    assert len(updates) > 2
+    assert all(update["status"] == "running" for update in updates[:-1])
+    assert [update["paths_completed"] for update in updates[:-1]] == sorted(u["paths_completed"] for u in updates[:-1])
+    assert updates[-1] == simulator.run_monte_carlo_simulation(10000, 100, 900, 5, 7, 15, seed=5, fan_chart=True)
+
+def test_batch_scenarios_share_random_numbers():
+    simulator = PortfolioSimulator(memory_budget_mb=0.1)
+    base = dict(initial_investment=10000, monthly_contribution=100, simulation_years=10,
+                portfolio_annual_return=7, portfolio_annual_volatility=15)
+    scenarios = [base, dict(base, monthly_contribution=200), dict(base, simulation_years=5), base]
+    results = simulator.run_batch_simulation(scenarios, 2000, seed=9, distribution="raw")
+    values = [result.pop("final_portfolio_values") for result in results]
+    assert results[0] == results[3]
+    # With the same shocks, extra contributions raise every path, so every percentile rises.
+    assert all(results[1]["percentiles"][key] > results[0]["percentiles"][key] for key in ("10th", "50th", "90th"))
+    difference = values[1] - values[0]
+    assert np.all(difference > 0)
+    growth = 1 + 0.07 / 12
+    assert difference.mean() == pytest.approx(100 * (growth ** 120 - 1) / (growth - 1), rel=0.02)
+    assert results[2]["mean_final_value"] < results[0]["mean_final_value"]
+
+def test_goal_seek_contribution_reaches_target_on_the_same_paths():
+    simulator = PortfolioSimulator()
+    kwargs = dict(initial_investment=10000, portfolio_annual_volatility=15, num_simulations=5000, seed=4)
+    solved = simulator.solve_goal(300000, 0.8, "monthly_contribution", simulation_years=20,
+                                  portfolio_annual_return=7, **kwargs)
+    assert solved["achievable"] and solved["success_probability"] >= 0.8
+    # Solving for the return at that contribution recovers the assumed 7%.
+    back = simulator.solve_goal(300000, 0.8, "portfolio_annual_return", monthly_contribution=solved["value"],
+                                simulation_years=20, **kwargs)
+    assert back["value"] == pytest.approx(7, abs=0.01)
+    with pytest.raises(ValueError):
+        simulator.solve_goal(300000, 0.8, "simulation_years", **kwargs)
+
+def test_tail_metrics_match_a_full_sort_and_path_drawdowns():
+    simulator = PortfolioSimulator(memory_budget_mb=0.05)
+    result = simulator.run_monte_carlo_simulation(10000, 100, 3000, 5, 7, 20, seed=8, tail_metrics=True, distribution="raw")
+    tail = result["tail_risk"]
+    invested = 10000 + 100 * 60
+    ordered = np.sort(result["final_portfolio_values"])
+    assert tail["value_at_risk"]["95"] == pytest.approx(invested - ordered[149])
+    assert tail["conditional_value_at_risk"]["99"] == pytest.approx(invested - ordered[:30].mean())
+    assert tail["conditional_value_at_risk"]["99"] >= tail["value_at_risk"]["99"] >= tail["value_at_risk"]["95"]
+    drawdowns = tail["max_drawdown"]
+    assert 0 < drawdowns["50th"] <= drawdowns["90th"] <= drawdowns["99th"] < 1
+
+def test_max_drawdown_of_a_known_path():
+    growth = np.array([[1.1], [0.5], [1.2], [2.0]])
+    drawdowns = np.empty(1)
+    PortfolioSimulator._simulate_paths(100, 0, growth, max_drawdowns=drawdowns)
+    # Peak 110, trough 55: a 50% drawdown.
+    assert drawdowns[0] == pytest.approx(0.5)
+
+def test_buy_and_hold_drifts_and_costs_reduce_the_mean():
+    simulator = PortfolioSimulator()
+    kwargs = dict(
+        asset_weights={"SPY": 0.5, "BND": 0.5},
+        asset_annual_returns={"SPY": 12, "BND": 0},
+        asset_annual_volatilities={"SPY": 0, "BND": 0},
+        correlation_matrix=[[1, 0], [0, 1]],
+        seed=1,
+    )
+    # Without volatility or contributions buy and hold is each half compounding on its own.
+    held = simulator.run_multi_asset_simulation(10000, 0, 10, 10, rebalance_months=None, **kwargs)
+    assert held["mean_final_value"] == pytest.approx(5000 * 1.01 ** 120 + 5000)
+    # A threshold no weight ever reaches never trades, so it pays no costs.
+    untriggered = simulator.run_multi_asset_simulation(10000, 0, 10, 10, rebalance_months=None,
+                                                      rebalance_threshold=0.99, transaction_cost=1, **kwargs)
+    assert untriggered == held
+    free = simulator.run_multi_asset_simulation(10000, 100, 10, 10, rebalance_months=12, **kwargs)
+    costly = simulator.run_multi_asset_simulation(10000, 100, 10, 10, rebalance_months=12, transaction_cost=0.5, **kwargs)
+    assert costly["mean_final_value"] < free["mean_final_value"]
+
+def test_distribution_histograms_merge_across_workers():
+    simulator = PortfolioSimulator(memory_budget_mb=0.05, max_workers=2)
+    try:
+        single = simulator.run_monte_carlo_simulation(10000, 100, 3000, 10, 7, 15, seed=6, distribution="raw")
+        parallel = simulator.run_monte_carlo_simulation(10000, 100, 3000, 10, 7, 15, seed=6, workers=2)
+    finally:
+        simulator.close()
+    assert "final_portfolio_values" not in parallel
+    assert parallel["distribution"] == single["distribution"]
+    histogram = LogHistogram.from_dict(parallel["distribution"])
+    assert histogram.quantiles(0.5)[0, 0] == pytest.approx(np.median(single["final_portfolio_values"]), rel=0.01)
+    assert simulator.run_monte_carlo_simulation(10000, 100, 100, 1, 7, 15, distribution="none").keys().isdisjoint(
+        {"distribution", "final_portfolio_values"})
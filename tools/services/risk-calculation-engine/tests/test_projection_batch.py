@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from src.portfolio_simulator import PortfolioSimulator
+from src.projection_batch import PortfolioRow, ProjectionBatch, holdings_value, portfolio_seed
+
+class MemoryStore:
+    """The store API over in-memory rows; save number fail_on_save raises like a dropped connection."""
+
+    def __init__(self, portfolios, fail_on_save=None):
+        self.portfolios = sorted(portfolios, key=lambda row: row.portfolio_id)
+        self.fail_on_save = fail_on_save
+        self.results, self.checkpoints, self.fetched_after, self.saves = {}, {}, [], 0
+
+    async def load_checkpoint(self, run_id):
+        return tuple(self.checkpoints.get(run_id, (None, False)))
+
+    async def fetch_portfolios(self, after, limit):
+        self.fetched_after.append(after)
+        return [row for row in self.portfolios if after is None or row.portfolio_id > after][:limit]
+
+    async def save_results(self, run_id, projections, last_portfolio_id, failed=0):
+        self.saves += 1
+        if self.saves == self.fail_on_save:
+            raise ConnectionError("database went away")
+        self.results.update({projection.portfolio_id: projection for projection in projections})
+        self.checkpoints[run_id] = (last_portfolio_id, False)
+
+    async def complete_run(self, run_id):
+        self.checkpoints[run_id] = (self.checkpoints.get(run_id, (None,))[0], True)
+
+def test_batch_resumes_from_its_checkpoint_after_a_crash():
+    portfolios = [PortfolioRow(f"p{i:03d}", f"u{i}", 1000.0 * (i + 1), ("low", "medium", "high")[i % 3]) for i in range(23)]
+    portfolios += [PortfolioRow("p100", "u100", 0.0), PortfolioRow("p101", "u101", -5.0)]
+    store = MemoryStore(portfolios, fail_on_save=2)
+    batch = ProjectionBatch(store, page_size=10, num_simulations=500, horizon_years=10, max_workers=2)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(batch.run("nightly"))
+    assert len(store.results) == 10 and store.checkpoints["nightly"] == ("p009", False)
+
+    fetches_before_resume = len(store.fetched_after)
+    summary = asyncio.run(batch.run("nightly"))
+    assert summary["resumed"] and summary["projected"] == 14 and summary["failed"] == 1
+    # Keyset pages continue after the last committed portfolio rather than starting over.
+    assert store.fetched_after[fetches_before_resume:] == ["p009", "p019", "p101"]
+    assert len(store.results) == 24 and store.checkpoints["nightly"][1]
+    assert store.results["p100"].p50 == 0.0
+
+    projection = store.results["p004"]
+    expected = PortfolioSimulator().run_monte_carlo_simulation(5000.0, 0.0, 500, 10, 6.0, 12.0,
+                                                               seed=portfolio_seed("p004"))
+    assert projection.p90 == pytest.approx(expected["percentiles"]["90th"])
+    assert projection.mean_final_value == pytest.approx(expected["mean_final_value"])
+
+    # A completed run is not repeated.
+    assert asyncio.run(batch.run("nightly"))["projected"] == 0
+
+def test_holdings_value_reads_the_stored_formats():
+    assert holdings_value('[{"symbol": "VTI", "marketValue": 1200.5}, {"symbol": "BND", "quantity": 10, "currentPrice": 70}]') == pytest.approx(1900.5)
+    assert holdings_value({"VTI": {"quantity": 2, "price": 250}, "CASH": 100}) == pytest.approx(600)
+    assert holdings_value(None) == 0.0
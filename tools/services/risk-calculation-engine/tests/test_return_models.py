@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from src.portfolio_simulator import PortfolioSimulator
+from src.return_models import (CorrelatedNormalReturns, GarchReturns, RebalancedPortfolioReturns, RegimeSwitchingReturns,
+                               StudentTReturns, create_return_model)
+
+def monthly_returns(model, months=240, paths=4000, seed=0):
+    return model.draw_growth_factors(np.random.default_rng(seed), months, paths) - 1.0
+
+def test_student_t_keeps_volatility_with_fatter_tails():
+    returns = monthly_returns(StudentTReturns(0.005, 0.04, degrees_of_freedom=5))
+    assert returns.mean() == pytest.approx(0.005, abs=5e-4)
+    assert returns.std() == pytest.approx(0.04, rel=0.03)
+    standardized = (returns - returns.mean()) / returns.std()
+    # Excess kurtosis of a t(5) is 6; a normal's is 0.
+    assert (standardized ** 4).mean() - 3 > 2
+
+def test_garch_matches_long_run_volatility_and_clusters():
+    returns = monthly_returns(GarchReturns(0.005, 0.04, alpha=0.15, beta=0.8))
+    assert returns.std() == pytest.approx(0.04, rel=0.05)
+    squared = (returns - 0.005) ** 2
+    lag_correlation = np.corrcoef(squared[1:].ravel(), squared[:-1].ravel())[0, 1]
+    assert lag_correlation > 0.05
+
+def test_regime_switching_mixes_regimes_at_stationary_weights():
+    model = RegimeSwitchingReturns((0.01, -0.02), (0.03, 0.08), (0.05, 0.20))
+    returns = monthly_returns(model)
+    stressed = model.stationary_stressed_probability
+    assert stressed == pytest.approx(0.2)
+    assert returns.mean() == pytest.approx(0.8 * 0.01 + 0.2 * -0.02, abs=1e-3)
+
+def test_unknown_return_model_is_rejected():
+    with pytest.raises(ValueError):
+        create_return_model("levy", 0.005, 0.04)
+
+def test_unexpected_model_options_are_rejected():
+    with pytest.raises(ValueError, match="degree_of_freedom"):
+        create_return_model("student_t", 0.005, 0.04, degree_of_freedom=3)
+    with pytest.raises(ValueError, match="bogus"):
+        create_return_model("normal", 0.005, 0.04, bogus=1)
+    with pytest.raises(ValueError, match="alpha"):
+        PortfolioSimulator().run_monte_carlo_simulation(1000, 10, 100, 1, 7, 15, return_model="student_t",
+                                                         model_options={"alpha": 0.1})
+    assert isinstance(create_return_model("garch", 0.005, 0.04, alpha=0.1), GarchReturns)
+
+def test_costless_monthly_rebalancing_matches_fixed_weights():
+    cholesky = np.linalg.cholesky(np.array([[1.0, 0.3, 0.1], [0.3, 1.0, -0.2], [0.1, -0.2, 1.0]]))
+    args = (np.array([0.004, 0.006, 0.002]), np.array([0.02, 0.05, 0.01]), cholesky, np.array([0.5, 0.3, 0.2]))
+    fixed = CorrelatedNormalReturns(*args).draw_growth_factors(np.random.default_rng(3), 60, 300)
+    rebalanced = RebalancedPortfolioReturns(*args, 1000, 100).draw_growth_factors(np.random.default_rng(3), 60, 300)
+    assert np.allclose(fixed, rebalanced)
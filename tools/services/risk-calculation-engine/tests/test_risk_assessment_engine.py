@@ -1,7 +1,148 @@
-from src.risk_assessment_engine import RiskAssessmentEngine, RiskFactors
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.macro_indicators import MacroIndicatorStore
+from src.risk_assessment_engine import FEATURES, RiskAssessmentEngine, RiskFactors
 
 def test_basic_risk_score():
-    engine = RiskAssessmentEngine()
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
     factors = RiskFactors(income=100000, expenses=50000)
-    score = engine.calculate_risk_score(factors)
+    score = engine.score(factors)
     assert isinstance(score, float)
+    assert engine.classify(score) in ("High Risk", "Moderate Risk", "Low Risk")
+
+def _macro_store():
+    indicators = {"US": {"gdp": 2.5e13, "inflation": 3.2}, "DE": {"gdp": 4.1e12, "inflation": 0.55}}
+    store = MacroIndicatorStore(fetcher=lambda region: indicators[region])
+    store.refresh(indicators)
+    return store
+
+def _applicants(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "income": rng.integers(0, 250000, n), "expenses": rng.uniform(0, 150000, n).round(2),
+        "assets": rng.integers(0, 2000000, n), "liabilities": rng.integers(0, 2000000, n),
+        "credit_score": rng.integers(300, 851, n), "investment_experience": rng.integers(0, 30, n),
+        "risk_tolerance": rng.integers(0, 11, n), "market_volatility": rng.uniform(0, 60, n).round(1),
+        "industry_risk": rng.integers(0, 100, n), "economic_outlook": rng.integers(0, 100, n),
+        "age": rng.integers(18, 95, n), "dependents": rng.integers(0, 12, n),
+        "is_immigrant": rng.random(n) < 0.3, "is_retired": rng.random(n) < 0.2,
+        "employment_status": rng.choice(["employed", "self-employed", "student", "retired", "other"], n),
+        "education_level": rng.choice(["high_school", "bachelor", "master", "phd", "none"], n),
+        "marital_status": rng.choice(["single", "married", "divorced", "widowed"], n),
+        "region": rng.choice(["US", "DE", "ZZ"], n),
+    })
+
+def test_batch_score_matches_profile_row_by_row():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    df = _applicants(2000)
+    scored = engine.batch_score(df)
+
+    assert list(scored.index) == list(df.index)
+    for i, row in enumerate(df.to_dict("records")):
+        profile = engine.profile(RiskFactors(**row))
+        assert scored["score"].iat[i] == profile["score"]
+        assert scored["classification"].iat[i] == profile["classification"]
+        for key, contribution in profile["contributions"].items():
+            assert scored[f"contribution_{key}"].iat[i] == contribution
+
+def test_batch_score_defaults_missing_columns_and_rejects_unknown_ones():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    scored = engine.batch_score(pd.DataFrame({"income": [60000], "region": ["DE"]}))
+    profile = engine.profile(RiskFactors(income=60000, region="DE"))
+    assert scored["score"].iat[0] == profile["score"]
+
+    with pytest.raises(ValueError, match="salary"):
+        engine.batch_score(pd.DataFrame({"salary": [60000]}))
+
+def _rescored_sensitivity(engine, data):
+    """The field-by-field definition: perturb one field, score again, subtract."""
+    baseline = engine.score(data)
+    deltas = {}
+    for name in RiskFactors.__dataclass_fields__:
+        value = getattr(data, name)
+        if isinstance(value, bool):
+            changed = replace(data, **{name: not value})
+        elif isinstance(value, (int, float)):
+            changed = replace(data, **{name: value * 1.1})
+        else:
+            changed = data
+        deltas[name] = engine.score(changed) - baseline
+    return deltas
+
+def test_sensitivity_analysis_matches_rescoring_each_field():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    df = _applicants(300, seed=1)
+    batch = engine.batch_sensitivity(df)
+
+    assert list(batch.columns) == list(RiskFactors.__dataclass_fields__)
+    for i, row in enumerate(df.to_dict("records")):
+        data = RiskFactors(**row)
+        expected = _rescored_sensitivity(engine, data)
+        analysis = engine.sensitivity_analysis(data)
+        assert data == RiskFactors(**row)
+        # Rounding to 4 dp may land either side of a tie when the two sums differ in the last bit.
+        assert analysis == pytest.approx(expected, abs=1e-4 + 1e-9)
+        assert batch.iloc[i].to_dict() == pytest.approx(analysis, abs=1e-4 + 1e-9)
+        assert analysis["region"] == analysis["gender"] == 0.0
+
+def _dict_score(engine, data):
+    normalized = engine._normalize_data(data)
+    return sum(normalized[k] * engine.weights.get(k, 0) for k in engine.weights)
+
+def test_compiled_model_scores_like_the_feature_dicts():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    for row in _applicants(1000, seed=2).to_dict("records"):
+        data = RiskFactors(**row)
+        assert engine.score(data) == _dict_score(engine, data)
+        assert np.array_equal(engine.compiled().normalize(data), [engine._normalize_data(data)[k] for k in FEATURES])
+        normalized = engine._normalize_data(data)
+        assert engine.profile(data)["contributions"] == {k: round(normalized[k] * w, 4) for k, w in engine.weights.items()}
+
+    model = engine.compiled()
+    codes = model.category_codes("employment_status", ["student", "astronaut", "employed"])
+    assert list(model.category_scores["employment_status"][codes]) == [0.5, 0.5, 1.0]
+    assert codes[1] == -1
+    with pytest.raises(ValueError):
+        model.coefficients[0] = 1.0
+
+def test_compiled_model_follows_weight_changes():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    data = RiskFactors(income=80000, credit_score=700, region="US")
+    model = engine.compiled()
+    assert engine.compiled() is model
+
+    engine.weights["income"] = 0.3
+    assert engine.compiled() is not model
+    assert engine.score(data) == _dict_score(engine, data)
+    engine.weights.update(assets=0.2)
+    assert engine.score(data) == _dict_score(engine, data)
+    engine.weights = {**engine.weights, "age": 0.0}
+    assert engine.compiled().coefficients[FEATURES.index("age")] == 0.0
+    engine.auto_tune_weights([(RiskFactors(income=income, region="US"), income / 200000)
+                              for income in range(10000, 200000, 10000)])
+    assert engine.score(data) == _dict_score(engine, data)
+
+    engine.weights["salary"] = 0.1
+    with pytest.raises(ValueError, match="salary"):
+        engine.score(data)
+
+def test_risk_factors_use_slots():
+    data = RiskFactors(income=1.0)
+    assert not hasattr(data, "__dict__")
+    with pytest.raises(AttributeError):
+        data.salary = 2.0
+    assert RiskAssessmentEngine(macro_indicators=_macro_store()).profile(data)["raw_input"]["income"] == 1.0
+
+def test_batch_score_parses_text_flags():
+    engine = RiskAssessmentEngine(macro_indicators=_macro_store())
+    text = engine.batch_score(pd.DataFrame({"is_retired": ["False", "0", " TRUE ", "yes", True], "region": "US"}))
+    flags = engine.batch_score(pd.DataFrame({"is_retired": [False, False, True, True, True], "region": "US"}))
+    assert list(text["score"]) == list(flags["score"])
+    assert text["score"].iat[0] != text["score"].iat[2]
+
+    with pytest.raises(ValueError, match="is_retired"):
+        engine.batch_score(pd.DataFrame({"is_retired": ["maybe"]}))
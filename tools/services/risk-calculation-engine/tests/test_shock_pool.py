@@ -0,0 +1,57 @@
+import os
+import uuid
+import numpy as np
+import pytest
+from src.portfolio_simulator import PortfolioSimulator
+from src.shock_pool import HAS_FCNTL, PooledGenerator, SharedShockPool, attach_shock_pool
+
+pytestmark = pytest.mark.skipif(not HAS_FCNTL, reason="the shock pool needs fcntl")
+
+def test_taken_blocks_are_not_reissued_until_refilled():
+    pool = SharedShockPool(f"test-shocks-{uuid.uuid4().hex[:8]}", num_blocks=4, block_values=100)
+    try:
+        assert pool.refill(np.random.default_rng(0)) == 4
+        # A second handle on the same name shares the blocks rather than creating new ones.
+        other = SharedShockPool(pool.name, 4, 100)
+        assert not other.owner and other.stats()["ready_blocks"] == 4
+
+        first = pool.take((2, 150), np.random.default_rng(1))  # 300 values use three blocks
+        second = other.take(250, np.random.default_rng(2))  # one block left, the rest falls back
+        assert first.shape == (2, 150) and second.shape == (250,)
+        assert not np.isin(second[:100], first).any()
+        assert (pool.hits, other.hits, other.misses) == (300, 100, 150)
+        assert pool.stats()["ready_blocks"] == 0
+        assert pool.refill() == 4
+        other.close()
+    finally:
+        pool.close()
+
+def test_workers_do_not_recreate_an_unlinked_pool():
+    pool = SharedShockPool(f"test-shocks-{uuid.uuid4().hex[:8]}", num_blocks=4, block_values=100)
+    other = SharedShockPool(pool.name, 4, 100, create=False)
+    assert not other.owner
+    other.close()
+    pool.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedShockPool(pool.name, 4, 100, create=False)
+    assert attach_shock_pool(pool.name, 4, 100, create=False) is None
+    assert not os.path.exists(f"/dev/shm/{pool.name}")
+
+def test_pool_serves_unseeded_runs_only():
+    # Opened through attach_shock_pool, as the API does, so in-process chunks reuse this handle.
+    pool = attach_shock_pool(f"test-shocks-{uuid.uuid4().hex[:8]}", num_blocks=64, block_values=4096)
+    try:
+        pool.refill()
+        simulator = PortfolioSimulator(shock_pool=pool)
+        seeded = simulator.run_monte_carlo_simulation(10000, 100, 500, 10, 7, 15, seed=3)
+        assert seeded == PortfolioSimulator().run_monte_carlo_simulation(10000, 100, 500, 10, 7, 15, seed=3)
+        assert pool.hits == 0
+
+        unseeded = simulator.run_monte_carlo_simulation(10000, 100, 500, 10, 7, 15)
+        assert pool.hits == 500 * 120
+        assert unseeded["percentiles"]["10th"] < unseeded["percentiles"]["90th"]
+        assert isinstance(PooledGenerator(pool, np.random.default_rng()).uniform(), float)
+    finally:
+        simulator.close()
+        pool.close()
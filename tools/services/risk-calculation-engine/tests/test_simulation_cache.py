@@ -0,0 +1,21 @@
+import time
+from src.simulation_cache import SimulationCache, canonical_cache_key
+
+def test_key_ignores_float_noise_and_field_order():
+    first = canonical_cache_key("sim", {"annual_return": 7.0, "years": 30, "seed": 1})
+    second = canonical_cache_key("sim", {"seed": 1, "years": 30, "annual_return": 7.00001})
+    assert first == second
+    assert first != canonical_cache_key("sim", {"annual_return": 7.1, "years": 30, "seed": 1})
+    assert first != canonical_cache_key("other", {"annual_return": 7.0, "years": 30, "seed": 1})
+
+def test_lru_eviction_ttl_and_counters():
+    cache = SimulationCache(max_entries=2, ttl_seconds=0.05)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,41 @@
+import threading
+import pytest
+from src.simulation_jobs import JobQueueFullError, SimulationJobQueue
+
+def test_jobs_complete_fail_and_report_metrics():
+    queue = SimulationJobQueue(max_workers=1)
+    try:
+        done = queue.wait(queue.submit("sim", lambda: {"mean_final_value": 1.0}).job_id, timeout=5)
+        assert done.status == "completed" and done.result == {"mean_final_value": 1.0}
+
+        def invalid():
+            raise ValueError("bad input")
+        failed = queue.wait(queue.submit("sim", invalid).job_id, timeout=5)
+        assert failed.status == "failed" and failed.error == "bad input"
+
+        stats = queue.stats()
+        assert (stats["completed"], stats["failed"], stats["queue_depth"]) == (1, 1, 0)
+        assert queue.get("unknown") is None
+    finally:
+        queue.shutdown()
+
+def test_full_queue_refuses_jobs_until_a_worker_frees_up():
+    queue = SimulationJobQueue(max_workers=1, max_queued=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return {}
+    try:
+        queue.submit("sim", blocking)
+        started.wait(5)
+        waiting = queue.submit("sim", dict)
+        assert queue.stats()["queue_depth"] == 1
+        with pytest.raises(JobQueueFullError):
+            queue.submit("sim", dict)
+        release.set()
+        assert queue.wait(waiting.job_id, timeout=5).status == "completed"
+        assert queue.stats()["wait_seconds"]["max"] > 0
+    finally:
+        queue.shutdown()
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from src.portfolio_simulator import PortfolioSimulator
+from src.simulation_surface import SimulationSurface, build_surface
+
+def test_surface_matches_monte_carlo_and_scales_with_amounts(tmp_path):
+    path = str(tmp_path / "surface.npy")
+    build_surface(path, num_simulations=4096, annual_returns=[4, 6, 8], annual_volatilities=[10, 15, 20],
+                  years=[9, 10], contribution_shares=np.linspace(0, 1, 6), validation_points=10)
+    surface = SimulationSurface.load(path)
+    assert isinstance(surface.values, np.memmap)
+    assert 0 < surface.error_bound < 0.05
+
+    result = surface.query(10000, 100, 10, 7, 15)
+    monte_carlo = PortfolioSimulator().run_monte_carlo_simulation(10000, 100, 16384, 10, 7, 15, seed=1, sampling="sobol")
+    for key in ("10th", "50th", "90th"):
+        assert result["percentiles"][key] == pytest.approx(monte_carlo["percentiles"][key], rel=0.03)
+    assert result["mean_final_value"] == pytest.approx(monte_carlo["mean_final_value"], rel=0.01)
+
+    doubled = surface.query(20000, 200, 10, 7, 15)
+    assert doubled["percentiles"]["50th"] == pytest.approx(2 * result["percentiles"]["50th"])
+    with pytest.raises(ValueError):
+        surface.query(10000, 100, 10, 12, 15)